@@ -3,7 +3,22 @@ import warnings
 import numpy as np
 from scipy.linalg import cho_solve, cholesky
 from scipy.optimize import brentq
+from scipy.special import ndtr
 from scipy.stats import norm
+from sklearn.utils import check_random_state
+
+from .learning.gaussian_process import MultiOutputGaussianProcessRegressor
+
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+
+def _norm_pdf(x, out=None):
+    """Standard normal density, avoiding the overhead of ``scipy.stats``."""
+    out = np.multiply(x, x, out=out)
+    out *= -0.5
+    np.exp(out, out=out)
+    out /= _SQRT_2PI
+    return out
 
 
 def gaussian_acquisition_1D(
@@ -44,7 +59,15 @@ def _gaussian_acquisition(
 
     # Evaluate acquisition function
     per_second = acq_func.endswith("ps")
+    joint_model = None
     if per_second:
+        if (
+            not return_grad
+            and isinstance(model, MultiOutputGaussianProcessRegressor)
+            and model.tie_hyperparameters
+        ):
+            # the objective and the time outputs share one kernel evaluation
+            joint_model = model
         model, time_model = model.estimators_
 
     if acq_func == "LCB":
@@ -55,7 +78,15 @@ def _gaussian_acquisition(
             acq_vals = func_and_grad
 
     elif acq_func in ["EI", "PI", "EIps", "PIps"]:
-        if acq_func in ["EI", "EIps"]:
+        if joint_model is not None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                joint_mu, joint_std = joint_model.predict(X, return_std=True)
+            values = gaussian_acquisition_from_posterior(
+                joint_mu[:, 0], joint_std[:, 0], y_opt, xi
+            )
+            func_and_grad = values[0] if acq_func == "EIps" else values[1]
+        elif acq_func in ["EI", "EIps"]:
             func_and_grad = gaussian_ei(X, model, y_opt, xi, return_grad)
         else:
             func_and_grad = gaussian_pi(X, model, y_opt, xi, return_grad)
@@ -68,7 +99,9 @@ def _gaussian_acquisition(
 
         if acq_func in ["EIps", "PIps"]:
 
-            if return_grad:
+            if joint_model is not None:
+                mu, std = joint_mu[:, 1], joint_std[:, 1]
+            elif return_grad:
                 mu, std, mu_grad, std_grad = time_model.predict(
                     X, return_std=True, return_mean_grad=True, return_std_grad=True
                 )
@@ -224,24 +257,13 @@ def gaussian_pi(X, model, y_opt=0.0, xi=0.01, return_grad=False):
             "(N,) vector?".format(mu.ndim, std.ndim)
         )
 
-    values = np.zeros_like(mu)
-    mask = std > 0
-    improve = y_opt - xi - mu[mask]
-    scaled = improve / std[mask]
-    values[mask] = norm.cdf(scaled)
-
     if return_grad:
-        if not np.all(mask):
-            return values, np.zeros_like(std_grad)
-
-        # Substitute (y_opt - xi - mu) / sigma = t and apply chain rule.
-        # improve_grad is the gradient of t wrt x.
-        improve_grad = -mu_grad * std - std_grad * improve
-        improve_grad /= std**2
-
-        return values, improve_grad * norm.pdf(scaled)
+        values, grads = gaussian_acquisition_from_posterior(
+            mu, std, y_opt, xi, mu_grad=mu_grad, std_grad=std_grad
+        )
+        return values[1], grads[1].reshape(np.shape(mu_grad))
 
-    return values
+    return gaussian_acquisition_from_posterior(mu, std, y_opt, xi)[1]
 
 
 def gaussian_ei(X, model, y_opt=0.0, xi=0.01, return_grad=False):
@@ -307,33 +329,155 @@ def gaussian_ei(X, model, y_opt=0.0, xi=0.01, return_grad=False):
             "(N,) vector?".format(mu.ndim, std.ndim)
         )
 
-    values = np.zeros_like(mu)
-    mask = std > 0
-    improve = y_opt - xi - mu[mask]
-    scaled = improve / std[mask]
-    cdf = norm.cdf(scaled)
-    pdf = norm.pdf(scaled)
-    exploit = improve * cdf
-    explore = std[mask] * pdf
-    values[mask] = exploit + explore
-
     if return_grad:
-        if not np.all(mask):
-            return values, np.zeros_like(std_grad)
+        values, grads = gaussian_acquisition_from_posterior(
+            mu, std, y_opt, xi, mu_grad=mu_grad, std_grad=std_grad
+        )
+        return values[0], grads[0].reshape(np.shape(mu_grad))
+
+    return gaussian_acquisition_from_posterior(mu, std, y_opt, xi)[0]
+
+
+def gaussian_acquisition_from_posterior(
+    mu,
+    std,
+    y_opt=0.0,
+    xi=0.01,
+    kappa=1.96,
+    mu_grad=None,
+    std_grad=None,
+    out=None,
+    dtype=None,
+):
+    """Compute EI, PI and LCB from the posterior in a single pass.
+
+    The normal CDF and PDF of the standardised improvement are evaluated
+    once with ``scipy.special`` ufuncs and shared between the three
+    acquisition functions and their gradients. This avoids calling
+    ``model.predict`` once per acquisition function and the overhead of
+    the ``scipy.stats`` distribution objects.
 
-        # Substitute (y_opt - xi - mu) / sigma = t and apply chain rule.
-        # improve_grad is the gradient of t wrt x.
-        improve_grad = -mu_grad * std - std_grad * improve
-        improve_grad /= std**2
-        cdf_grad = improve_grad * pdf
-        pdf_grad = -improve * cdf_grad
-        exploit_grad = -mu_grad * cdf - pdf_grad
-        explore_grad = std_grad * pdf + pdf_grad
+    Parameters
+    ----------
+    mu : array-like, shape (n_samples,)
+        Posterior mean at the candidate points.
+
+    std : array-like, shape (n_samples,)
+        Posterior standard deviation at the candidate points.
 
-        grad = exploit_grad + explore_grad
-        return values, grad
+    y_opt : float, default 0
+        Previous minimum value which we would like to improve upon.
 
-    return values
+    xi : float, default=0.01
+        Controls how much improvement one wants over the previous best
+        values. Used by EI and PI.
+
+    kappa : float, default 1.96 or 'inf'
+        Controls how much of the variance in the predicted values should be
+        taken into account by LCB. If set to 'inf', LCB only uses the
+        variance.
+
+    mu_grad : array-like, shape (n_samples, n_features), optional
+        Gradient of the posterior mean. For a single sample an array of
+        shape (n_features,) is accepted as well.
+
+    std_grad : array-like, shape (n_samples, n_features), optional
+        Gradient of the posterior standard deviation. The gradients of the
+        acquisition functions are returned only if both ``mu_grad`` and
+        ``std_grad`` are given.
+
+    out : ndarray, shape (3, n_samples), optional
+        Buffer in which the acquisition values are written. Its dtype must
+        be ``dtype``. Reusing a buffer avoids allocations when the
+        function is called repeatedly on candidate sets of the same size.
+
+    dtype : numpy dtype, optional
+        Floating point type of the computation. ``np.float32`` halves the
+        memory traffic when scoring large candidate sets. Defaults to the
+        type of ``mu`` and ``std``, so that the single precision predictions
+        of a ``GaussianProcessRegressor`` with ``predict_dtype="float32"``
+        are scored in single precision.
+
+    Returns
+    -------
+    values : ndarray, shape (3, n_samples)
+        Rows hold EI, PI and LCB, with the same conventions as
+        :func:`gaussian_ei`, :func:`gaussian_pi` and :func:`gaussian_lcb`:
+        EI and PI should be maximized, LCB minimized.
+
+    grads : ndarray, shape (3, n_samples, n_features)
+        Gradients of the rows of ``values``. Only returned when
+        ``mu_grad`` and ``std_grad`` are given.
+    """
+    if dtype is None:
+        dtype = np.promote_types(np.result_type(mu, std), np.float32)
+    dtype = np.dtype(dtype)
+    mu = np.asarray(mu, dtype=dtype)
+    std = np.asarray(std, dtype=dtype)
+    if mu.ndim != 1 or std.shape != mu.shape:
+        raise ValueError(
+            "mu and std must be 1-dimensional arrays of the same shape, got "
+            "shapes {} and {}.".format(mu.shape, std.shape)
+        )
+    n_samples = mu.shape[0]
+
+    if out is None:
+        out = np.empty((3, n_samples), dtype=dtype)
+    elif out.shape != (3, n_samples) or out.dtype != dtype:
+        raise ValueError(
+            "out must be an array of shape {} and dtype {}, got shape {} and "
+            "dtype {}.".format((3, n_samples), dtype, out.shape, out.dtype)
+        )
+    ei, pi, lcb = out
+
+    if kappa == "inf":
+        np.negative(std, out=lcb)
+    else:
+        np.multiply(std, -kappa, out=lcb)
+        lcb += mu
+
+    mask = std > 0
+    all_positive = np.all(mask)
+    safe_std = std if all_positive else np.where(mask, std, 1)
+
+    # Substitute (y_opt - xi - mu) / sigma = t, then PI = cdf(t) and
+    # EI = (y_opt - xi - mu) * cdf(t) + sigma * pdf(t).
+    improve = np.subtract(y_opt - xi, mu, dtype=dtype)
+    scaled = np.divide(improve, safe_std)
+    ndtr(scaled, out=pi)
+    pdf = _norm_pdf(scaled, out=scaled)
+    np.multiply(improve, pi, out=ei)
+    ei += std * pdf
+    if not all_positive:
+        ei[~mask] = 0.0
+        pi[~mask] = 0.0
+
+    if mu_grad is None or std_grad is None:
+        return out
+
+    mu_grad = np.asarray(mu_grad, dtype=dtype).reshape(n_samples, -1)
+    std_grad = np.asarray(std_grad, dtype=dtype).reshape(n_samples, -1)
+    grads = np.empty((3,) + mu_grad.shape, dtype=dtype)
+
+    # The terms in the derivative of pdf(t) cancel in the gradient of EI.
+    np.multiply(std_grad, pdf[:, None], out=grads[0])
+    grads[0] -= mu_grad * pi[:, None]
+
+    # Gradient of t wrt x, chain rule for PI.
+    np.multiply(mu_grad, -safe_std[:, None], out=grads[1])
+    grads[1] -= std_grad * improve[:, None]
+    grads[1] *= (pdf / safe_std**2)[:, None]
+
+    if not all_positive:
+        grads[:2, ~mask] = 0.0
+
+    if kappa == "inf":
+        np.negative(std_grad, out=grads[2])
+    else:
+        np.multiply(std_grad, -kappa, out=grads[2])
+        grads[2] += mu_grad
+
+    return out, grads
 
 
 def gaussian_mes(X, model, n_min_samples=1000):
@@ -426,3 +570,305 @@ def gaussian_pvrs(X, model, n_thompson=10):
         cov = K_trans.dot(v)
         covs[i] = np.diag(cov).sum()
     return covs
+
+
+def _joint_posterior(X, model):
+    """Compute the joint posterior mean and covariance of batches of points.
+
+    Parameters
+    ----------
+    X : array-like, shape=(n_batches, q, n_features)
+        Batches of points.
+
+    model : sklearn estimator that implements predict with ``return_std``
+        If ``model`` also supports ``return_cov``, as the gaussian process
+        regressors do, the full covariance within each batch is used.
+        Otherwise the points of a batch are treated as independent.
+
+    Returns
+    -------
+    mu : array, shape=(n_batches, q)
+        Posterior mean of each point.
+
+    cov : array, shape=(n_batches, q, q)
+        Posterior covariance within each batch.
+    """
+    n_batches, q, n_features = X.shape
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if hasattr(model, "kernel_"):
+            mu = np.empty((n_batches, q))
+            cov = np.empty((n_batches, q, q))
+            for i in range(n_batches):
+                mu[i], cov[i] = model.predict(X[i], return_cov=True)
+        else:
+            mu, std = model.predict(X.reshape(-1, n_features), return_std=True)
+            mu = mu.reshape(n_batches, q)
+            cov = np.zeros((n_batches, q, q))
+            idx = np.arange(q)
+            cov[:, idx, idx] = std.reshape(n_batches, q) ** 2
+    return mu, cov
+
+
+def _batch_cholesky(cov, max_tries=5):
+    """Cholesky factors of a stack of covariance matrices, adding jitter to the
+    diagonal until all of them are positive definite."""
+    q = cov.shape[-1]
+    scale = np.mean(np.diagonal(cov, axis1=-2, axis2=-1))
+    jitter = max(scale, 1.0) * 1e-10
+    eye = np.eye(q)
+    for _ in range(max_tries):
+        try:
+            return np.linalg.cholesky(cov + jitter * eye)
+        except np.linalg.LinAlgError:
+            jitter *= 100
+    # Fall back on the independent (diagonal) approximation.
+    std = np.sqrt(np.maximum(np.diagonal(cov, axis1=-2, axis2=-1), 0.0))
+    return std[..., None] * eye
+
+
+def _qei_from_posterior(mu, cov, y_opt, xi, base_samples):
+    """Monte-Carlo q-EI from the joint posterior of each batch.
+
+    ``base_samples`` of shape (n_samples, q) are reused for every batch, so
+    that values of different batches are directly comparable.
+    """
+    L = _batch_cholesky(cov)
+    samples = mu[:, None, :] + np.einsum("bij,sj->bsi", L, base_samples)
+    improvement = np.maximum(y_opt - xi - samples, 0.0)
+    return improvement.max(axis=-1).mean(axis=-1)
+
+
+def _qucb_from_posterior(mu, cov, kappa, base_samples):
+    """Monte-Carlo q-UCB of the negated objective from the joint posterior of
+    each batch."""
+    L = _batch_cholesky(cov)
+    deviation = np.abs(np.einsum("bij,sj->bsi", L, base_samples))
+    values = -mu[:, None, :] + kappa * np.sqrt(np.pi / 2.0) * deviation
+    return values.max(axis=-1).mean(axis=-1)
+
+
+def _check_batches(X):
+    X = np.asarray(X)
+    if X.ndim == 2:
+        return X[None, :, :], True
+    if X.ndim != 3:
+        raise ValueError(
+            "X is {}-dimensional, however, it must be 2- or "
+            "3-dimensional.".format(X.ndim)
+        )
+    return X, False
+
+
+def gaussian_qei(X, model, y_opt=0.0, xi=0.01, n_samples=512, random_state=None):
+    """Use the Monte-Carlo q-expected improvement to score batches of points.
+
+    The q-EI of a batch is the expected improvement of the best point of the
+    batch, ``E[max_j max(y_opt - xi - f(x_j), 0)]``, under the joint
+    posterior of the batch. It is estimated with reparameterised samples
+    ``f = mu + L z`` where ``L`` is the Cholesky factor of the posterior
+    covariance and ``z`` are standard normal base samples shared by all
+    batches.
+
+    Note that the value returned by this function should be maximized to
+    obtain the batch with maximum improvement.
+
+    Parameters
+    ----------
+    X : array-like, shape=(q, n_features) or (n_batches, q, n_features)
+        A single batch or a stack of batches of points.
+
+    model : sklearn estimator that implements predict with ``return_std``
+        The fit estimator that approximates the function through the
+        method ``predict``. If it also supports ``return_cov`` the
+        correlation between the points of a batch is taken into account,
+        otherwise the points are treated as independent.
+
+    y_opt : float, default 0
+        Previous minimum value which we would like to improve upon.
+
+    xi : float, default=0.01
+        Controls how much improvement one wants over the previous best
+        values.
+
+    n_samples : int, default=512
+        Number of Monte-Carlo samples.
+
+    random_state : int, RandomState instance, or None (default)
+        Set random state to something other than None for reproducible
+        results.
+
+    Returns
+    -------
+    values : float or array-like, shape=(n_batches,)
+        Acquisition value of each batch.
+
+    References
+    ----------
+    [1] Wilson, J., Hutter, F. & Deisenroth, M. (2018). Maximizing
+        acquisition functions for Bayesian optimization. Advances in Neural
+        Information Processing Systems 31.
+    """
+    X, single = _check_batches(X)
+    rng = check_random_state(random_state)
+    base_samples = rng.standard_normal((X.shape[1], n_samples)).T
+    mu, cov = _joint_posterior(X, model)
+    values = _qei_from_posterior(mu, cov, y_opt, xi, base_samples)
+    return values[0] if single else values
+
+
+def gaussian_qucb(X, model, kappa=1.96, n_samples=512, random_state=None):
+    """Use the Monte-Carlo q-upper confidence bound to score batches of points.
+
+    As the objective is minimized, the bound is taken on the negated
+    objective, ``E[max_j (-mu_j + kappa * sqrt(pi / 2) * |(L z)_j|)]``,
+    where ``L`` is the Cholesky factor of the joint posterior covariance of
+    the batch and ``z`` are standard normal base samples shared by all
+    batches. For a batch of a single point this reduces to ``-LCB``.
+
+    Note that the value returned by this function should be maximized.
+
+    Parameters
+    ----------
+    X : array-like, shape=(q, n_features) or (n_batches, q, n_features)
+        A single batch or a stack of batches of points.
+
+    model : sklearn estimator that implements predict with ``return_std``
+        The fit estimator that approximates the function through the
+        method ``predict``. If it also supports ``return_cov`` the
+        correlation between the points of a batch is taken into account,
+        otherwise the points are treated as independent.
+
+    kappa : float, default 1.96
+        Controls how much of the variance in the predicted values should be
+        taken into account.
+
+    n_samples : int, default=512
+        Number of Monte-Carlo samples.
+
+    random_state : int, RandomState instance, or None (default)
+        Set random state to something other than None for reproducible
+        results.
+
+    Returns
+    -------
+    values : float or array-like, shape=(n_batches,)
+        Acquisition value of each batch.
+    """
+    X, single = _check_batches(X)
+    rng = check_random_state(random_state)
+    base_samples = rng.standard_normal((X.shape[1], n_samples)).T
+    mu, cov = _joint_posterior(X, model)
+    values = _qucb_from_posterior(mu, cov, kappa, base_samples)
+    return values[0] if single else values
+
+
+def _greedy_batch_selection(
+    mu, cov, n_points, base_samples, acq_func="qEI", y_opt=0.0, xi=0.01, kappa=1.96
+):
+    """Greedily select a batch from a pool of candidates by maximising a
+    Monte-Carlo batch acquisition function.
+
+    The Cholesky factor of the covariance of the selected points is grown one
+    row at a time, so that the joint samples of the selected points are reused
+    and each step scores all remaining candidates at once.
+
+    Parameters
+    ----------
+    mu : array, shape=(n_candidates,)
+        Posterior mean of the candidates.
+
+    cov : array, shape=(n_candidates, n_candidates)
+        Posterior covariance of the candidates.
+
+    n_points : int
+        Size of the batch.
+
+    base_samples : array, shape=(n_samples, n_points)
+        Standard normal base samples.
+
+    acq_func : "qEI" or "qUCB", default="qEI"
+        Batch acquisition function to maximise.
+
+    Returns
+    -------
+    selected : list of int
+        Indices of the selected candidates.
+    """
+    n_candidates = len(mu)
+    n_samples = base_samples.shape[0]
+    var = np.diag(cov) + 1e-10 * max(np.mean(np.diag(cov)), 1.0)
+    # Row i holds the coefficients of candidate i in the Cholesky factor of
+    # the covariance of the selected points.
+    chol_rows = np.zeros((n_candidates, n_points))
+    if acq_func == "qEI":
+        best = np.zeros(n_samples)
+    else:
+        best = np.full(n_samples, -np.inf)
+    available = np.ones(n_candidates, dtype=bool)
+    selected = []
+
+    for j in range(n_points):
+        rows = chol_rows[:, :j]
+        cond_std = np.sqrt(np.maximum(var - np.sum(rows**2, axis=1), 0.0))
+        deviation = rows.dot(base_samples[:, :j].T)
+        deviation += cond_std[:, None] * base_samples[:, j]
+        if acq_func == "qEI":
+            values = np.maximum(y_opt - xi - (mu[:, None] + deviation), 0.0)
+        else:
+            values = -mu[:, None] + kappa * np.sqrt(np.pi / 2.0) * np.abs(deviation)
+
+        scores = np.maximum(values, best).mean(axis=1)
+        scores[~available] = -np.inf
+        k = int(np.argmax(scores))
+        selected.append(k)
+        available[k] = False
+        best = np.maximum(values[k], best)
+
+        if cond_std[k] > 0:
+            chol_rows[:, j] = (cov[:, k] - rows.dot(rows[k])) / cond_std[k]
+
+    return selected
+
+
+def _log_local_penalizer(X, x_j, mu_j, std_j, lipschitz, y_best):
+    """Log of the local penalizer around an already selected point.
+
+    Under a Lipschitz assumption with constant ``lipschitz``, the minimum
+    cannot lie within a ball of radius ``(f(x_j) - y_best) / lipschitz``
+    around ``x_j``. The penalizer is the probability that ``X`` lies outside
+    of this ball, with ``f(x_j)`` distributed as ``N(mu_j, std_j ** 2)``.
+
+    Parameters
+    ----------
+    X : array-like, shape=(n_samples, n_features)
+        Points to penalize.
+
+    x_j : array-like, shape=(n_features,)
+        Selected point.
+
+    mu_j, std_j : float
+        Posterior mean and standard deviation at ``x_j``.
+
+    lipschitz : float
+        Estimate of the Lipschitz constant of the objective.
+
+    y_best : float
+        Best observed objective value.
+
+    Returns
+    -------
+    log_penalty : array-like, shape=(n_samples,)
+        Logarithm of the penalizer at ``X``, which is at most zero.
+
+    References
+    ----------
+    [1] González, J., Dai, Z., Hennig, P. & Lawrence, N. (2016). Batch
+        Bayesian Optimization via Local Penalization. Proceedings of the 19th
+        International Conference on Artificial Intelligence and Statistics,
+        in PMLR 51:648-657
+    """
+    radius = (mu_j - y_best) / lipschitz
+    scale = max(std_j / lipschitz, 1e-12)
+    dist = np.sqrt(np.sum((np.asarray(X) - x_j) ** 2, axis=1))
+    return norm.logcdf((dist - radius) / scale)
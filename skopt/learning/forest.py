@@ -1,56 +1,210 @@
+from copy import copy
+
 import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
 from sklearn.ensemble import ExtraTreesRegressor as _sk_ExtraTreesRegressor
 from sklearn.ensemble import RandomForestRegressor as _sk_RandomForestRegressor
+from sklearn.utils import check_random_state
+from sklearn.utils.validation import check_is_fitted
+
+
+def _leaf_statistics(tree, min_variance):
+    """Returns the table of `E[Y | node]` and `Var(Y | node) + E[Y | node] ** 2`
+    for every node of ``tree``, shape=(node_count, 2)."""
+    mean = tree.tree_.value[:, 0, 0]
 
+    # This rounding off is done in accordance with the
+    # adjustment done in section 4.3.3
+    # of http://arxiv.org/pdf/1211.0906v2.pdf to account
+    # for cases such as leaves with 1 sample in which there
+    # is zero variance.
+    var = np.maximum(tree.tree_.impurity, min_variance)
+    return np.column_stack((mean, var + mean**2))
 
-def _return_std(X, trees, predictions, min_variance):
-    """Returns `std(Y | X)`.
 
-    Can be calculated by E[Var(Y | Tree)] + Var(E[Y | Tree]) where
+def _accumulate_leaf_statistics(trees, tables, X):
+    """Returns the sum of the leaf statistics of ``trees`` at ``X``.
+
+    Each tree is traversed once, the leaves are then looked up in the
+    precomputed tables of the trees.
+    """
+    out = np.zeros((X.shape[0], 2))
+    for tree, table in zip(trees, tables):
+        out += table[tree.tree_.apply(X)]
+    return out
+
+
+def _return_mean_std(X, trees, tables, n_jobs=1):
+    """Returns `E(Y | X)` and `std(Y | X)`.
+
+    The std can be calculated by E[Var(Y | Tree)] + Var(E[Y | Tree]) where
     P(Tree) is `1 / len(trees)`.
 
     Parameters
     ----------
     X : array-like, shape=(n_samples, n_features)
-        Input data.
+        Input data, validated by the ``_validate_X_predict`` method of the
+        forest.
 
     trees : list, shape=(n_estimators,)
         List of fit sklearn trees as obtained from the ``estimators_``
         attribute of a fit RandomForestRegressor or ExtraTreesRegressor.
 
-    predictions : array-like, shape=(n_samples,)
-        Prediction of each data point as returned by RandomForestRegressor
-        or ExtraTreesRegressor.
+    tables : list, shape=(n_estimators,)
+        The leaf statistics of each tree as returned by `_leaf_statistics`.
+
+    n_jobs : int, default=1
+        Number of jobs among which the trees are split. Each job returns
+        the sum over its trees, the sums are added in a fixed order so that
+        the result does not depend on the scheduling or on the joblib
+        backend.
 
     Returns
     -------
+    mean : array-like, shape=(n_samples,)
+        Prediction of each data point, as returned by the ``predict``
+        method of RandomForestRegressor or ExtraTreesRegressor.
+
     std : array-like, shape=(n_samples,)
         Standard deviation of `y` at `X`. If criterion
         is set to "squared_error", then `std[i] ~= std(y | X[i])`.
     """
     # This derives std(y | x) as described in 4.3.2 of arXiv:1211.0906
-    std = np.zeros(len(X))
-
-    for tree in trees:
-        var_tree = tree.tree_.impurity[tree.apply(X)]
-
-        # This rounding off is done in accordance with the
-        # adjustment done in section 4.3.3
-        # of http://arxiv.org/pdf/1211.0906v2.pdf to account
-        # for cases such as leaves with 1 sample in which there
-        # is zero variance.
-        var_tree[var_tree < min_variance] = min_variance
-        mean_tree = tree.predict(X)
-        std += var_tree + mean_tree**2
+    n_jobs = max(1, min(effective_n_jobs(n_jobs), len(trees)))
+    chunks = np.array_split(np.arange(len(trees)), n_jobs)
+    sums = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_accumulate_leaf_statistics)(
+            [trees[i] for i in chunk], [tables[i] for i in chunk], X
+        )
+        for chunk in chunks
+    )
 
+    mean, std = np.sum(sums, axis=0).T
+    mean /= len(trees)
     std /= len(trees)
-    std -= predictions**2.0
+    std -= mean**2.0
     std[std < 0.0] = 0.0
     std = std**0.5
-    return std
+    return mean, std
+
+
+class _ForestMixin:
+    """Precomputes the leaf statistics of the trees after fitting and
+    supports refitting only part of the trees on each call to `fit`."""
+
+    def fit(self, X, y, sample_weight=None):
+        """Build a forest of trees from the training set (X, y).
+
+        If ``refit_fraction < 1`` and the forest was already fit on data
+        with the same number of features, only the oldest
+        ``ceil(refit_fraction * n_estimators)`` trees are replaced by trees
+        fit on (X, y) and the others are kept. All trees are refit every
+        ``refresh_every`` such partial fits.
+
+        The leaf statistics used to predict the standard deviation are
+        computed once the trees are built.
+
+        Parameters
+        ----------
+        X : array-like or sparse matrix of shape (n_samples, n_features)
+            The training input samples.
+
+        y : array-like of shape (n_samples,) or (n_samples, n_outputs)
+            The target values.
 
+        sample_weight : array-like of shape (n_samples,), default=None
+            Sample weights.
 
-class RandomForestRegressor(_sk_RandomForestRegressor):
+        Returns
+        -------
+        self : object
+            Fitted estimator.
+        """
+        if not 0.0 < self.refit_fraction <= 1.0:
+            raise ValueError(
+                "Expected refit_fraction in (0, 1], got %s" % self.refit_fraction
+            )
+        if self.refresh_every is not None and self.refresh_every < 1:
+            raise ValueError(
+                "Expected refresh_every >= 1 or None, got %s" % self.refresh_every
+            )
+        if self.refit_fraction < 1.0 and self.oob_score:
+            raise ValueError("oob_score is not supported with refit_fraction < 1")
+
+        if self._can_partial_fit(X):
+            self._partial_fit(X, y, sample_weight)
+        else:
+            super().fit(X, y, sample_weight=sample_weight)
+            self._update_leaf_statistics()
+            self._n_partial_fits = 0
+            self._partial_fit_rng = check_random_state(self.random_state)
+        return self
+
+    def _can_partial_fit(self, X):
+        if self.refit_fraction >= 1.0 or not hasattr(self, "_n_partial_fits"):
+            return False
+        if (
+            self.refresh_every is not None
+            and self._n_partial_fits >= self.refresh_every
+        ):
+            return False
+        return (
+            len(self.estimators_) == self.n_estimators
+            and np.shape(X)[1] == self.n_features_in_
+        )
+
+    def _partial_fit(self, X, y, sample_weight):
+        n_refit = int(np.ceil(self.refit_fraction * self.n_estimators))
+
+        # copy the generator rather than advancing it, the previous state
+        # may be shared with a copy of this forest
+        rng = copy(self._partial_fit_rng)
+        forest = clone(self).set_params(
+            n_estimators=n_refit,
+            refit_fraction=1.0,
+            warm_start=False,
+            random_state=rng.randint(np.iinfo(np.int32).max),
+        )
+        forest.fit(X, y, sample_weight=sample_weight)
+
+        # the oldest trees come first and are replaced first
+        min_variance, tables = self._leaf_statistics
+        if min_variance != self.min_variance:
+            tables = [_leaf_statistics(t, self.min_variance) for t in self.estimators_]
+        self.estimators_ = self.estimators_[n_refit:] + forest.estimators_
+        self._leaf_statistics = (
+            self.min_variance,
+            tables[n_refit:] + forest._leaf_statistics[1],
+        )
+        self._n_partial_fits += 1
+        self._partial_fit_rng = rng
+
+    def _update_leaf_statistics(self):
+        self._leaf_statistics = (
+            self.min_variance,
+            [_leaf_statistics(tree, self.min_variance) for tree in self.estimators_],
+        )
+
+    def _return_mean_std(self, X):
+        check_is_fitted(self)
+        leaf_statistics = getattr(self, "_leaf_statistics", None)
+        if (
+            leaf_statistics is None
+            or leaf_statistics[0] != self.min_variance
+            or len(leaf_statistics[1]) != len(self.estimators_)
+        ):
+            # min_variance was changed or the model was fit elsewhere
+            self._update_leaf_statistics()
+        return _return_mean_std(
+            self._validate_X_predict(X),
+            self.estimators_,
+            self._leaf_statistics[1],
+            self.n_jobs,
+        )
+
+
+class RandomForestRegressor(_ForestMixin, _sk_RandomForestRegressor):
     """RandomForestRegressor that supports conditional std computation.
 
     Parameters
@@ -152,6 +306,19 @@ class RandomForestRegressor(_sk_RandomForestRegressor):
         and add more estimators to the ensemble, otherwise, just fit a whole
         new forest.
 
+    min_variance : float, optional (default=0.)
+        Lower bound on the variance of the leaves when predicting the
+        standard deviation.
+
+    refit_fraction : float, optional (default=1.)
+        Fraction of the trees replaced on each call to `fit` once the forest
+        is fit. The oldest trees are refit on the new data, the others are
+        kept. With the default all trees are refit.
+
+    refresh_every : int or None, optional (default=10)
+        Number of partial fits after which all the trees are refit. If None,
+        the forest is only partially refit after the first fit.
+
     Attributes
     ----------
     estimators_ : list of DecisionTreeRegressor
@@ -209,8 +376,12 @@ class RandomForestRegressor(_sk_RandomForestRegressor):
         verbose=0,
         warm_start=False,
         min_variance=0.0,
+        refit_fraction=1.0,
+        refresh_every=10,
     ):
         self.min_variance = min_variance
+        self.refit_fraction = refit_fraction
+        self.refresh_every = refresh_every
         super().__init__(
             n_estimators=n_estimators,
             criterion=criterion,
@@ -250,20 +421,17 @@ class RandomForestRegressor(_sk_RandomForestRegressor):
             Standard deviation of `y` at `X`. If criterion
             is set to "squared_error", then `std[i] ~= std(y | X[i])`.
         """
-        mean = super().predict(X)
-
         if return_std:
             if self.criterion != "squared_error":
                 raise ValueError(
                     "Expected impurity to be 'squared_error', got %s instead"
                     % self.criterion
                 )
-            std = _return_std(X, self.estimators_, mean, self.min_variance)
-            return mean, std
-        return mean
+            return self._return_mean_std(X)
+        return super().predict(X)
 
 
-class ExtraTreesRegressor(_sk_ExtraTreesRegressor):
+class ExtraTreesRegressor(_ForestMixin, _sk_ExtraTreesRegressor):
     """ExtraTreesRegressor that supports conditional standard deviation.
 
     Parameters
@@ -364,6 +532,19 @@ class ExtraTreesRegressor(_sk_ExtraTreesRegressor):
         and add more estimators to the ensemble, otherwise, just fit a whole
         new forest.
 
+    min_variance : float, optional (default=0.)
+        Lower bound on the variance of the leaves when predicting the
+        standard deviation.
+
+    refit_fraction : float, optional (default=1.)
+        Fraction of the trees replaced on each call to `fit` once the forest
+        is fit. The oldest trees are refit on the new data, the others are
+        kept. With the default all trees are refit.
+
+    refresh_every : int or None, optional (default=10)
+        Number of partial fits after which all the trees are refit. If None,
+        the forest is only partially refit after the first fit.
+
     Attributes
     ----------
     estimators_ : list of DecisionTreeRegressor
@@ -421,8 +602,12 @@ class ExtraTreesRegressor(_sk_ExtraTreesRegressor):
         verbose=0,
         warm_start=False,
         min_variance=0.0,
+        refit_fraction=1.0,
+        refresh_every=10,
     ):
         self.min_variance = min_variance
+        self.refit_fraction = refit_fraction
+        self.refresh_every = refresh_every
         super().__init__(
             n_estimators=n_estimators,
             criterion=criterion,
@@ -462,15 +647,12 @@ class ExtraTreesRegressor(_sk_ExtraTreesRegressor):
             Standard deviation of `y` at `X`. If criterion
             is set to "squared_error", then `std[i] ~= std(y | X[i])`.
         """
-        mean = super().predict(X)
-
         if return_std:
             if self.criterion != "squared_error":
                 raise ValueError(
                     "Expected impurity to be 'squared_error', got %s instead"
                     % self.criterion
                 )
-            std = _return_std(X, self.estimators_, mean, self.min_variance)
-            return mean, std
+            return self._return_mean_std(X)
 
-        return mean
+        return super().predict(X)
@@ -1,3 +1,3 @@
-from .gpr import GaussianProcessRegressor
+from .gpr import GaussianProcessRegressor, MultiOutputGaussianProcessRegressor
 
-__all__ = "GaussianProcessRegressor"
+__all__ = ("GaussianProcessRegressor", "MultiOutputGaussianProcessRegressor")
@@ -1,4 +1,7 @@
+import copy
+import hashlib
 import warnings
+from collections import OrderedDict
 
 import numpy as np
 import packaging.version
@@ -7,7 +10,15 @@ from scipy.linalg import cho_solve, solve_triangular
 from sklearn.gaussian_process import (
     GaussianProcessRegressor as sk_GaussianProcessRegressor,
 )
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.gaussian_process.kernels import RBF as sk_RBF
+from sklearn.gaussian_process.kernels import ConstantKernel as sk_ConstantKernel
+from sklearn.gaussian_process.kernels import Matern as sk_Matern
+from sklearn.gaussian_process.kernels import Product as sk_Product
+from sklearn.gaussian_process.kernels import Sum as sk_Sum
+from sklearn.gaussian_process.kernels import WhiteKernel as sk_WhiteKernel
 from sklearn.utils import check_array
+from sklearn.utils.validation import check_is_fitted
 
 from .kernels import RBF, ConstantKernel, Sum, WhiteKernel
 
@@ -32,6 +43,100 @@ def _param_for_white_kernel_in_Sum(kernel, kernel_str=""):
     return False, "_"
 
 
+def _scaled_distances_float32(X, Y, length_scale, squared):
+    """Euclidean distances between the rows of ``X / length_scale`` and
+    ``Y / length_scale`` in single precision, computed as
+    ``|x|^2 + |y|^2 - 2 x.y`` with a matrix product."""
+    X = np.asarray(X / length_scale, dtype=np.float32)
+    Y = np.asarray(Y / length_scale, dtype=np.float32)
+    D = X.dot(Y.T)
+    D *= -2.0
+    D += np.einsum("ij,ij->i", X, X)[:, np.newaxis]
+    D += np.einsum("ij,ij->i", Y, Y)
+    np.maximum(D, 0.0, out=D)
+    if not squared:
+        np.sqrt(D, out=D)
+    return D
+
+
+def _cross_covariance_float32(kernel, X, Y):
+    """Evaluate ``kernel(X, Y)`` in single precision.
+
+    RBF and Matern kernels with nu in {0.5, 1.5, 2.5, inf}, and their sums
+    and products with constant and white kernels, are computed in float32.
+    Other kernels are evaluated in float64 and cast. Constant and white
+    kernels are returned as scalars, so that they do not allocate a matrix.
+    """
+    if isinstance(kernel, sk_Sum):
+        K = _cross_covariance_float32(kernel.k1, X, Y)
+        other = _cross_covariance_float32(kernel.k2, X, Y)
+        if isinstance(K, np.ndarray):
+            K += other
+            return K
+        return other + K
+    if isinstance(kernel, sk_Product):
+        K = _cross_covariance_float32(kernel.k1, X, Y)
+        other = _cross_covariance_float32(kernel.k2, X, Y)
+        if isinstance(K, np.ndarray):
+            K *= other
+            return K
+        return other * K
+    if isinstance(kernel, sk_ConstantKernel):
+        return np.float32(kernel.constant_value)
+    if isinstance(kernel, sk_WhiteKernel):
+        # the noise does not correlate distinct sets of points
+        return np.float32(0.0)
+    # Matern is a subclass of RBF
+    is_matern = isinstance(kernel, sk_Matern)
+    if (isinstance(kernel, sk_RBF) and not is_matern) or (
+        is_matern and np.isinf(kernel.nu)
+    ):
+        K = _scaled_distances_float32(X, Y, kernel.length_scale, squared=True)
+        K *= -0.5
+        return np.exp(K, out=K)
+    if is_matern and kernel.nu in (0.5, 1.5, 2.5):
+        K = _scaled_distances_float32(X, Y, kernel.length_scale, squared=False)
+        if kernel.nu == 0.5:
+            K *= -1.0
+            return np.exp(K, out=K)
+        K *= np.sqrt(2.0 * kernel.nu)
+        # (1 + K) or (1 + K + K ** 2 / 3), then exp(-K) in place
+        if kernel.nu == 1.5:
+            polynomial = K + 1.0
+        else:
+            polynomial = np.square(K)
+            polynomial /= 3.0
+            polynomial += K
+            polynomial += 1.0
+        np.negative(K, out=K)
+        np.exp(K, out=K)
+        K *= polynomial
+        return K
+    return kernel(X, Y).astype(np.float32)
+
+
+def _posterior_products(K_trans, alpha, K_inv=None, n_rows=1024):
+    """Return ``K_trans.dot(alpha)`` and, if ``K_inv`` is given, the
+    diagonal of ``K_trans.dot(K_inv).dot(K_trans.T)``.
+
+    The products are computed in float64 by blocks of ``n_rows`` query
+    points, so that a single precision ``K_trans`` is never converted as a
+    whole and the ``K_trans.dot(K_inv)`` product never needs to be stored for
+    all query points. The products with ``K_inv`` cancel with the prior
+    variance and lose all accuracy in single precision.
+    """
+    n_samples = K_trans.shape[0]
+    mean = np.empty((n_samples,) + alpha.shape[1:])
+    var = None if K_inv is None else np.empty(n_samples)
+    for start in range(0, n_samples, n_rows):
+        rows = slice(start, start + n_rows)
+        block = K_trans[rows].astype(np.float64, copy=False)
+        mean[rows] = block.dot(alpha)
+        if K_inv is not None:
+            var[rows] = np.einsum("ij,ij->i", block.dot(K_inv), block)
+    return mean, var
+
+
 class GaussianProcessRegressor(sk_GaussianProcessRegressor):
     """GaussianProcessRegressor that allows noise tunability.
 
@@ -122,6 +227,27 @@ class GaussianProcessRegressor(sk_GaussianProcessRegressor):
         If set to "gaussian", then it is assumed that `y` is a noisy
         estimate of `f(x)` where the noise is gaussian.
 
+    kernel_cache_size : int, optional (default: 0)
+        Maximum number of bytes used to cache the cross-covariance
+        ``kernel_(X, X_train_)`` between query points and training points.
+        Repeated predictions on the same query array, for instance the
+        candidate points of one optimization step, then reuse the cached
+        matrix. The least recently used matrices are evicted first and the
+        cache is cleared when the model is fit. 0 disables the cache.
+
+    predict_dtype : "float64" or "float32", optional (default: "float64")
+        Floating point type of the cross-covariance between query points and
+        training points, which is also the type cached, and of the predicted
+        mean and standard deviation, so that the acquisition function is
+        scored in that type. With "float32" the RBF and Matern kernels, and
+        their sums and products with constant and white kernels, are
+        evaluated against the query points in single precision, which halves
+        the memory used by the cross-covariances of large candidate sets.
+        Other kernels are evaluated in float64 and cast. The kernel matrix of
+        the training points, its factorization and inverse, the products
+        giving the predictive mean and variance and the gradients are always
+        computed in float64.
+
     Attributes
     ----------
     X_train_ : array-like, shape = (n_samples, n_features)
@@ -158,8 +284,12 @@ class GaussianProcessRegressor(sk_GaussianProcessRegressor):
         copy_X_train=True,
         random_state=None,
         noise=None,
+        kernel_cache_size=0,
+        predict_dtype="float64",
     ):
         self.noise = noise
+        self.kernel_cache_size = kernel_cache_size
+        self.predict_dtype = predict_dtype
         super().__init__(
             kernel=kernel,
             alpha=alpha,
@@ -188,6 +318,11 @@ class GaussianProcessRegressor(sk_GaussianProcessRegressor):
         """
         if isinstance(self.noise, str) and self.noise != "gaussian":
             raise ValueError("expected noise to be 'gaussian', got %s" % self.noise)
+        if np.dtype(self.predict_dtype) not in (np.float32, np.float64):
+            raise ValueError(
+                "expected predict_dtype to be 'float32' or 'float64', got %s"
+                % self.predict_dtype
+            )
 
         if self.kernel is None:
             self.kernel = ConstantKernel(1.0, constant_value_bounds="fixed") * RBF(
@@ -247,8 +382,50 @@ class GaussianProcessRegressor(sk_GaussianProcessRegressor):
             self.y_train_mean_ = self.y_train_mean
             self.y_train_std_ = 1
 
+        self._K_trans_cache = OrderedDict()
         return self
 
+    def __getstate__(self):
+        state = dict(super().__getstate__())
+        # cached matrices are not worth storing with the model
+        state.pop("_K_trans_cache", None)
+        return state
+
+    def _evaluate_cross_covariance(self, X, dtype):
+        """Return ``kernel_(X, X_train_)`` computed in ``dtype``."""
+        if dtype == np.float32:
+            K_trans = _cross_covariance_float32(self.kernel_, X, self.X_train_)
+            if not isinstance(K_trans, np.ndarray):
+                K_trans = np.full((X.shape[0], self.X_train_.shape[0]), K_trans)
+            return K_trans
+        return self.kernel_(X, self.X_train_)
+
+    def _cross_covariance(self, X, dtype=np.float64):
+        """Return ``kernel_(X, X_train_)`` in ``dtype``, using the cache if
+        enabled."""
+        dtype = np.dtype(dtype)
+        if not self.kernel_cache_size:
+            return self._evaluate_cross_covariance(X, dtype)
+
+        cache = self.__dict__.setdefault("_K_trans_cache", OrderedDict())
+        digest = hashlib.blake2b(np.ascontiguousarray(X).data, digest_size=16)
+        key = (X.shape, X.dtype.str, dtype.str, digest.digest())
+        K_trans = cache.get(key)
+        if K_trans is not None:
+            cache.move_to_end(key)
+            return K_trans
+
+        K_trans = self._evaluate_cross_covariance(X, dtype)
+        if K_trans.nbytes <= self.kernel_cache_size:
+            # cached matrices are shared between calls
+            K_trans.flags.writeable = False
+            cache[key] = K_trans
+            n_bytes = sum(value.nbytes for value in cache.values())
+            while n_bytes > self.kernel_cache_size:
+                _, evicted = cache.popitem(last=False)
+                n_bytes -= evicted.nbytes
+        return K_trans
+
     def predict(
         self,
         X,
@@ -329,8 +506,15 @@ class GaussianProcessRegressor(sk_GaussianProcessRegressor):
                 return y_mean
 
         else:  # Predict based on GP posterior
-            K_trans = self.kernel_(X, self.X_train_)
-            y_mean = K_trans.dot(self.alpha_)  # Line 4 (y_mean = f_star)
+            dtype = np.dtype(np.float64)
+            if not (return_cov or return_mean_grad):
+                dtype = np.dtype(self.predict_dtype)
+            K_trans = self._cross_covariance(X, dtype)
+            K_inv = self.K_inv_ if return_std else None
+            # Line 4 (y_mean = f_star)
+            y_mean, K_trans_K_inv_K_trans = _posterior_products(
+                K_trans, self.alpha_, K_inv
+            )
             # undo normalisation
             y_mean = self.y_train_std_ * y_mean + self.y_train_mean_
 
@@ -342,11 +526,9 @@ class GaussianProcessRegressor(sk_GaussianProcessRegressor):
                 return y_mean, y_cov
 
             elif return_std:
-                K_inv = self.K_inv_
-
                 # Compute variance of predictive distribution
                 y_var = self.kernel_.diag(X)
-                y_var -= np.einsum("ki,kj,ij->k", K_trans, K_trans, K_inv)
+                y_var -= K_trans_K_inv_K_trans
 
                 # Check if any of the variances is negative because of
                 # numerical issues. If yes: set the variance to 0.
@@ -359,8 +541,9 @@ class GaussianProcessRegressor(sk_GaussianProcessRegressor):
                     y_var[y_var_negative] = 0.0
                 # undo normalisation
                 y_var = y_var * self.y_train_std_**2
-                y_std = np.sqrt(y_var)
+                y_std = np.sqrt(y_var).astype(dtype, copy=False)
 
+            y_mean = y_mean.astype(dtype, copy=False)
             if return_mean_grad:
                 grad = self.kernel_.gradient_x(X[0], self.X_train_)
                 grad_mean = np.dot(grad.T, self.alpha_)
@@ -384,3 +567,172 @@ class GaussianProcessRegressor(sk_GaussianProcessRegressor):
                     return y_mean, y_std
                 else:
                     return y_mean
+
+
+def _gp_with_shared_factorization(gp, y):
+    """Return a copy of the fitted ``gp`` that predicts the targets ``y``.
+
+    The copy shares the training inputs, the fitted kernel, its Cholesky
+    factorization and the cross-covariance cache with ``gp``, only the dual
+    coefficients are solved for the new targets.
+    """
+    est = copy.copy(gp)
+    est._K_trans_cache = gp._K_trans_cache
+    y = np.asarray(y, dtype=np.float64)
+    if gp.normalize_y:
+        y_train_mean = np.mean(y)
+        y_train_std = np.std(y)
+        if y_train_std == 0.0:
+            y_train_std = 1.0
+    else:
+        y_train_mean = 0.0
+        y_train_std = 1.0
+
+    est._y_train_mean = y_train_mean
+    est._y_train_std = y_train_std
+    est.y_train_mean_ = y_train_mean
+    est.y_train_std_ = y_train_std
+    est.y_train_ = (y - y_train_mean) / y_train_std
+    est.alpha_ = cho_solve((gp.L_, True), est.y_train_)
+    est.log_marginal_likelihood_value_ = (
+        -0.5 * est.y_train_.dot(est.alpha_)
+        - np.log(np.diag(gp.L_)).sum()
+        - 0.5 * gp.L_.shape[0] * np.log(2 * np.pi)
+    )
+    return est
+
+
+class MultiOutputGaussianProcessRegressor(BaseEstimator, RegressorMixin):
+    """Gaussian process regressor for several outputs sharing one kernel.
+
+    This can be passed as the `base_estimator` of an `Optimizer` to model
+    the objective and the logarithm of the computation time for the
+    per-second acquisition functions "EIps" and "PIps", which otherwise use
+    a ``sklearn.multioutput.MultiOutputRegressor``. Contrary to wrapping a
+    ``GaussianProcessRegressor`` in a
+    ``sklearn.multioutput.MultiOutputRegressor``, the kernel matrix and its
+    Cholesky factorization are computed once for all outputs when the
+    hyperparameters are tied, and the cross-covariance between the query
+    points and the training points is computed once per prediction.
+
+    Parameters
+    ----------
+    base_estimator : GaussianProcessRegressor, optional
+        The regressor whose clones are fit to the outputs. Defaults to
+        ``GaussianProcessRegressor()``.
+
+    tie_hyperparameters : boolean, default=False
+        If True, the kernel hyperparameters are optimized on the first
+        output only and shared by all other outputs, which only solve for
+        their own dual coefficients. If False, one regressor is fit
+        independently per output, like a ``MultiOutputRegressor``.
+
+    Attributes
+    ----------
+    estimators_ : list of GaussianProcessRegressor
+        One fitted regressor per output. When the hyperparameters are tied
+        they share ``X_train_``, ``kernel_``, ``L_``, ``K_inv_`` and the
+        cross-covariance cache.
+    """
+
+    def __init__(self, base_estimator=None, tie_hyperparameters=False):
+        self.base_estimator = base_estimator
+        self.tie_hyperparameters = tie_hyperparameters
+
+    def fit(self, X, y):
+        """Fit one Gaussian process per output.
+
+        Parameters
+        ----------
+        X : array-like, shape = (n_samples, n_features)
+            Training data
+
+        y : array-like, shape = (n_samples, n_outputs)
+            Target values
+
+        Returns
+        -------
+        self
+            Returns an instance of self.
+        """
+        y = np.asarray(y)
+        if y.ndim != 2:
+            raise ValueError(
+                "y must be 2-dimensional with one column per output, got "
+                "shape {}.".format(y.shape)
+            )
+
+        base_estimator = self.base_estimator
+        if base_estimator is None:
+            base_estimator = GaussianProcessRegressor()
+
+        first = clone(base_estimator).fit(X, y[:, 0])
+        self.estimators_ = [first]
+        for k in range(1, y.shape[1]):
+            if self.tie_hyperparameters:
+                est = _gp_with_shared_factorization(first, y[:, k])
+            else:
+                est = clone(base_estimator).fit(X, y[:, k])
+            self.estimators_.append(est)
+        return self
+
+    def predict(self, X, return_std=False):
+        """Predict all outputs for X.
+
+        Parameters
+        ----------
+        X : array-like, shape = (n_samples, n_features)
+            Query points where the GPs are evaluated.
+
+        return_std : bool, default: False
+            If True, the standard-deviation of the predictive distribution
+            of each output is returned along with the mean.
+
+        Returns
+        -------
+        y_mean : array, shape = (n_samples, n_outputs)
+            Mean of predictive distribution at the query points.
+
+        y_std : array, shape = (n_samples, n_outputs), optional
+            Standard deviation of predictive distribution at the query
+            points. Only returned when return_std is True.
+        """
+        check_is_fitted(self, "estimators_")
+        if not self.tie_hyperparameters:
+            predictions = [
+                est.predict(X, return_std=return_std) for est in self.estimators_
+            ]
+            if return_std:
+                y_mean, y_std = zip(*predictions)
+                return np.column_stack(y_mean), np.column_stack(y_std)
+            return np.column_stack(predictions)
+
+        X = check_array(X)
+        first = self.estimators_[0]
+        y_train_mean = np.array(
+            [np.squeeze(est.y_train_mean_) for est in self.estimators_]
+        )
+        y_train_std = np.array(
+            [np.squeeze(est.y_train_std_) for est in self.estimators_]
+        )
+        alpha = np.column_stack([est.alpha_ for est in self.estimators_])
+
+        dtype = np.dtype(first.predict_dtype)
+        K_trans = first._cross_covariance(X, dtype)
+        K_inv = first.K_inv_ if return_std else None
+        y_mean, K_trans_K_inv_K_trans = _posterior_products(K_trans, alpha, K_inv)
+        y_mean = (y_train_std * y_mean + y_train_mean).astype(dtype, copy=False)
+        if not return_std:
+            return y_mean
+
+        # the normalized predictive variance does not depend on the targets
+        y_var = first.kernel_.diag(X)
+        y_var -= K_trans_K_inv_K_trans
+        y_var_negative = y_var < 0
+        if np.any(y_var_negative):
+            warnings.warn(
+                "Predicted variances smaller than 0. " "Setting those variances to 0."
+            )
+            y_var[y_var_negative] = 0.0
+        y_std = np.sqrt(y_var)[:, np.newaxis] * y_train_std
+        return y_mean, y_std.astype(dtype, copy=False)
@@ -314,6 +314,47 @@ class DotProduct(Kernel, sk_DotProduct):
         return np.asarray(X_train)
 
 
+def _weighted_mismatches(X, Y, weights):
+    """Return ``sum_k weights[k] * (X[i, k] != Y[j, k])`` for all pairs.
+
+    When the features take few distinct values, as the columns of
+    categorical dimensions do, the values of each feature are one-hot
+    encoded and the weighted number of matches is a single matrix product.
+    Otherwise the mismatches are accumulated one feature at a time. Neither
+    path allocates an array of shape (n_samples_X, n_samples_Y, n_features).
+    """
+    n_features = X.shape[1]
+    codes_X = np.empty(X.shape, dtype=np.intp)
+    codes_Y = np.empty(Y.shape, dtype=np.intp)
+    offsets = np.zeros(n_features + 1, dtype=np.intp)
+    for k in range(n_features):
+        _, codes = np.unique(np.concatenate((X[:, k], Y[:, k])), return_inverse=True)
+        codes_X[:, k] = codes[: X.shape[0]]
+        codes_Y[:, k] = codes[X.shape[0] :]
+        offsets[k + 1] = offsets[k] + codes.max() + 1
+
+    n_codes = offsets[-1]
+    if n_codes <= 8 * n_features:
+        one_hot_X = np.zeros((X.shape[0], n_codes))
+        one_hot_Y = np.zeros((Y.shape[0], n_codes))
+        columns = np.arange(n_features)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        one_hot_X[rows, codes_X + offsets[columns]] = weights[columns]
+        rows = np.arange(Y.shape[0])[:, np.newaxis]
+        one_hot_Y[rows, codes_Y + offsets[columns]] = 1.0
+        mismatches = np.sum(weights) - one_hot_X.dot(one_hot_Y.T)
+        # round-off of the matrix product around exact matches
+        np.maximum(mismatches, 0.0, out=mismatches)
+        return mismatches
+
+    mismatches = np.zeros((X.shape[0], Y.shape[0]))
+    for k in range(n_features):
+        mismatches += weights[k] * (
+            codes_X[:, k, np.newaxis] != codes_Y[np.newaxis, :, k]
+        )
+    return mismatches
+
+
 class HammingKernel(sk_StationaryKernelMixin, sk_NormalizedKernelMixin, Kernel):
     r"""The HammingKernel is used to handle categorical inputs.
 
@@ -398,22 +439,181 @@ class HammingKernel(sk_StationaryKernelMixin, sk_NormalizedKernelMixin, Kernel):
         else:
             Y = np.atleast_2d(Y)
 
-        indicator = np.expand_dims(X, axis=1) != Y
-        kernel_prod = np.exp(-np.sum(length_scale * indicator, axis=2))
+        weights = np.broadcast_to(length_scale, (n_dim,))
+        kernel_prod = np.exp(-_weighted_mismatches(X, Y, weights))
+        if not eval_gradient:
+            return kernel_prod
 
         # dK / d theta = (dK / dl) * (dl / d theta)
         # theta = log(l) => dl / d (theta) = e^theta = l
         # dK / d theta = l * dK / dl
 
-        # dK / dL computation
+        # dK / dL computation, one feature at a time to avoid allocating
+        # a boolean indicator tensor next to the gradient
         if anisotropic:
-            grad = -np.expand_dims(kernel_prod, axis=-1) * np.array(
-                indicator, dtype=np.float32
-            )
+            grad = np.empty((n_samples, n_samples, n_dim))
+            for k in range(n_dim):
+                np.not_equal(X[:, k, np.newaxis], X[np.newaxis, :, k], out=grad[..., k])
+            grad *= -np.expand_dims(kernel_prod, axis=-1)
         else:
-            grad = -np.expand_dims(kernel_prod * np.sum(indicator, axis=2), axis=-1)
+            n_mismatches = _weighted_mismatches(X, X, np.ones(n_dim))
+            grad = -np.expand_dims(kernel_prod * n_mismatches, axis=-1)
 
         grad *= length_scale
-        if eval_gradient:
-            return kernel_prod, grad
-        return kernel_prod
+        return kernel_prod, grad
+
+
+class MixedKernel(Kernel):
+    r"""Product kernel for spaces mixing categorical and other dimensions.
+
+    ``K(x_1, x_2) = K_c(x_1c, x_2c) * K_h(l(x_1), l(x_2))``
+
+    where ``x_c`` are the continuous columns of ``x``, ``l(x)`` are the
+    category codes of the categorical dimensions of ``x`` and ``K_h`` is
+    usually a ``HammingKernel``. Each categorical dimension therefore has a
+    single length scale, instead of one per one-hot encoded column, and the
+    continuous kernel only sees the continuous columns.
+
+    Parameters
+    ----------
+    * `continuous_kernel` [kernel object]
+        The kernel applied to the continuous columns.
+
+    * `categorical_kernel` [kernel object]
+        The kernel applied to the category codes, with one feature per
+        categorical dimension.
+
+    * `continuous_columns` [list of int]
+        The columns of `X` holding the continuous dimensions.
+
+    * `categorical_columns` [list of (int, int) tuples]
+        For each categorical dimension, the first and last plus one columns
+        of `X` holding its one-hot encoding. A single column holds either
+        the binary encoding of two categories or a category code.
+    """
+
+    def __init__(
+        self,
+        continuous_kernel,
+        categorical_kernel,
+        continuous_columns,
+        categorical_columns,
+    ):
+        self.continuous_kernel = continuous_kernel
+        self.categorical_kernel = categorical_kernel
+        self.continuous_columns = continuous_columns
+        self.categorical_columns = categorical_columns
+
+    @property
+    def hyperparameters(self):
+        r = []
+        for name in ["continuous_kernel", "categorical_kernel"]:
+            for hyperparameter in getattr(self, name).hyperparameters:
+                r.append(
+                    Hyperparameter(
+                        name + "__" + hyperparameter.name,
+                        hyperparameter.value_type,
+                        hyperparameter.bounds,
+                        hyperparameter.n_elements,
+                    )
+                )
+        return r
+
+    @property
+    def theta(self):
+        return np.append(self.continuous_kernel.theta, self.categorical_kernel.theta)
+
+    @theta.setter
+    def theta(self, theta):
+        n_continuous = self.continuous_kernel.n_dims
+        self.continuous_kernel.theta = theta[:n_continuous]
+        self.categorical_kernel.theta = theta[n_continuous:]
+
+    @property
+    def bounds(self):
+        bounds = [self.continuous_kernel.bounds, self.categorical_kernel.bounds]
+        return np.vstack([b for b in bounds if b.size > 0]).reshape(-1, 2)
+
+    def _split(self, X):
+        """Return the continuous columns and the category codes of X."""
+        X = np.atleast_2d(X)
+        codes = np.empty((X.shape[0], len(self.categorical_columns)))
+        for j, (start, stop) in enumerate(self.categorical_columns):
+            if stop - start == 1:
+                codes[:, j] = X[:, start]
+            else:
+                codes[:, j] = np.argmax(X[:, start:stop], axis=1)
+        return X[:, self.continuous_columns], codes
+
+    def __call__(self, X, Y=None, eval_gradient=False):
+        """Return the kernel k(X, Y) and optionally its gradient.
+
+        Parameters
+        ----------
+        * `X` [array-like, shape=(n_samples_X, n_features)]
+            Left argument of the returned kernel k(X, Y)
+
+        * `Y` [array-like, shape=(n_samples_Y, n_features) or None(default)]
+            Right argument of the returned kernel k(X, Y). If None, k(X, X)
+            if evaluated instead.
+
+        * `eval_gradient` [bool, False(default)]
+            Determines whether the gradient with respect to the kernel
+            hyperparameter is determined. Only supported when Y is None.
+
+        Returns
+        -------
+        * `K` [array-like, shape=(n_samples_X, n_samples_Y)]
+            Kernel k(X, Y)
+
+        * `K_gradient` [array-like, shape=(n_samples_X, n_samples_X, n_dims)]
+            The gradient of the kernel k(X, X) with respect to the
+            hyperparameter of the kernel. Only returned when eval_gradient
+            is True.
+        """
+        X_continuous, X_codes = self._split(X)
+        if Y is None:
+            Y_continuous, Y_codes = None, None
+        else:
+            Y_continuous, Y_codes = self._split(Y)
+
+        if not eval_gradient:
+            return self.continuous_kernel(
+                X_continuous, Y_continuous
+            ) * self.categorical_kernel(X_codes, Y_codes)
+
+        K1, K1_gradient = self.continuous_kernel(
+            X_continuous, Y_continuous, eval_gradient=True
+        )
+        K2, K2_gradient = self.categorical_kernel(X_codes, Y_codes, eval_gradient=True)
+        return K1 * K2, np.dstack(
+            (K1_gradient * K2[:, :, np.newaxis], K2_gradient * K1[:, :, np.newaxis])
+        )
+
+    def diag(self, X):
+        X_continuous, X_codes = self._split(X)
+        return self.continuous_kernel.diag(X_continuous) * (
+            self.categorical_kernel.diag(X_codes)
+        )
+
+    def is_stationary(self):
+        return (
+            self.continuous_kernel.is_stationary()
+            and self.categorical_kernel.is_stationary()
+        )
+
+    def gradient_x(self, x, X_train):
+        # the categorical kernel is piecewise constant in x
+        x = np.asarray(x).reshape((1, -1))
+        X_train = np.asarray(X_train)
+        x_continuous, x_codes = self._split(x)
+        X_train_continuous, X_train_codes = self._split(X_train)
+
+        gradient = np.zeros(X_train.shape)
+        gradient[:, self.continuous_columns] = np.expand_dims(
+            self.categorical_kernel(x_codes, X_train_codes)[0], axis=1
+        ) * self.continuous_kernel.gradient_x(x_continuous[0], X_train_continuous)
+        return gradient
+
+    def __repr__(self):
+        return "{0} * {1}".format(self.continuous_kernel, self.categorical_kernel)
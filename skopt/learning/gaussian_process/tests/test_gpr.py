@@ -1,3 +1,6 @@
+import pickle
+import tracemalloc
+
 import numpy as np
 import pytest
 from numpy.testing import (
@@ -8,8 +11,18 @@ from numpy.testing import (
 from scipy import optimize
 
 from skopt.learning import GaussianProcessRegressor
-from skopt.learning.gaussian_process.gpr import _param_for_white_kernel_in_Sum
-from skopt.learning.gaussian_process.kernels import RBF, Matern, WhiteKernel
+from skopt.learning.gaussian_process import MultiOutputGaussianProcessRegressor
+from skopt.learning.gaussian_process.gpr import (
+    _cross_covariance_float32,
+    _param_for_white_kernel_in_Sum,
+)
+from skopt.learning.gaussian_process.kernels import (
+    RBF,
+    ConstantKernel,
+    HammingKernel,
+    Matern,
+    WhiteKernel,
+)
 
 rng = np.random.RandomState(0)
 X = rng.randn(5, 5)
@@ -138,3 +151,132 @@ def test_gpr_handles_similar_points():
     model = GaussianProcessRegressor()
     # this fails if singular matrix is not handled
     model.fit(X, y)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("normalize_y", [True, False])
+def test_multi_output_tied_hyperparameters(normalize_y):
+    # With fixed hyperparameters tying them does not change the predictions.
+    y_multi = np.column_stack((y, np.exp(y), np.ones(5)))
+    X_new = rng.randn(7, 5)
+    gpr = GaussianProcessRegressor(mat, optimizer=None, normalize_y=normalize_y)
+    tied = MultiOutputGaussianProcessRegressor(gpr, tie_hyperparameters=True)
+    tied.fit(X, y_multi)
+    untied = MultiOutputGaussianProcessRegressor(gpr).fit(X, y_multi)
+
+    assert tied.estimators_[1].L_ is tied.estimators_[0].L_
+    for k, est in enumerate(untied.estimators_):
+        assert_almost_equal(
+            tied.estimators_[k].log_marginal_likelihood_value_,
+            est.log_marginal_likelihood_value_,
+        )
+
+    mean_tied, std_tied = tied.predict(X_new, return_std=True)
+    mean_untied, std_untied = untied.predict(X_new, return_std=True)
+    assert_array_equal(mean_tied.shape, (7, 3))
+    assert_array_almost_equal(mean_tied, mean_untied)
+    assert_array_almost_equal(std_tied, std_untied)
+    assert_array_almost_equal(tied.predict(X_new), mean_tied)
+    for k, est in enumerate(tied.estimators_):
+        assert_array_almost_equal(est.predict(X_new), mean_tied[:, k])
+
+    with pytest.raises(ValueError):
+        tied.fit(X, y)
+
+
+@pytest.mark.fast_test
+def test_kernel_cache():
+    X_new = rng.randn(7, 5)
+    X_other = rng.randn(7, 5)
+    gpr = GaussianProcessRegressor(mat, kernel_cache_size=7 * 5 * 8).fit(X, y)
+    reference = GaussianProcessRegressor(mat).fit(X, y)
+
+    mean, std = gpr.predict(X_new, return_std=True)
+    assert len(gpr._K_trans_cache) == 1
+    cached_mean, cached_std = gpr.predict(X_new.copy(), return_std=True)
+    assert len(gpr._K_trans_cache) == 1
+    assert_array_equal(mean, cached_mean)
+    assert_array_equal(std, cached_std)
+    ref_mean, ref_std = reference.predict(X_new, return_std=True)
+    assert_array_almost_equal(mean, ref_mean)
+    assert_array_almost_equal(std, ref_std)
+
+    # the least recently used matrix is evicted when the cache is full
+    gpr.predict(X_other)
+    assert len(gpr._K_trans_cache) == 1
+    assert_array_almost_equal(gpr.predict(X_new), ref_mean)
+
+    # the cache is neither pickled nor kept after a refit
+    restored = pickle.loads(pickle.dumps(gpr))
+    assert not hasattr(restored, "_K_trans_cache")
+    assert_array_almost_equal(restored.predict(X_new), ref_mean)
+    gpr.fit(X, y)
+    assert len(gpr._K_trans_cache) == 0
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize(
+    "kernel",
+    [
+        RBF([0.5, 1.0, 2.0, 0.3, 1.0]),
+        Matern(0.7, nu=0.5),
+        Matern([0.5, 1.0, 2.0, 0.3, 1.0], nu=1.5),
+        ConstantKernel(2.0) * Matern(0.7, nu=2.5) + WhiteKernel(0.1),
+        Matern(0.7, nu=np.inf),
+        HammingKernel(),
+    ],
+)
+def test_cross_covariance_float32(kernel):
+    X_new = rng.randn(7, 5)
+    K = _cross_covariance_float32(kernel, X_new, X)
+    assert K.dtype == np.float32
+    assert_array_almost_equal(K, kernel(X_new, X), 5)
+
+
+@pytest.mark.fast_test
+def test_single_precision_prediction():
+    X_new = rng.randn(7, 5)
+    gpr = GaussianProcessRegressor(mat, normalize_y=True).fit(X, y)
+    gpr32 = GaussianProcessRegressor(mat, normalize_y=True, predict_dtype="float32")
+    gpr32.fit(X, y)
+    assert gpr32.L_.dtype == np.float64
+    assert gpr32.K_inv_.dtype == np.float64
+    assert gpr32._cross_covariance(X_new, np.float32).dtype == np.float32
+
+    mean, std = gpr.predict(X_new, return_std=True)
+    mean32, std32 = gpr32.predict(X_new, return_std=True)
+    assert mean32.dtype == np.float32
+    assert std32.dtype == np.float32
+    assert_array_almost_equal(mean32, mean, 4)
+    assert_array_almost_equal(std32, std, 4)
+
+    # gradients stay in double precision
+    grads = gpr32.predict(
+        X_new[:1], return_std=True, return_mean_grad=True, return_std_grad=True
+    )
+    for value in grads:
+        assert value.dtype == np.float64
+
+    gpr32.set_params(predict_dtype="float16")
+    with pytest.raises(ValueError):
+        gpr32.fit(X, y)
+
+
+@pytest.mark.fast_test
+def test_single_precision_prediction_memory():
+    X_train = rng.rand(100, 5)
+    y_train = np.sin(X_train.sum(axis=1))
+    X_new = rng.rand(4000, 5)
+    peaks = []
+    for predict_dtype in ["float64", "float32"]:
+        gpr = GaussianProcessRegressor(
+            Matern(np.ones(5), nu=2.5), optimizer=None, predict_dtype=predict_dtype
+        ).fit(X_train, y_train)
+        tracemalloc.start()
+        gpr.predict(X_new, return_std=True)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    # the float32 cross-covariance and one temporary of the Matern kernel,
+    # 1.6 MB each, dominate the peak
+    assert peaks[1] < 0.5 * peaks[0]
+    assert peaks[1] < 2 * 4000 * 100 * 4 + 2**20
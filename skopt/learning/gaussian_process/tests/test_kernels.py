@@ -19,6 +19,7 @@ from skopt.learning.gaussian_process.kernels import (
     ExpSineSquared,
     HammingKernel,
     Matern,
+    MixedKernel,
     RationalQuadratic,
     WhiteKernel,
 )
@@ -250,3 +251,57 @@ def test_gp_regressor():
         gpr.fit(X, y)
         assert_array_almost_equal(gpr.predict(X), y)
         assert_array_almost_equal(gpr.predict(X[:2]), y[:2])
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("n_values", [2, 50])
+@pytest.mark.parametrize("length_scale", [2.0, [0.1, 1.0, 3.0]])
+def test_hamming_kernel_many_values(n_values, length_scale):
+    # features with few values use one-hot matrix products, features with
+    # many values are compared one at a time
+    rng = np.random.RandomState(0)
+    X = rng.randint(0, n_values, (20, 3)).astype(float)
+    Y = rng.randint(0, n_values, (30, 3)).astype(float)
+    hm = HammingKernel(length_scale=length_scale)
+
+    indicator = np.expand_dims(X, axis=1) != Y
+    expected = np.exp(-np.sum(np.asarray(length_scale) * indicator, axis=2))
+    assert_array_almost_equal(hm(X, Y), expected)
+    assert_array_almost_equal(hm(Y), hm(Y, Y))
+
+
+@pytest.mark.fast_test
+def test_mixed_kernel():
+    rng = np.random.RandomState(0)
+    # two continuous columns, a categorical dimension with three one-hot
+    # columns and a binary categorical dimension
+    codes = rng.randint(0, 3, (10, 2))
+    codes[:, 1] %= 2
+    X = np.hstack((rng.rand(10, 2), np.eye(3)[codes[:, 0]], codes[:, 1:]))
+    matern = Matern(length_scale=[0.5, 2.0], nu=2.5)
+    hm = HammingKernel(length_scale=[0.3, 1.5])
+    mixed = MixedKernel(matern, hm, [0, 1], [(2, 5), (5, 6)])
+
+    assert_array_almost_equal(mixed(X), matern(X[:, :2]) * hm(codes))
+    assert_array_almost_equal(
+        mixed(X[:4], X), matern(X[:4, :2], X[:, :2]) * hm(codes[:4], codes)
+    )
+    assert_array_almost_equal(mixed.diag(X), np.ones(10))
+    assert_array_equal(mixed.theta, np.log([0.5, 2.0, 0.3, 1.5]))
+    assert_array_equal(mixed.bounds.shape, (4, 2))
+
+    def eval_kernel_for_theta(theta, kernel):
+        return kernel.clone_with_theta(theta)(X)
+
+    K, K_gradient = mixed(X, eval_gradient=True)
+    assert_array_equal(K_gradient.shape, (10, 10, 4))
+    K_gradient_approx = _approx_fprime(
+        mixed.theta, eval_kernel_for_theta, 1e-10, (mixed,)
+    )
+    assert_array_almost_equal(K_gradient_approx, K_gradient, 4)
+
+    # the kernel is piecewise constant in the categorical columns
+    X_grad = mixed.gradient_x(X[0], X[1:])
+    assert_array_equal(X_grad[:, 2:], 0.0)
+    num_grad = numerical_gradient(X[0], X[1:], mixed)
+    assert_array_almost_equal(X_grad[:, :2], num_grad[:, :2], decimal=3)
@@ -1,20 +1,38 @@
 import numpy as np
+import packaging.version
+import sklearn
 from joblib import Parallel, delayed
 from sklearn.base import BaseEstimator, RegressorMixin, clone
-from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
 from sklearn.utils import check_random_state
 
 
+def _check_hist_quantile_loss():
+    """Raise if `HistGradientBoostingRegressor` does not support the quantile
+    loss, which was added in scikit-learn 1.1."""
+    sklearn_version = packaging.version.Version(sklearn.__version__)
+    if sklearn_version < packaging.version.Version("1.1"):
+        raise ImportError(
+            "Quantile regression with HistGradientBoostingRegressor requires "
+            "scikit-learn >= 1.1, found %s. Use GradientBoostingRegressor or "
+            "upgrade scikit-learn." % sklearn.__version__
+        )
+
+
 def _parallel_fit(regressor, X, y):
     return regressor.fit(X, y)
 
 
+def _parallel_predict(regressor, X):
+    return regressor.predict(X)
+
+
 class GradientBoostingQuantileRegressor(BaseEstimator, RegressorMixin):
     """Predict several quantiles with one estimator.
 
-    This is a wrapper around `GradientBoostingRegressor`'s quantile
-    regression that allows you to predict several `quantiles` in
-    one go.
+    This is a wrapper around the quantile regression of
+    `GradientBoostingRegressor` or `HistGradientBoostingRegressor` that
+    allows you to predict several `quantiles` in one go.
 
     Parameters
     ----------
@@ -22,18 +40,31 @@ class GradientBoostingQuantileRegressor(BaseEstimator, RegressorMixin):
         Quantiles to predict. By default the 16, 50 and 84%
         quantiles are predicted.
 
-    base_estimator : GradientBoostingRegressor instance or None (default)
+    base_estimator : GradientBoostingRegressor instance, \
+            HistGradientBoostingRegressor instance or None (default)
         Quantile regressor used to make predictions. Only instances
-        of `GradientBoostingRegressor` are supported. Use this to change
-        the hyper-parameters of the estimator.
+        of `GradientBoostingRegressor` or `HistGradientBoostingRegressor`
+        with quantile loss are supported. Use this to change the
+        hyper-parameters of the estimator. The histogram based
+        `HistGradientBoostingRegressor` bins the features, which keeps its
+        fit time low on large numbers of samples. It requires
+        scikit-learn >= 1.1.
 
     n_jobs : int, default=1
-        The number of jobs to run in parallel for `fit`.
+        The number of jobs to run in parallel for `fit` and `predict`.
         If -1, then the number of jobs is set to the number of cores.
 
     random_state : int, RandomState instance, or None (default)
         Set random state to something other than None for reproducible
         results.
+
+    backend : str, default='threading'
+        The joblib backend used to fit the quantile regressors in parallel.
+        `GradientBoostingRegressor` holds the GIL for most of its fit, use
+        a process based backend such as `'loky'` to fit the regressors
+        concurrently on several cores. The training data is then shared
+        with the workers through memory-mapped arrays when large, and the
+        fitted regressors are sent back. Predictions always run in threads.
     """
 
     def __init__(
@@ -42,6 +73,7 @@ class GradientBoostingQuantileRegressor(BaseEstimator, RegressorMixin):
         base_estimator=None,
         n_jobs=1,
         random_state=None,
+        backend='threading',
     ):
         if quantiles is None:
             quantiles = [0.16, 0.5, 0.84]
@@ -49,6 +81,7 @@ class GradientBoostingQuantileRegressor(BaseEstimator, RegressorMixin):
         self.random_state = random_state
         self.base_estimator = base_estimator
         self.n_jobs = n_jobs
+        self.backend = backend
 
     def fit(self, X, y):
         """Fit one regressor for each quantile.
@@ -69,9 +102,13 @@ class GradientBoostingQuantileRegressor(BaseEstimator, RegressorMixin):
         else:
             base_estimator = self.base_estimator
 
-            if not isinstance(base_estimator, GradientBoostingRegressor):
+            if not isinstance(
+                base_estimator,
+                (GradientBoostingRegressor, HistGradientBoostingRegressor),
+            ):
                 raise ValueError(
-                    'base_estimator has to be of type' ' GradientBoostingRegressor.'
+                    'base_estimator has to be of type GradientBoostingRegressor'
+                    ' or HistGradientBoostingRegressor.'
                 )
 
             if not base_estimator.loss == 'quantile':
@@ -80,17 +117,23 @@ class GradientBoostingQuantileRegressor(BaseEstimator, RegressorMixin):
                     ' loss not %s' % base_estimator.loss
                 )
 
+            if isinstance(base_estimator, HistGradientBoostingRegressor):
+                _check_hist_quantile_loss()
+
         # The predictions for different quantiles should be sorted.
         # Therefore each of the regressors need the same seed.
         base_estimator.set_params(random_state=rng)
         regressors = []
         for q in self.quantiles:
             regressor = clone(base_estimator)
-            regressor.set_params(alpha=q)
+            if isinstance(regressor, HistGradientBoostingRegressor):
+                regressor.set_params(quantile=q)
+            else:
+                regressor.set_params(alpha=q)
 
             regressors.append(regressor)
 
-        self.regressors_ = Parallel(n_jobs=self.n_jobs, backend='threading')(
+        self.regressors_ = Parallel(n_jobs=self.n_jobs, backend=self.backend)(
             delayed(_parallel_fit)(regressor, X, y) for regressor in regressors
         )
 
@@ -110,9 +153,8 @@ class GradientBoostingQuantileRegressor(BaseEstimator, RegressorMixin):
             where `n_samples` is the number of samples
             and `n_features` is the number of features.
         """
-        predicted_quantiles = np.asarray([rgr.predict(X) for rgr in self.regressors_])
         if return_quantiles:
-            return predicted_quantiles.T
+            return self._predict_quantiles(X, self.quantiles).T
 
         elif return_std:
             std_quantiles = [0.16, 0.5, 0.84]
@@ -122,10 +164,25 @@ class GradientBoostingQuantileRegressor(BaseEstimator, RegressorMixin):
                     "return_std works only if the quantiles during "
                     "instantiation include 0.16, 0.5 and 0.84"
                 )
-            low = self.regressors_[self.quantiles.index(0.16)].predict(X)
-            high = self.regressors_[self.quantiles.index(0.84)].predict(X)
-            mean = self.regressors_[self.quantiles.index(0.5)].predict(X)
+            low, mean, high = self._predict_quantiles(X, std_quantiles)
             return mean, ((high - low) / 2.0)
 
         # return the mean
-        return self.regressors_[self.quantiles.index(0.5)].predict(X)
+        return self._predict_quantiles(X, [0.5])[0]
+
+    def _predict_quantiles(self, X, quantiles):
+        """Predict `X` at each of `quantiles`, shape=(len(quantiles), n_samples).
+
+        Each of the required regressors predicts once, the regressors run
+        in `n_jobs` threads.
+        """
+        regressors = [
+            self.regressors_[list(self.quantiles).index(q)] for q in quantiles
+        ]
+        if len(regressors) == 1:
+            return regressors[0].predict(X)[np.newaxis]
+        return np.asarray(
+            Parallel(n_jobs=self.n_jobs, backend='threading')(
+                delayed(_parallel_predict)(regressor, X) for regressor in regressors
+            )
+        )
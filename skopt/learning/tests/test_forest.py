@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
-from numpy.testing import assert_array_equal
+from joblib import parallel_backend
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 from skopt.learning import ExtraTreesRegressor, RandomForestRegressor
 
@@ -113,3 +114,88 @@ def test_extra_forest():
     # also test apply
     leaf_indices = clf.apply(X)
     assert leaf_indices.shape == (len(X), clf.n_estimators)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("regressor", [RandomForestRegressor, ExtraTreesRegressor])
+def test_forest_std(regressor):
+    rng = np.random.RandomState(0)
+    X = rng.uniform(-2, 2, (50, 2))
+    y = truth(X) + rng.normal(scale=0.1, size=50)
+    T = rng.uniform(-2, 2, (20, 2))
+
+    forest = regressor(n_estimators=10, min_variance=0.01, random_state=1)
+    forest.fit(X, y)
+    mean, std = forest.predict(T, return_std=True)
+    assert_array_equal(mean, forest.predict(T))
+
+    # E[Var(Y | Tree)] + Var(E[Y | Tree]) computed tree by tree
+    means = np.array([tree.predict(T) for tree in forest.estimators_])
+    variances = np.array(
+        [tree.tree_.impurity[tree.apply(T)] for tree in forest.estimators_]
+    )
+    variances = np.maximum(variances, 0.01)
+    expected = np.sqrt(np.mean(variances + means**2, axis=0) - mean**2)
+    assert_array_almost_equal(std, expected)
+
+    # splitting the trees among threads does not change the result
+    forest.set_params(n_jobs=3)
+    mean_threads, std_threads = forest.predict(T, return_std=True)
+    assert_array_almost_equal(mean_threads, mean)
+    assert_array_almost_equal(std_threads, std)
+
+    # and neither does an enclosing process backend
+    with parallel_backend("loky", n_jobs=2):
+        mean_processes, std_processes = forest.predict(T, return_std=True)
+    assert_array_almost_equal(mean_processes, mean)
+    assert_array_almost_equal(std_processes, std)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("Forest", [RandomForestRegressor, ExtraTreesRegressor])
+def test_forest_leaf_statistics_follow_min_variance(Forest):
+    rng = np.random.RandomState(0)
+    X = rng.uniform(size=(40, 3))
+    y = rng.normal(size=40)
+
+    forest = Forest(n_estimators=5, random_state=0).fit(X, y)
+    _, std = forest.predict(X, return_std=True)
+
+    forest.set_params(min_variance=10.0)
+    _, std_clipped = forest.predict(X, return_std=True)
+    assert np.all(std_clipped >= 10.0**0.5 - 1e-12)
+    assert np.all(std_clipped > std)
+
+    refit = Forest(n_estimators=5, random_state=0, min_variance=10.0).fit(X, y)
+    assert_array_almost_equal(std_clipped, refit.predict(X, return_std=True)[1])
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("Forest", [RandomForestRegressor, ExtraTreesRegressor])
+def test_forest_partial_refit(Forest):
+    rng = np.random.RandomState(0)
+    X = rng.uniform(-2, 2, (30, 2))
+    y = truth(X)
+
+    forest = Forest(n_estimators=10, refit_fraction=0.3, refresh_every=2)
+    forest.set_params(random_state=1).fit(X[:20], y[:20])
+    trees = forest.estimators_
+
+    # the three oldest trees are replaced by trees fit on the new data
+    forest.fit(X, y)
+    assert forest.estimators_[:7] == trees[3:]
+    assert all(tree not in trees for tree in forest.estimators_[7:])
+    assert all(tree.tree_.n_node_samples[0] > 0 for tree in forest.estimators_)
+    mean, std = forest.predict(X, return_std=True)
+    assert_array_almost_equal(mean, forest.predict(X))
+
+    # every refresh_every partial fits all trees are refit
+    forest.fit(X, y)
+    trees = forest.estimators_
+    forest.fit(X, y)
+    assert all(tree not in trees for tree in forest.estimators_)
+
+    with pytest.raises(ValueError):
+        Forest(refit_fraction=0.0).fit(X, y)
+    with pytest.raises(ValueError):
+        Forest(refit_fraction=0.5, oob_score=True).fit(X, y)
@@ -1,10 +1,16 @@
 import numpy as np
 import pytest
+import sklearn
 from numpy.testing import assert_almost_equal, assert_array_equal, assert_equal
 from scipy import stats
-from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.ensemble import (
+    GradientBoostingRegressor,
+    HistGradientBoostingRegressor,
+    RandomForestRegressor,
+)
 
 from skopt.learning import GradientBoostingQuantileRegressor
+from skopt.utils import cook_estimator
 
 
 def truth(X):
@@ -105,3 +111,89 @@ def test_gbrt_in_parallel():
     estimates_parallel = rgr.predict(X)
 
     assert_array_equal(estimates, estimates_parallel)
+
+
+@pytest.mark.fast_test
+def test_gbrt_in_processes():
+    rng = np.random.RandomState(1)
+    X = rng.uniform(0, 5, 200)[:, np.newaxis]
+    y = truth(X) + rng.normal(0, 0.5, len(X))
+
+    rgr = GradientBoostingQuantileRegressor(random_state=1)
+    estimates = rgr.fit(X, y).predict(X, return_quantiles=True)
+
+    rgr.set_params(n_jobs=2, backend='loky')
+    estimates_processes = rgr.fit(X, y).predict(X, return_quantiles=True)
+
+    assert_array_equal(estimates, estimates_processes)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_gbrt_predicts_once_per_quantile(n_jobs):
+    rng = np.random.RandomState(1)
+    X = rng.uniform(0, 5, 100)[:, np.newaxis]
+    y = truth(X)
+
+    model = GradientBoostingQuantileRegressor(n_jobs=n_jobs, random_state=1)
+    model.fit(X, y)
+    expected = [rgr.predict(X) for rgr in model.regressors_]
+
+    calls = []
+    for rgr in model.regressors_:
+        rgr.predict = lambda X, rgr_predict=rgr.predict: (
+            calls.append(rgr_predict) or rgr_predict(X)
+        )
+
+    mean, std = model.predict(X, return_std=True)
+    assert_equal(len(calls), 3)
+    assert_equal(len(set(calls)), 3)
+    assert_array_equal(mean, expected[1])
+    assert_array_equal(std, (expected[2] - expected[0]) / 2.0)
+
+    calls.clear()
+    assert_array_equal(model.predict(X), expected[1])
+    assert_equal(len(calls), 1)
+
+
+@pytest.mark.fast_test
+def test_gbrt_hist_base_estimator():
+    rng = np.random.RandomState(1)
+    N = 10000
+    X = np.ones((N, 1))
+    y = rng.normal(size=N)
+
+    rgr = GradientBoostingQuantileRegressor(
+        base_estimator=HistGradientBoostingRegressor()
+    )
+    with pytest.raises(ValueError):
+        # 'quantile loss'
+        rgr.fit(X, y)
+
+    base = HistGradientBoostingRegressor(loss='quantile', max_iter=20)
+    rgr = GradientBoostingQuantileRegressor(base_estimator=base)
+    rgr.fit(X, y)
+    assert_equal([r.quantile for r in rgr.regressors_], rgr.quantiles)
+
+    estimates = rgr.predict(X, return_quantiles=True)
+    assert_almost_equal(
+        stats.norm.ppf(rgr.quantiles), np.mean(estimates, axis=0), decimal=2
+    )
+    mean, std = rgr.predict(X, return_std=True)
+    assert_array_equal(mean, estimates[:, 1])
+
+
+@pytest.mark.fast_test
+def test_gbrt_hist_requires_quantile_loss_support(monkeypatch):
+    monkeypatch.setattr(sklearn, "__version__", "1.0.2")
+    X = np.ones((10, 1))
+    y = np.arange(10.0)
+
+    base = HistGradientBoostingRegressor(loss='quantile', max_iter=20)
+    rgr = GradientBoostingQuantileRegressor(base_estimator=base)
+    with pytest.raises(ImportError, match="scikit-learn >= 1.1"):
+        rgr.fit(X, y)
+    with pytest.raises(ImportError, match="scikit-learn >= 1.1"):
+        cook_estimator("HGBRT")
+    # the default gradient boosting is not affected
+    GradientBoostingQuantileRegressor().fit(X, y)
@@ -114,7 +114,7 @@ def base_minimize(
           return type of the objective function is assumed to be similar to
           that of `"EIps"`
 
-    acq_optimizer : string, `"sampling"` or `"lbfgs"`, default: `"lbfgs"`
+    acq_optimizer : string, default: `"lbfgs"`
         Method to minimize the acquisition function. The fit model
         is updated with the optimal value obtained by optimizing `acq_func`
         with `acq_optimizer`.
@@ -129,6 +129,10 @@ def base_minimize(
           - `"lbfgs"` is run for 20 iterations with these points as initial
             points to find local minima.
           - The optimal of these local minima is used to update the prior.
+        - If set to `"local_search"`, then the `n_restarts_optimizer` best
+          sampled and observed points are moved to their best neighbour
+          along each dimension while this improves `acq_func`. It does not
+          need gradients and suits tree based models.
 
     x0 : list, list of lists or `None`
         Initial input points.
@@ -174,7 +178,8 @@ def base_minimize(
 
     n_restarts_optimizer : int, default: 5
         The number of restarts of the optimizer when `acq_optimizer`
-        is `"lbfgs"`.
+        is `"lbfgs"`, or the number of sampled and of observed start points
+        when it is `"local_search"`.
 
     xi : float, default: 0.01
         Controls how much improvement one wants over the previous best
@@ -23,6 +23,7 @@ def forest_minimize(
     n_jobs=1,
     model_queue_size=None,
     space_constraint=None,
+    acq_optimizer="sampling",
 ):
     """Sequential optimisation using decision trees.
 
@@ -155,6 +156,17 @@ def forest_minimize(
     n_points : int, default: 10000
         Number of points to sample when minimizing the acquisition function.
 
+    acq_optimizer : string, `"sampling"` or `"local_search"`, default: `"sampling"`
+        Method to minimize the acquisition function.
+
+        - If set to `"sampling"`, then the acquisition function is computed
+          at `n_points` randomly sampled points and the smallest value found
+          is used.
+        - If set to `"local_search"`, then the 5 best sampled points and the
+          5 best observed points are moved to their best neighbour along
+          each dimension while this improves the acquisition function. A
+          smaller `n_points` is usually sufficient.
+
     xi : float, default: 0.01
         Controls how much improvement one wants over the previous best
         values. Used when the acquisition is either `"EI"` or `"PI"`.
@@ -218,7 +230,7 @@ def forest_minimize(
         kappa=kappa,
         verbose=verbose,
         callback=callback,
-        acq_optimizer="sampling",
+        acq_optimizer=acq_optimizer,
         space_constraint=space_constraint,
         model_queue_size=model_queue_size,
     )
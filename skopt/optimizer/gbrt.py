@@ -69,8 +69,10 @@ def gbrt_minimize(
         - an instance of a `Dimension` object (`Real`, `Integer` or
           `Categorical`).
 
-    base_estimator : `GradientBoostingQuantileRegressor`
-        The regressor to use as surrogate model
+    base_estimator : `GradientBoostingQuantileRegressor`, `"GBRT"` or `"HGBRT"`
+        The regressor to use as surrogate model. `"HGBRT"` uses histogram
+        based gradient boosting, which stays fast to fit on long histories.
+        By default `"GBRT"` is used.
 
     n_calls : int, default: 100
         Number of calls to `func`.
@@ -1,5 +1,6 @@
 import sys
 import warnings
+from copy import copy
 from math import log
 from numbers import Number
 
@@ -10,9 +11,17 @@ from sklearn.base import clone, is_regressor
 from sklearn.multioutput import MultiOutputRegressor
 from sklearn.utils import check_random_state
 
-from ..acquisition import _gaussian_acquisition, gaussian_acquisition_1D
+from ..acquisition import (
+    _gaussian_acquisition,
+    _greedy_batch_selection,
+    _joint_posterior,
+    _log_local_penalizer,
+    gaussian_acquisition_1D,
+    gaussian_acquisition_from_posterior,
+)
 from ..learning import GaussianProcessRegressor
-from ..space import Categorical, Space
+from ..learning.gaussian_process import MultiOutputGaussianProcessRegressor
+from ..space import Categorical, Integer, RandomEmbedding, Space
 from ..utils import (
     check_x_in_space,
     cook_estimator,
@@ -25,6 +34,82 @@ from ..utils import (
 )
 
 
+def _dimension_neighbours(dimension, values, n_neighbours, rng):
+    """Sample `n_neighbours` neighbours of each of `values` along
+    `dimension`, shape=(len(values), n_neighbours).
+
+    Numerical values move by a gaussian step of a fifth of the range of the
+    dimension, measured on a log scale for log-uniform priors. Categorical
+    values are replaced by a random category.
+    """
+    if isinstance(dimension, Categorical):
+        categories = np.empty(len(dimension.categories), dtype=object)
+        for i, category in enumerate(dimension.categories):
+            categories[i] = category
+        return categories[
+            rng.randint(len(categories), size=(len(values), n_neighbours))
+        ]
+
+    values = np.asarray(values, dtype=float)
+    low, high = float(dimension.low), float(dimension.high)
+    log_scale = dimension.prior == "log-uniform"
+    if log_scale:
+        log_base = np.log(dimension.base)
+        values = np.log(values) / log_base
+        low, high = np.log(low) / log_base, np.log(high) / log_base
+    steps = rng.normal(scale=0.2 * (high - low), size=(len(values), n_neighbours))
+    neighbours = np.clip(values[:, np.newaxis] + steps, low, high)
+    if log_scale:
+        neighbours = dimension.base**neighbours
+    if isinstance(dimension, Integer):
+        neighbours = np.round(neighbours).astype(int)
+    return np.clip(neighbours, dimension.low, dimension.high)
+
+
+def _neighbours(space, points, n_neighbours, random_state=None):
+    """Sample `n_neighbours` neighbours of each point of `points` along every
+    dimension of `space`.
+
+    A neighbour differs from its point along a single dimension.
+
+    Parameters
+    ----------
+    space : Space
+        The space the points belong to.
+
+    points : list of lists, shape=(n_points, n_dims)
+        Points in the original space.
+
+    n_neighbours : int
+        Number of neighbours sampled along each dimension.
+
+    random_state : int, RandomState instance, or None (default)
+        Set random state to something other than None for reproducible
+        results.
+
+    Returns
+    -------
+    neighbours : list of lists, shape=(n_points * n_dims * n_neighbours, n_dims)
+        The neighbours, the ones of `points[i]` are the rows
+        `i * n_dims * n_neighbours` to `(i + 1) * n_dims * n_neighbours`.
+    """
+    rng = check_random_state(random_state)
+    n_dims = space.n_dims
+    columns = np.empty((len(points), n_dims), dtype=object)
+    for i, point in enumerate(points):
+        for j, value in enumerate(point):
+            columns[i, j] = value
+
+    neighbours = np.repeat(columns, n_dims * n_neighbours, axis=0).reshape(
+        len(points), n_dims, n_neighbours, n_dims
+    )
+    for j, dimension in enumerate(space.dimensions):
+        neighbours[:, j, :, j] = _dimension_neighbours(
+            dimension, columns[:, j], n_neighbours, rng
+        )
+    return neighbours.reshape(-1, n_dims).tolist()
+
+
 class Optimizer:
     """Run bayesian optimisation loop.
 
@@ -49,14 +134,27 @@ class Optimizer:
         - an instance of a `Dimension` object (`Real`, `Integer` or
           `Categorical`).
 
-    base_estimator : `"GP"`, `"RF"`, `"ET"`, `"GBRT"` or sklearn regressor, \
-            default: `"GP"`
+        Pass a `Space` created with `conditions` to only search the
+        dimensions which are active given the value of their parents.
+        `acq_optimizer="lbfgs"` then falls back to `"sampling"`.
+
+        Pass a `RandomEmbedding` to fit the surrogate and optimize the
+        acquisition function in a random low-dimensional embedding of the
+        space.
+
+    base_estimator : `"GP"`, `"RF"`, `"ET"`, `"GBRT"`, `"HGBRT"` or sklearn \
+            regressor, default: `"GP"`
         Should inherit from :obj:`sklearn.base.RegressorMixin`.
         In addition the `predict` method, should have an optional `return_std`
         argument, which returns `std(Y | x)` along with `E[Y | x]`.
-        If base_estimator is one of ["GP", "RF", "ET", "GBRT"], a default
+        If base_estimator is one of ["GP", "RF", "ET", "GBRT", "HGBRT"], a default
         surrogate model of the corresponding type is used corresponding to what
         is used in the minimize functions.
+        With `"EIps"` and `"PIps"` the objective and the logarithm of the
+        computation time are modelled by independent clones of the
+        regressor. To fit the kernel hyperparameters of a Gaussian process
+        on the objective only and reuse them for the time model, pass
+        `MultiOutputGaussianProcessRegressor(gp, tie_hyperparameters=True)`.
 
     n_random_starts : int, default: 10
         .. deprecated:: 0.6
@@ -106,7 +204,7 @@ class Optimizer:
           return type of the objective function is assumed to be similar to
           that of `"EIps"`
 
-    acq_optimizer : string, `"sampling"` or `"lbfgs"`, default: `"auto"`
+    acq_optimizer : string, default: `"auto"`
         Method to minimize the acquisition function. The fit model
         is updated with the optimal value obtained by optimizing `acq_func`
         with `acq_optimizer`.
@@ -123,6 +221,17 @@ class Optimizer:
           - `"lbfgs"` is run for 20 iterations with these points as initial
             points to find local minima.
           - The optimal of these local minima is used to update the prior.
+        - If set to `"local_search"`, then `acq_func` is optimized by a local
+          search which does not need gradients and suits tree based models.
+
+          - The `n_restarts_optimizer` best of `n_points` randomly sampled
+            points and the `n_restarts_optimizer` best observed points are
+            taken as start points.
+          - At each step, `n_neighbours` (default 4) neighbours of every
+            start point are sampled along each dimension and the start
+            point moves to the best of them if it improves `acq_func`.
+          - The search stops when no start point improves or after
+            `n_local_steps` (default 20) steps.
 
     random_state : int, RandomState instance, or None (default)
         Set random state to something other than None for reproducible
@@ -153,6 +262,9 @@ class Optimizer:
         (i.e. a point in space) and return True if the point satisfies
         the constraints.
         If None, the space is not conditionally constrained.
+        Pass `dimensions` as a `Space` created with
+        `vectorized_constraint=True` to evaluate the constraint on arrays
+        of points instead.
 
     Attributes
     ----------
@@ -257,7 +369,9 @@ class Optimizer:
             raise ValueError("%s has to be a regressor." % base_estimator)
 
         # treat per second acqusition function specially
-        is_multi_regressor = isinstance(base_estimator, MultiOutputRegressor)
+        is_multi_regressor = isinstance(
+            base_estimator, (MultiOutputRegressor, MultiOutputGaussianProcessRegressor)
+        )
         if "ps" in self.acq_func and not is_multi_regressor:
             self.base_estimator_ = MultiOutputRegressor(base_estimator)
         else:
@@ -277,13 +391,16 @@ class Optimizer:
 
         if space_constraint is not None:
             acq_optimizer = "sampling"
-        if acq_optimizer not in ["lbfgs", "sampling"]:
+        elif getattr(dimensions, "conditions", None) and acq_optimizer == "lbfgs":
+            # the gradient is blind to the imputation of inactive dimensions
+            acq_optimizer = "sampling"
+        if acq_optimizer not in ["lbfgs", "sampling", "local_search"]:
             raise ValueError(
-                "Expected acq_optimizer to be 'lbfgs' or "
-                "'sampling', got {}".format(acq_optimizer)
+                "Expected acq_optimizer to be 'lbfgs', 'sampling' or "
+                "'local_search', got {}".format(acq_optimizer)
             )
 
-        if not has_gradients(self.base_estimator_) and acq_optimizer != "sampling":
+        if not has_gradients(self.base_estimator_) and acq_optimizer == "lbfgs":
             raise ValueError(
                 "The regressor {} should run with "
                 "acq_optimizer"
@@ -308,33 +425,50 @@ class Optimizer:
                 'or None, got {}'.format(space_constraint)
             )
 
-        # normalize space if GP regressor
-        if isinstance(self.base_estimator_, GaussianProcessRegressor):
-            dimensions = normalize_dimensions(dimensions)
-        self.space = Space(dimensions, constraint=space_constraint)
+        if isinstance(dimensions, RandomEmbedding):
+            if space_constraint is not None:
+                raise ValueError(
+                    "space_constraint is not supported with a RandomEmbedding."
+                )
+            # the surrogate is fit in the embedding
+            self.space = dimensions
+        else:
+            # normalize space if GP regressor
+            if isinstance(self.base_estimator_, GaussianProcessRegressor):
+                dimensions = normalize_dimensions(dimensions)
+            self.space = Space(dimensions, constraint=space_constraint)
 
         self._initial_samples = None
         self._initial_point_generator = cook_initial_point_generator(
             initial_point_generator
         )
 
-        if self._initial_point_generator is not None:
-            transformer = self.space.get_transformer()
-            self._initial_samples = self._initial_point_generator.generate(
-                self.space.dimensions,
-                n_initial_points,
-                random_state=self.rng.randint(0, np.iinfo(np.int32).max),
-            )
-            self.space.set_transformer(transformer)
-
-        # record categorical and non-categorical indices
-        self._cat_inds = []
-        self._non_cat_inds = []
-        for ind, dim in enumerate(self.space.dimensions):
-            if isinstance(dim, Categorical):
-                self._cat_inds.append(ind)
-            else:
-                self._non_cat_inds.append(ind)
+        if isinstance(self.space, RandomEmbedding):
+            if self._initial_point_generator is not None:
+                # the initial points are laid out in the embedding, where the
+                # surrogate is fit, and mapped back to the original space
+                samples = self._initial_point_generator.generate(
+                    [(0.0, 1.0)] * self.space.n_components,
+                    n_initial_points,
+                    random_state=self.rng.randint(0, np.iinfo(np.int32).max),
+                )
+                self._initial_samples = self.space.inverse_transform(samples)
+            # the model space of an embedding only holds real coordinates
+            self._cat_inds = []
+            self._non_cat_inds = list(range(self.space.n_components))
+        else:
+            if self._initial_point_generator is not None:
+                transformer = self.space.get_transformer()
+                self._initial_samples = self._initial_point_generator.generate(
+                    self.space.dimensions,
+                    n_initial_points,
+                    random_state=self.rng.randint(0, np.iinfo(np.int32).max),
+                )
+                self.space.set_transformer(transformer)
+
+            # record categorical and non-categorical indices
+            self._cat_inds = list(self.space._metadata.categorical_indices)
+            self._non_cat_inds = list(self.space._metadata.numerical_indices)
 
         # Initialize storage for optimization
         if not isinstance(model_queue_size, (int, type(None))):
@@ -362,7 +496,7 @@ class Optimizer:
         """
 
         optimizer = Optimizer(
-            dimensions=self.space.dimensions,
+            dimensions=self.space,
             base_estimator=self.base_estimator_,
             n_initial_points=self.n_initial_points_,
             initial_point_generator=self._initial_point_generator,
@@ -395,7 +529,8 @@ class Optimizer:
         strategy : string, default: "cl_min"
             Method to use to sample multiple points (see also `n_points`
             description). This parameter is ignored if n_points = None.
-            Supported options are `"cl_min"`, `"cl_mean"` or `"cl_max"`.
+            Supported options are `"cl_min"`, `"cl_mean"`, `"cl_max"`,
+            `"qEI"`, `"qUCB"` or `"lp"`.
 
             - If set to `"cl_min"`, then constant liar strategy is used
                with lie objective value being minimum of observed objective
@@ -410,11 +545,41 @@ class Optimizer:
                asked from copy, it is also told to the copy with fake
                objective and so on. The type of lie defines different
                flavours of `cl_x` strategies.
+
+            - If set to `"qEI"` or `"qUCB"`, the whole batch is selected
+               from the last fitted model without refitting it. The
+               q-expected improvement, respectively the q-upper confidence
+               bound of the negated objective, of the batch is estimated
+               with Monte-Carlo samples from the joint posterior and
+               maximised greedily over a pool of candidates, see
+               :func:`skopt.acquisition.gaussian_qei` and
+               :func:`skopt.acquisition.gaussian_qucb`. The pool consists of
+               the `n_batch_candidates` (default 500) best of `n_points`
+               random points, both set in `acq_optimizer_kwargs`, and the
+               number of samples is set by `n_mc_samples` (default 512) in
+               `acq_func_kwargs`. Before the first model is fit, `"cl_min"`
+               is used instead.
+
+            - If set to `"lp"`, the local penalization strategy is used.
+               The first point is the one returned by `ask()`, every
+               further point maximises the acquisition function of the
+               last fitted model multiplied by penalizers around the points
+               already in the batch, see:
+
+               https://arxiv.org/abs/1505.08052
+
+               The radius of each penalizer is derived from a Lipschitz
+               constant estimated from the gradients of the surrogate's
+               mean. As the model is not refit, the cost of the batch
+               hardly depends on the time needed to fit the surrogate.
+               With `"gp_hedge"` the penalized acquisition function is
+               `"EI"`. Before the first model is fit, `"cl_min"` is used
+               instead.
         """
         if n_points is None:
             return self._ask()
 
-        supported_strategies = ["cl_min", "cl_mean", "cl_max"]
+        supported_strategies = ["cl_min", "cl_mean", "cl_max", "qEI", "qUCB", "lp"]
 
         if not (isinstance(n_points, int) and n_points > 0):
             raise ValueError("n_points should be int > 0, got " + str(n_points))
@@ -432,6 +597,23 @@ class Optimizer:
         if (n_points, strategy) in self.cache_:
             return self.cache_[(n_points, strategy)]
 
+        if strategy in ["qEI", "qUCB", "lp"]:
+            if strategy != "lp" and "ps" in self.acq_func:
+                raise ValueError(
+                    "Strategy %s does not support the per second "
+                    "acquisition function %s." % (strategy, self.acq_func)
+                )
+            if self._n_initial_points <= 0 and self.models:
+                if strategy == "lp":
+                    X = self._ask_local_penalization(n_points)
+                else:
+                    X = self._ask_joint(n_points, strategy)
+                self.cache_ = {(n_points, strategy): X}
+                return X
+            lie_strategy = "cl_min"
+        else:
+            lie_strategy = strategy
+
         # Copy of the optimizer is made in order to manage the
         # deletion of points with "lie" objective (the copy of
         # oiptimizer is simply discarded)
@@ -445,10 +627,10 @@ class Optimizer:
             ti_available = "ps" in self.acq_func and len(opt.yi) > 0
             ti = [t for (_, t) in opt.yi] if ti_available else None
 
-            if strategy == "cl_min":
+            if lie_strategy == "cl_min":
                 y_lie = np.min(opt.yi) if opt.yi else 0.0  # CL-min lie
                 t_lie = np.min(ti) if ti is not None else log(sys.float_info.max)
-            elif strategy == "cl_mean":
+            elif lie_strategy == "cl_mean":
                 y_lie = np.mean(opt.yi) if opt.yi else 0.0  # CL-mean lie
                 t_lie = np.mean(ti) if ti is not None else log(sys.float_info.max)
             else:
@@ -467,6 +649,195 @@ class Optimizer:
 
         return X
 
+    def _ask_joint(self, n_points, strategy):
+        """Select `n_points` points at once with a Monte-Carlo batch
+        acquisition function of the last fitted model."""
+        est = self.models[-1]
+        acq_func_kwargs = self.acq_func_kwargs
+        if acq_func_kwargs is None:
+            acq_func_kwargs = dict()
+        n_mc_samples = acq_func_kwargs.get("n_mc_samples", 512)
+        n_candidates = max(
+            self.acq_optimizer_kwargs.get("n_batch_candidates", 500), n_points
+        )
+        y_opt = np.min(self.yi)
+
+        X = self.space.rvs_transformed(n_samples=self.n_points, random_state=self.rng)
+        if hasattr(self, "next_xs_"):
+            X = np.vstack([np.vstack(self.next_xs_), X])
+        # Duplicated candidates would be treated as distinct points by
+        # surrogates without a joint posterior.
+        X_unique = np.unique(X, axis=0)
+        if len(X_unique) >= n_points:
+            X = X_unique
+
+        # Keep the candidates which are most promising on their own
+        marginal_acq_func = "EI" if strategy == "qEI" else "LCB"
+        values = _gaussian_acquisition(
+            X=X,
+            model=est,
+            y_opt=y_opt,
+            acq_func=marginal_acq_func,
+            acq_func_kwargs=acq_func_kwargs,
+        )
+        X = X[np.argsort(values, kind="stable")[:n_candidates]]
+        mu, cov = _joint_posterior(X[None, :, :], est)
+
+        base_samples = self.rng.standard_normal((n_points, n_mc_samples)).T
+        selected = _greedy_batch_selection(
+            mu[0],
+            cov[0],
+            n_points,
+            base_samples,
+            acq_func=strategy,
+            y_opt=y_opt,
+            xi=acq_func_kwargs.get("xi", 0.01),
+            kappa=acq_func_kwargs.get("kappa", 1.96),
+        )
+        return self.space.inverse_transform(X[selected])
+
+    def _ask_local_penalization(self, n_points):
+        """Select `n_points` points with the local penalization strategy
+        using the last fitted model."""
+        est = self.models[-1]
+        acq_func = "EI" if self.acq_func == "gp_hedge" else self.acq_func
+        if "ps" in self.acq_func:
+            model = est.estimators_[0]
+            y_best = np.min([y for (y, _) in self.yi])
+        else:
+            model = est
+            y_best = np.min(self.yi)
+
+        X = self.space.rvs_transformed(n_samples=self.n_points, random_state=self.rng)
+        if hasattr(self, "next_xs_"):
+            X = np.vstack([np.vstack(self.next_xs_), X])
+
+        values = _gaussian_acquisition(
+            X=X,
+            model=est,
+            y_opt=np.min(self.yi),
+            acq_func=acq_func,
+            acq_func_kwargs=self.acq_func_kwargs,
+        )
+        # The penalizers multiply the acquisition function, which therefore
+        # has to be positive: use the logarithm of its softplus.
+        log_acq = np.log(np.logaddexp(0.0, -values))
+        lipschitz = self._lipschitz_constant(model, X[:100])
+
+        x = self._ask()
+        points = [x]
+        xt = self.space.transform([x])
+        for _ in range(n_points - 1):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                mu, std = model.predict(xt, return_std=True)
+            log_acq += _log_local_penalizer(X, xt[0], mu[0], std[0], lipschitz, y_best)
+            log_acq[np.all(X == xt[0], axis=1)] = -np.inf
+            best = np.argmax(log_acq)
+            log_acq[best] = -np.inf
+            xt = X[best : best + 1]
+            points.append(self.space.inverse_transform(xt)[0])
+
+        return points
+
+    def _lipschitz_constant(self, model, X):
+        """Estimate the Lipschitz constant of the objective by the largest
+        norm of the gradient of the surrogate's mean at `X`.
+
+        Finite differences are used when `model` provides no gradients.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if has_gradients(model) and hasattr(model, "kernel_"):
+                grads = np.array(
+                    [
+                        model.predict(x.reshape(1, -1), return_mean_grad=True)[1]
+                        for x in X
+                    ]
+                )
+            else:
+                bounds = np.array(self.space.transformed_bounds, dtype=float)
+                step = 1e-3 * (bounds[:, 1] - bounds[:, 0])
+                mu = model.predict(X)
+                grads = np.empty(X.shape)
+                for j in range(X.shape[1]):
+                    X_step = X.copy()
+                    X_step[:, j] += step[j]
+                    grads[:, j] = (model.predict(X_step) - mu) / step[j]
+
+        lipschitz = np.max(np.sqrt(np.sum(grads**2, axis=1)))
+        # Avoid a vanishing constant on flat surrogates, which would
+        # penalize the whole space.
+        if not np.isfinite(lipschitz) or lipschitz < 1e-7:
+            lipschitz = 10.0
+        return lipschitz
+
+    def _local_search(self, est, X, values, acq_func):
+        """Minimize `acq_func` by a local search starting from the best
+        points of `X` and the best observed points.
+
+        The neighbours of all start points are scored in a single call to
+        the acquisition function per step.
+        """
+        n_neighbours = self.acq_optimizer_kwargs.get("n_neighbours", 4)
+        n_steps = self.acq_optimizer_kwargs.get("n_local_steps", 20)
+        y_opt = np.min(self.yi)
+
+        if "ps" in self.acq_func:
+            func_vals = [y for (y, _) in self.yi]
+        else:
+            func_vals = self.yi
+        observed = np.argsort(func_vals)[: self.n_restarts_optimizer]
+        xt = np.vstack(
+            [
+                X[np.argsort(values)[: self.n_restarts_optimizer]],
+                self.space.transform([self.Xi[i] for i in observed]),
+            ]
+        )
+        points = self.space.inverse_transform(xt)
+        current = _gaussian_acquisition(
+            X=xt,
+            model=est,
+            y_opt=y_opt,
+            acq_func=acq_func,
+            acq_func_kwargs=self.acq_func_kwargs,
+        )
+        # the observed points themselves are not candidates, only their
+        # neighbours are
+        current[-len(observed) :] = np.inf
+
+        active = np.arange(len(points))
+        for _ in range(n_steps):
+            neighbours = _neighbours(
+                self.space,
+                [points[i] for i in active],
+                n_neighbours,
+                random_state=self.rng,
+            )
+            neighbours_t = self.space.transform(neighbours)
+            neighbours_values = _gaussian_acquisition(
+                X=neighbours_t,
+                model=est,
+                y_opt=y_opt,
+                acq_func=acq_func,
+                acq_func_kwargs=self.acq_func_kwargs,
+            ).reshape(len(active), -1)
+
+            best = np.argmin(neighbours_values, axis=1)
+            best_values = neighbours_values[np.arange(len(active)), best]
+            improved = best_values < current[active]
+            for row in np.flatnonzero(improved):
+                i = active[row]
+                k = row * neighbours_values.shape[1] + best[row]
+                points[i] = neighbours[k]
+                xt[i] = neighbours_t[k]
+                current[i] = best_values[row]
+            active = active[improved]
+            if len(active) == 0:
+                break
+
+        return xt[np.argmin(current)]
+
     def _ask(self):
         """Suggest next point at which to evaluate the objective.
 
@@ -492,7 +863,7 @@ class Optimizer:
                 )
 
             next_x = self._next_x
-            min_delta_x = min([self.space.distance(next_x, xi) for xi in self.Xi])
+            min_delta_x = self.space.pairwise_distance([next_x], self.Xi).min()
             if abs(min_delta_x) <= 1e-8:
                 if self.avoid_duplicates:
                     next_x_new = next_x
@@ -607,8 +978,14 @@ class Optimizer:
         # after being "told" n_initial_points we switch from sampling
         # random points to using a surrogate model
         if fit and self._n_initial_points <= 0 and self.base_estimator_ is not None:
-            transformed_bounds = np.array(self.space.transformed_bounds)
-            est = clone(self.base_estimator_)
+            bounds = self.space.transformed_bounds
+            transformed_bounds = np.array(bounds)
+            if self.models and getattr(self.base_estimator_, "refit_fraction", 1) < 1:
+                # forests which refit part of their trees keep the trees of
+                # the previous model, copy it so that it stays unchanged
+                est = copy(self.models[-1])
+            else:
+                est = clone(self.base_estimator_)
 
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
@@ -628,19 +1005,40 @@ class Optimizer:
 
             # even with BFGS as optimizer we want to sample a large number
             # of points and then pick the best ones as starting points
-            X = self.space.transform(
-                self.space.rvs(n_samples=self.n_points, random_state=self.rng)
+            X = self.space.rvs_transformed(
+                n_samples=self.n_points, random_state=self.rng
             )
 
-            self.next_xs_ = []
-            for cand_acq_func in self.cand_acq_funcs_:
-                values = _gaussian_acquisition(
-                    X=X,
-                    model=est,
+            if self.acq_func == "gp_hedge":
+                # score all candidate acquisition functions from a single
+                # prediction of the posterior
+                acq_func_kwargs = self.acq_func_kwargs
+                if acq_func_kwargs is None:
+                    acq_func_kwargs = dict()
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    mu, std = est.predict(X, return_std=True)
+                ei, pi, lcb = gaussian_acquisition_from_posterior(
+                    mu,
+                    std,
                     y_opt=np.min(self.yi),
-                    acq_func=cand_acq_func,
-                    acq_func_kwargs=self.acq_func_kwargs,
+                    xi=acq_func_kwargs.get("xi", 0.01),
+                    kappa=acq_func_kwargs.get("kappa", 1.96),
                 )
+                hedge_values = {"EI": -ei, "LCB": lcb, "PI": -pi}
+
+            self.next_xs_ = []
+            for cand_acq_func in self.cand_acq_funcs_:
+                if self.acq_func == "gp_hedge":
+                    values = hedge_values[cand_acq_func]
+                else:
+                    values = _gaussian_acquisition(
+                        X=X,
+                        model=est,
+                        y_opt=np.min(self.yi),
+                        acq_func=cand_acq_func,
+                        acq_func_kwargs=self.acq_func_kwargs,
+                    )
                 # Find the minimum of the acquisition function by randomly
                 # sampling points from the space
                 if self.acq_optimizer == "sampling":
@@ -664,7 +1062,7 @@ class Optimizer:
                                     cand_acq_func,
                                     self.acq_func_kwargs,
                                 ),
-                                bounds=self.space.transformed_bounds,
+                                bounds=bounds,
                                 approx_grad=False,
                                 maxiter=20,
                             )
@@ -675,6 +1073,11 @@ class Optimizer:
                     cand_acqs = np.array([r[1] for r in results])
                     next_x = cand_xs[np.argmin(cand_acqs)]
 
+                # Move the best sampled and observed points to their best
+                # neighbour until the acquisition function stops improving
+                elif self.acq_optimizer == "local_search":
+                    next_x = self._local_search(est, X, values, cand_acq_func)
+
                 # lbfgs should handle this but just in case there are
                 # precision errors.
                 if not self.space.is_categorical:
@@ -622,7 +622,7 @@ def partial_dependence(
     """
     # If we haven't parsed an x_eval list we use random sampled values instead
     if x_eval is None and sample_points is None:
-        sample_points = space.transform(space.rvs(n_samples=n_samples))
+        sample_points = space.rvs_transformed(n_samples=n_samples)
     elif sample_points is None:
         sample_points = space.transform([x_eval])
 
@@ -815,7 +815,7 @@ def plot_objective(
     x_vals = _evaluate_min_params(result, minimum, n_minimum_search)
     if sample_source == "random":
         x_eval = None
-        samples = space.transform(space.rvs(n_samples=n_samples))
+        samples = space.rvs_transformed(n_samples=n_samples)
     else:
         x_eval = _evaluate_min_params(result, sample_source, n_minimum_search)
         samples = space.transform([x_eval])
@@ -1268,7 +1268,7 @@ def plot_objective_2D(
     x_vals = _evaluate_min_params(result, minimum, n_minimum_search)
     if sample_source == "random":
         x_eval = None
-        samples = space.transform(space.rvs(n_samples=n_samples))
+        samples = space.rvs_transformed(n_samples=n_samples)
     else:
         x_eval = _evaluate_min_params(result, sample_source, n_minimum_search)
         samples = space.transform([x_eval])
@@ -1,9 +1,12 @@
 import numbers
 import warnings
+from collections import namedtuple
 from collections.abc import Iterable
+from itertools import compress, count
 
 import numpy as np
 import yaml
+from scipy.spatial.distance import cdist
 from scipy.stats.distributions import randint, rv_discrete, uniform
 from sklearn.utils import check_random_state
 
@@ -35,14 +38,15 @@ def _transpose_list_array(x):
 
     n_dims = len(x)
     assert n_dims > 0
-    n_samples = len(x[0])
-    rows = [None] * n_samples
-    for i in range(n_samples):
-        r = [None] * n_dims
-        for j in range(n_dims):
-            r[j] = x[j][i]
-        rows[i] = r
-    return rows
+    return [list(row) for row in zip(*x)]
+
+
+def _check_random_state(random_state):
+    """Turn `random_state` into a `RandomState` instance, `Generator`
+    instances are returned as they are."""
+    if isinstance(random_state, np.random.Generator):
+        return random_state
+    return check_random_state(random_state)
 
 
 def check_dimension(dimension, transform=None):
@@ -235,10 +239,25 @@ def _check_dimension_old(dimension, transform=None):
     )
 
 
+# unique stamps given to a dimension whenever its transformer is replaced
+_transformer_versions = count(1)
+
+
 class Dimension:
     """Base class for search space dimensions."""
 
     prior = None
+    _transformer_version = 0
+
+    def __setattr__(self, name, value):
+        if name == "transformer":
+            super().__setattr__("_transformer_version", next(_transformer_versions))
+        super().__setattr__(name, value)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # stamps are only unique within this process
+        self._transformer_version = next(_transformer_versions)
 
     def rvs(self, n_samples=1, random_state=None):
         """Draw random samples.
@@ -248,14 +267,30 @@ class Dimension:
         n_samples : int or None
             The number of samples to be drawn.
 
-        random_state : int, RandomState instance, or None (default)
+        random_state : int, RandomState instance, Generator instance, or None
             Set random state to something other than None for reproducible
             results.
         """
-        rng = check_random_state(random_state)
+        rng = _check_random_state(random_state)
         samples = self._rvs.rvs(size=n_samples, random_state=rng)
         return self.inverse_transform(samples)
 
+    def _rvs_transformed(self, n_samples, rng):
+        """Draw `n_samples` samples in the warped space with the
+        `numpy.random.Generator` `rng`."""
+        return self.transform(self.rvs(n_samples=n_samples, random_state=rng))
+
+    def _contains_batch(self, values):
+        """Check which of `values` are within the dimension, as a boolean
+        array."""
+        contained = np.zeros(len(values), dtype=bool)
+        for i, value in enumerate(values):
+            try:
+                contained[i] = value in self
+            except (TypeError, ValueError):
+                pass
+        return contained
+
     def transform(self, X):
         """Transform samples form the original space to a warped space."""
         return self.transformer.transform(X)
@@ -307,6 +342,47 @@ def _uniform_inclusive(loc=0.0, scale=1.0):
     return uniform(loc=loc, scale=np.nextafter(scale, scale + 1.0))
 
 
+def _sampling_bounds(dimension):
+    """Bounds of the uniform distribution from which the samples of a `Real`
+    or `Integer` dimension are drawn before being inverse transformed."""
+    if dimension.transform_ == "normalize":
+        return 0.0, 1.0
+    elif dimension.prior == "uniform":
+        return dimension.low, dimension.high
+    else:
+        return (
+            np.log10(dimension.low) / dimension.log_base,
+            np.log10(dimension.high) / dimension.log_base,
+        )
+
+
+def _within_bounds(dimension, values):
+    """Check which of `values` are within the bounds of a `Real` or `Integer`
+    dimension."""
+    array = np.asarray(values)
+    if array.ndim != 1 or array.dtype.kind not in "biuf":
+        return Dimension._contains_batch(dimension, values)
+    return (dimension.low <= array) & (array <= dimension.high)
+
+
+def _is_in(values, candidates):
+    """Elementwise `value in candidates`, vectorized with `np.isin` for
+    numerical arrays and with a set lookup for hashable values."""
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        if values.dtype.kind in "biuf" and np.asarray(candidates).dtype.kind in "biuf":
+            return np.isin(values, candidates)
+    try:
+        lookup = set(candidates)
+        return np.fromiter(
+            map(lookup.__contains__, values), dtype=bool, count=len(values)
+        )
+    except TypeError:
+        # unhashable values or candidates
+        return np.fromiter(
+            (value in candidates for value in values), dtype=bool, count=len(values)
+        )
+
+
 class Real(Dimension):
     """Search space dimension that can take on any real value.
 
@@ -451,6 +527,13 @@ class Real(Dimension):
                 )
                 self.transformer = LogN(self.base)
 
+    def _rvs_transformed(self, n_samples, rng):
+        Xt = rng.uniform(*_sampling_bounds(self), size=n_samples)
+        if np.dtype(self.dtype) != np.float64:
+            # round to the precision of the samples in the original space
+            Xt = np.asarray(self.transform(self.inverse_transform(Xt)), dtype=float)
+        return Xt
+
     def __eq__(self, other):
         return (
             type(self) is type(other)
@@ -492,6 +575,9 @@ class Real(Dimension):
             point = np.array(point)
         return self.low <= point <= self.high
 
+    def _contains_batch(self, values):
+        return _within_bounds(self, values)
+
     @property
     def transformed_bounds(self):
         if self.transform_ == "normalize":
@@ -683,6 +769,12 @@ class Integer(Dimension):
                 )
                 self.transformer = LogN(self.base)
 
+    def _rvs_transformed(self, n_samples, rng):
+        if self.transform_ == "identity" and self.prior == "uniform":
+            return rng.integers(self.low, self.high + 1, size=n_samples)
+        Xt = rng.uniform(*_sampling_bounds(self), size=n_samples)
+        return np.asarray(self.transform(self.inverse_transform(Xt)), dtype=float)
+
     def __eq__(self, other):
         return (
             type(self) is type(other)
@@ -724,6 +816,9 @@ class Integer(Dimension):
             point = np.array(point)
         return self.low <= point <= self.high
 
+    def _contains_batch(self, values):
+        return _within_bounds(self, values)
+
     @property
     def transformed_bounds(self):
         if self.transform_ == "normalize":
@@ -834,6 +929,25 @@ class Categorical(Dimension):
             # XXX check that sum(prior) == 1
             self._rvs = rv_discrete(values=(range(len(self.categories)), self.prior_))
 
+    def _rvs_transformed(self, n_samples, rng):
+        n_categories = len(self.categories)
+        if self.transform_ == "normalize":
+            if n_categories == 1:
+                return np.zeros(n_samples)
+            labels = np.round(rng.uniform(size=n_samples) * (n_categories - 1))
+            return labels / (n_categories - 1)
+
+        labels = rng.choice(n_categories, size=n_samples, p=self.prior_)
+        if self.transform_ == "label":
+            return labels
+        elif self.transform_ == "onehot" and n_categories == 2:
+            return labels.astype(float)
+        elif self.transform_ == "onehot" and n_categories > 2:
+            Xt = np.zeros((n_samples, n_categories))
+            Xt[np.arange(n_samples), labels] = 1.0
+            return Xt
+        return self.transform([self.categories[i] for i in labels])
+
     def __eq__(self, other):
         return (
             type(self) is type(other)
@@ -896,6 +1010,9 @@ class Categorical(Dimension):
     def __contains__(self, point):
         return point in self.categories
 
+    def _contains_batch(self, values):
+        return _is_in(values, self.categories)
+
     @property
     def transformed_bounds(self):
         if self.transformed_size == 1:
@@ -925,6 +1042,68 @@ class Categorical(Dimension):
         return 1 if a != b else 0
 
 
+_SpaceMetadata = namedtuple(
+    "_SpaceMetadata",
+    [
+        "transformer_versions",
+        "n_dims",
+        "bounds",
+        "transformed_n_dims",
+        "transformed_columns",
+        "transformed_bounds",
+        "is_real",
+        "is_categorical",
+        "is_partly_categorical",
+        "categorical_indices",
+        "numerical_indices",
+    ],
+)
+_SpaceMetadata.__doc__ = """Properties of a `Space` derived from its dimensions,
+valid as long as the dimensions and their transformers are unchanged."""
+
+
+def _transformer_versions_of(dimensions):
+    """The transformer stamps of `dimensions`, which change when a dimension
+    is replaced or its transformer is."""
+    return tuple(dim._transformer_version for dim in dimensions)
+
+
+def _space_metadata(dimensions):
+    """Compute the `_SpaceMetadata` of `dimensions`."""
+    bounds = []
+    transformed_bounds = []
+    transformed_columns = []
+    start = 0
+    for dim in dimensions:
+        if dim.size == 1:
+            bounds.append(dim.bounds)
+        else:
+            bounds.extend(dim.bounds)
+        if dim.transformed_size == 1:
+            transformed_bounds.append(dim.transformed_bounds)
+        else:
+            transformed_bounds.extend(dim.transformed_bounds)
+        transformed_columns.append((start, start + dim.transformed_size))
+        start += dim.transformed_size
+
+    categorical = [isinstance(dim, Categorical) for dim in dimensions]
+    return _SpaceMetadata(
+        transformer_versions=_transformer_versions_of(dimensions),
+        n_dims=len(dimensions),
+        bounds=tuple(bounds),
+        transformed_n_dims=start,
+        transformed_columns=tuple(transformed_columns),
+        transformed_bounds=tuple(transformed_bounds),
+        is_real=all(isinstance(dim, Real) for dim in dimensions),
+        is_categorical=all(categorical),
+        is_partly_categorical=any(categorical),
+        categorical_indices=tuple(compress(range(len(dimensions)), categorical)),
+        numerical_indices=tuple(
+            j for j, is_categorical in enumerate(categorical) if not is_categorical
+        ),
+    )
+
+
 class Space:
     """Initialize a search space from given specifications.
 
@@ -951,14 +1130,93 @@ class Space:
         (i.e. a point in space) and return True if the point satisfies
         the constraints.
         If None, the space is not conditionally constrained.
+
+    vectorized_constraint : bool, default: False
+        If True, `constraint` takes an array of shape (n_points, n_dims),
+        of dtype object if the space has categorical dimensions and float
+        otherwise, and returns a boolean mask of shape (n_points,).
+
+    cache_feasible : bool, default: False
+        If True, the points satisfying the constraint which are drawn but
+        not returned by `rvs` are kept and returned first by the next calls
+        to `rvs`. The samples then depend on the previous calls and not
+        only on `random_state`.
+
+    conditions : dict or None, default: None
+        Activation rules of conditional dimensions, as a dict mapping the
+        name of a child dimension to a `(parent_name, values)` tuple, where
+        `values` is a value or a list of values of the parent dimension.
+        The child dimension is active when its parent is active and takes
+        one of these values, e.g.
+        `{"gamma": ("kernel", ["rbf", "poly"]), "degree": ("kernel", "poly")}`.
+        Unnamed dimensions are referred to as `"X_<index>"`.
+        Inactive dimensions are set to their lower bound, or to their first
+        category, by `rvs`, `transform` and `inverse_transform`, so that
+        points differing only in inactive dimensions are identical.
     """
 
-    def __init__(self, dimensions, constraint=None):
+    def __init__(
+        self,
+        dimensions,
+        constraint=None,
+        vectorized_constraint=False,
+        cache_feasible=False,
+        conditions=None,
+    ):
         self.dimensions = [check_dimension(dim) for dim in dimensions]
-        if constraint is None and isinstance(dimensions, Space):
-            constraint = dimensions.constraint
+        if isinstance(dimensions, Space):
+            if constraint in (None, dimensions.constraint):
+                constraint = dimensions.constraint
+                vectorized_constraint = dimensions.vectorized_constraint
+                cache_feasible = dimensions.cache_feasible
+            if conditions is None:
+                conditions = dimensions.conditions
         assert constraint is None or callable(constraint)
         self.constraint = constraint
+        self.vectorized_constraint = vectorized_constraint
+        self.cache_feasible = cache_feasible
+        self._feasible_points = []
+        self.conditions = conditions
+        self._conditions = self._check_conditions(conditions)
+
+    def _check_conditions(self, conditions):
+        """Resolve `conditions` into `(child, parent, values)` index tuples,
+        ordered such that every parent comes before its children."""
+        if not conditions:
+            return []
+        names = self.dimension_names
+        rules = {}
+        for child, (parent, values) in conditions.items():
+            for name in (child, parent):
+                if name not in names:
+                    raise ValueError(
+                        "Unknown dimension {} in conditions, expected one "
+                        "of {}.".format(name, names)
+                    )
+            child, parent = names.index(child), names.index(parent)
+            if not isinstance(values, list):
+                values = [values]
+            for value in values:
+                if value not in self.dimensions[parent]:
+                    raise ValueError(
+                        "Condition value {} is not within {}.".format(
+                            value, self.dimensions[parent]
+                        )
+                    )
+            rules[child] = (child, parent, values)
+
+        ordered = []
+        while rules:
+            ready = [c for c, (_, p, _) in rules.items() if p not in rules]
+            if not ready:
+                raise ValueError(
+                    "The conditions between dimensions {} are cyclic.".format(
+                        [names[c] for c in rules]
+                    )
+                )
+            for c in ready:
+                ordered.append(rules.pop(c))
+        return ordered
 
     def __eq__(self, other):
         return all([a == b for a, b in zip(self.dimensions, other.dimensions)])
@@ -1000,10 +1258,30 @@ class Space:
         for dim, name in zip(self.dimensions, names):
             dim.name = name
 
+    def __getstate__(self):
+        # the cached metadata is only valid within this process
+        state = self.__dict__.copy()
+        state.pop("_metadata_cache", None)
+        return state
+
+    @property
+    def _metadata(self):
+        """The `_SpaceMetadata` of the dimensions, recomputed when a
+        dimension or its transformer has been replaced."""
+        metadata = self.__dict__.get("_metadata_cache")
+        if (
+            metadata is None
+            or metadata.transformer_versions
+            != _transformer_versions_of(self.dimensions)
+        ):
+            metadata = _space_metadata(self.dimensions)
+            self._metadata_cache = metadata
+        return metadata
+
     @property
     def is_real(self):
         """Returns true if all dimensions are Real."""
-        return all([isinstance(dim, Real) for dim in self.dimensions])
+        return self._metadata.is_real
 
     @classmethod
     def from_yaml(cls, yml_path, namespace=None):
@@ -1141,43 +1419,189 @@ class Space:
         n_samples : int, default=1
             Number of samples to be drawn from the space.
 
-        random_state : int, RandomState instance, or None (default)
+        random_state : int, RandomState instance, Generator instance, or None
             Set random state to something other than None for reproducible
-            results.
+            results. With a `numpy.random.Generator`, the samples of
+            unconstrained spaces whose warped space is numerical are drawn
+            by `rvs_transformed` and inverse transformed.
 
         Returns
         -------
         points : list of lists, shape=(n_points, n_dims)
            Points sampled from the space.
         """
-        rng = check_random_state(random_state)
+        rng = _check_random_state(random_state)
+        if (
+            isinstance(rng, np.random.Generator)
+            and self.constraint is None
+            and not any(
+                isinstance(dim, Categorical)
+                and dim.transform_ in ["string", "identity"]
+                for dim in self.dimensions
+            )
+        ):
+            return self.inverse_transform(self.rvs_transformed(n_samples, rng))
+
+        points = self._feasible_points if self.cache_feasible else []
+        max_draws = max(10000 * n_samples, 1000000)
+        n_draws = n_samples
+        n_drawn = n_valid = 0
+        while len(points) < n_samples:
+            if n_drawn >= max_draws:
+                raise RuntimeError(
+                    'Could not find enough valid samples in constrained '
+                    'space. Please check that the constraint allows for '
+                    'valid samples to be drawn.'
+                )
 
-        points = []
-        for _ in range(10000):
             # Draw
-            columns = []
-            for dim in self.dimensions:
-                columns.append(dim.rvs(n_samples=n_samples, random_state=rng))
-
-            # Transpose
-            rows = _transpose_list_array(columns)
-
-            # Filter
-            if self.constraint is not None:
-                rows = [row for row in rows if self.constraint(row)]
+            columns = self._impute_inactive(self._rvs_columns(n_draws, rng))
+
+            # Filter and transpose
+            if self.constraint is None:
+                rows = _transpose_list_array(columns)
+            elif self.vectorized_constraint:
+                mask = self._constraint_mask(columns)
+                rows = _transpose_list_array(
+                    [list(compress(column, mask)) for column in columns]
+                )
+            else:
+                rows = [
+                    row
+                    for row in _transpose_list_array(columns)
+                    if self.constraint(row)
+                ]
 
             # If we have enough valid samples
             points.extend(rows)
-            if len(points) >= n_samples:
-                break
-        else:
-            raise RuntimeError(
-                'Could not find enough valid samples in constrained '
-                'space. Please check that the constraint allows for '
-                'valid samples to be drawn.'
-            )
+            n_drawn += n_draws
+            n_valid += len(rows)
+
+            # Size the next draw from the acceptance rate so far
+            n_missing = n_samples - len(points)
+            if n_valid > 0:
+                n_draws = int(np.ceil(1.2 * n_missing * n_drawn / n_valid))
+            else:
+                n_draws *= 2
+            n_draws = min(n_draws, max(n_samples, 100000), max_draws - n_drawn)
+            n_draws = max(n_draws, 1)
+
+        if self.cache_feasible:
+            self._feasible_points = points[n_samples:]
         return points[:n_samples]
 
+    def _active_columns(self, columns):
+        """Compute which values of `columns` belong to active dimensions,
+        as a dict mapping the index of each conditional dimension to a
+        boolean mask."""
+        active = {}
+        for child, parent, values in self._conditions:
+            mask = _is_in(columns[parent], values)
+            if parent in active:
+                mask &= active[parent]
+            active[child] = mask
+        return active
+
+    def _impute_inactive(self, columns):
+        """Set the values of inactive dimensions in `columns` to the lower
+        bound, or the first category, of the dimension."""
+        if not self._conditions:
+            return columns
+        columns = list(columns)
+        for j, mask in self._active_columns(columns).items():
+            if np.all(mask):
+                continue
+            dim = self.dimensions[j]
+            if isinstance(dim, Categorical):
+                value = dim.categories[0]
+            elif isinstance(dim, Real):
+                value = float(dim.low)
+            else:
+                value = dim.low
+            if isinstance(columns[j], np.ndarray):
+                columns[j] = np.where(mask, columns[j], value)
+            else:
+                columns[j] = [x if m else value for x, m in zip(columns[j], mask)]
+        return columns
+
+    def active_dimensions(self, X):
+        """Compute which dimensions of each sample are active.
+
+        Dimensions without conditions are always active.
+
+        Parameters
+        ----------
+        X : list of lists or array, shape=(n_samples, n_dims)
+            The samples.
+
+        Returns
+        -------
+        active : array of bools, shape=(n_samples, n_dims)
+            Whether dimension `j` of sample `i` is active.
+        """
+        active = np.ones((len(X), self.n_dims), dtype=bool)
+        if self._conditions:
+            for j, mask in self._active_columns(self._columns(X)).items():
+                active[:, j] = mask
+        return active
+
+    def _constraint_mask(self, columns):
+        """Evaluate the vectorized constraint on the points given as
+        columns."""
+        if not self.is_partly_categorical:
+            X = np.column_stack(columns).astype(float)
+        else:
+            X = np.empty((len(columns[0]), self.n_dims), dtype=object)
+            for j, column in enumerate(columns):
+                X[:, j] = column
+        return np.asarray(self.constraint(X), dtype=bool)
+
+    def rvs_transformed(self, n_samples=1, random_state=None):
+        """Draw random samples in the warped space.
+
+        This is equivalent to `space.transform(space.rvs(n_samples,
+        random_state))`, but the samples of unconstrained spaces are
+        transformed dimension by dimension without building the list of
+        points.
+
+        When `random_state` is a `numpy.random.Generator`, the samples of
+        unconstrained spaces are directly drawn in the warped space, without
+        going through the scipy distributions of the dimensions nor their
+        inverse transforms. The samples follow the same distributions but
+        differ from the ones drawn with a `RandomState`.
+
+        Parameters
+        ----------
+        n_samples : int, default=1
+            Number of samples to be drawn from the space.
+
+        random_state : int, RandomState instance, Generator instance, or None
+            Set random state to something other than None for reproducible
+            results.
+
+        Returns
+        -------
+        Xt : array of floats, shape=(n_samples, transformed_n_dims)
+           Points sampled from the space, in the warped space.
+        """
+        if self.constraint is not None:
+            return self.transform(self.rvs(n_samples, random_state=random_state))
+
+        rng = _check_random_state(random_state)
+        if isinstance(rng, np.random.Generator):
+            parts = [dim._rvs_transformed(n_samples, rng) for dim in self.dimensions]
+            Xt = self._pack_transformed(parts, n_samples)
+            if self._conditions:
+                Xt = self.transform(self.inverse_transform(Xt))
+            return Xt
+        return self._transform_columns(self._rvs_columns(n_samples, rng), n_samples)
+
+    def _rvs_columns(self, n_samples, rng):
+        """Draw `n_samples` values of each dimension."""
+        return [
+            dim.rvs(n_samples=n_samples, random_state=rng) for dim in self.dimensions
+        ]
+
     def set_transformer(self, transform):
         """Sets the transformer of all dimension objects to `transform`
 
@@ -1231,22 +1655,39 @@ class Space:
         Xt : array of floats, shape=(n_samples, transformed_n_dims)
             The transformed samples.
         """
-        # Pack by dimension
-        columns = []
-        for _ in self.dimensions:
-            columns.append([])
-
-        for i in range(len(X)):
-            for j in range(self.n_dims):
-                columns[j].append(X[i][j])
-
-        # Transform
-        for j in range(self.n_dims):
-            columns[j] = self.dimensions[j].transform(columns[j])
-
-        # Repack as an array
-        Xt = np.hstack([np.asarray(c).reshape((len(X), -1)) for c in columns])
+        return self._transform_columns(self._columns(X), len(X))
+
+    def _columns(self, X):
+        """Split the samples `X` into one column of values per dimension."""
+        if isinstance(X, np.ndarray) and X.ndim == 2:
+            if X.dtype == object:
+                return [X[:, j].tolist() for j in range(self.n_dims)]
+            return [X[:, j] for j in range(self.n_dims)]
+        return [list(column) for column in zip(*X)]
+
+    def _transform_columns(self, columns, n_samples):
+        """Transform the values of each dimension and pack them in the
+        columns of the warped space."""
+        columns = self._impute_inactive(columns)
+        parts = [dim.transform(column) for dim, column in zip(self.dimensions, columns)]
+        return self._pack_transformed(parts, n_samples)
+
+    def _pack_transformed(self, parts, n_samples):
+        """Pack the transformed values of each dimension in the columns of
+        the warped space."""
+        parts = [np.asarray(part).reshape((n_samples, -1)) for part in parts]
+        numeric = all(
+            np.issubdtype(part.dtype, np.number) or part.dtype == bool for part in parts
+        )
+        if not numeric:
+            # categories transformed to strings or left as they are
+            return np.hstack(parts)
 
+        Xt = np.empty(
+            (n_samples, self.transformed_n_dims), dtype=np.result_type(*parts)
+        )
+        for part, (start, stop) in zip(parts, self.transformed_columns):
+            Xt[:, start:stop] = part
         return Xt
 
     def inverse_transform(self, Xt):
@@ -1264,18 +1705,13 @@ class Space:
         """
         # Inverse transform
         columns = []
-        start = 0
         Xt = np.asarray(Xt)
-        for j in range(self.n_dims):
-            dim = self.dimensions[j]
-            offset = dim.transformed_size
-
-            if offset == 1:
+        for dim, (start, stop) in zip(self.dimensions, self.transformed_columns):
+            if stop - start == 1:
                 columns.append(dim.inverse_transform(Xt[:, start]))
             else:
-                columns.append(dim.inverse_transform(Xt[:, start : start + offset]))
-
-            start += offset
+                columns.append(dim.inverse_transform(Xt[:, start:stop]))
+        columns = self._impute_inactive(columns)
 
         # Transpose
         return _transpose_list_array(columns)
@@ -1288,20 +1724,18 @@ class Space:
     @property
     def transformed_n_dims(self):
         """The dimensionality of the warped space."""
-        return sum([dim.transformed_size for dim in self.dimensions])
+        return self._metadata.transformed_n_dims
+
+    @property
+    def transformed_columns(self):
+        """The columns of the warped space spanned by each dimension, as
+        a list of `(start, stop)` tuples."""
+        return list(self._metadata.transformed_columns)
 
     @property
     def bounds(self):
         """The dimension bounds, in the original space."""
-        b = []
-
-        for dim in self.dimensions:
-            if dim.size == 1:
-                b.append(dim.bounds)
-            else:
-                b.extend(dim.bounds)
-
-        return b
+        return list(self._metadata.bounds)
 
     def __contains__(self, point):
         """Check that `point` is within the bounds of the space."""
@@ -1309,9 +1743,55 @@ class Space:
             if component not in dim:
                 return False
         if self.constraint is not None:
+            if self.vectorized_constraint:
+                return bool(self._constraint_mask([[x] for x in point])[0])
             return bool(self.constraint(point))
         return True
 
+    def contains_batch(self, X):
+        """Check which of the points `X` are within the space.
+
+        This is equivalent to `[x in space for x in X]`, with the bounds of
+        each dimension checked for all the points at once. Points which do
+        not have one value per dimension are not within the space.
+
+        Parameters
+        ----------
+        X : list of lists or array, shape=(n_samples, n_dims)
+            The points to check.
+
+        Returns
+        -------
+        mask : array of bools, shape=(n_samples,)
+            Whether each point is within the space.
+        """
+        if isinstance(X, np.ndarray) and X.ndim == 2:
+            mask = np.full(len(X), X.shape[1] == self.n_dims)
+        else:
+            mask = np.fromiter(
+                (len(x) == self.n_dims for x in X), dtype=bool, count=len(X)
+            )
+        if not np.any(mask):
+            return mask
+
+        if not np.all(mask):
+            X = [x for x, valid in zip(X, mask) if valid]
+        columns = self._columns(X)
+        contained = np.ones(len(X), dtype=bool)
+        for dim, column in zip(self.dimensions, columns):
+            contained &= dim._contains_batch(column)
+
+        if self.constraint is not None and np.any(contained):
+            if self.vectorized_constraint:
+                contained[contained] = self._constraint_mask(
+                    [list(compress(column, contained)) for column in columns]
+                )
+            else:
+                for i in np.flatnonzero(contained):
+                    contained[i] = bool(self.constraint(X[i]))
+        mask[mask] = contained
+        return mask
+
     def __getitem__(self, dimension_names):
         """Lookup and return the search-space dimension with the given name.
 
@@ -1368,25 +1848,17 @@ class Space:
     @property
     def transformed_bounds(self):
         """The dimension bounds, in the warped space."""
-        b = []
-
-        for dim in self.dimensions:
-            if dim.transformed_size == 1:
-                b.append(dim.transformed_bounds)
-            else:
-                b.extend(dim.transformed_bounds)
-
-        return b
+        return list(self._metadata.transformed_bounds)
 
     @property
     def is_categorical(self):
         """Space contains exclusively categorical dimensions."""
-        return all([isinstance(dim, Categorical) for dim in self.dimensions])
+        return self._metadata.is_categorical
 
     @property
     def is_partly_categorical(self):
         """Space contains any categorical dimensions."""
-        return any([isinstance(dim, Categorical) for dim in self.dimensions])
+        return self._metadata.is_partly_categorical
 
     @property
     def n_constant_dimensions(self):
@@ -1414,3 +1886,316 @@ class Space:
             distance += dim.distance(a, b)
 
         return distance
+
+    def _distance_columns(self, points):
+        """Encode `points` as one float column per dimension for
+        `pairwise_distance`.
+
+        Numerical dimensions keep their original values, categorical
+        dimensions are replaced by the index of each category.
+        """
+        columns = []
+        for dim, column in zip(self.dimensions, self._columns(points)):
+            if isinstance(dim, Categorical):
+                codes = {category: i for i, category in enumerate(dim.categories)}
+                try:
+                    column = [codes[value] for value in column]
+                except (KeyError, TypeError):
+                    column = None
+            else:
+                column = np.asarray(column, dtype=float)
+                if not np.all((dim.low <= column) & (column <= dim.high)):
+                    column = None
+            if column is None:
+                raise RuntimeError(
+                    "Can only compute distance for values within %s." % dim
+                )
+            columns.append(column)
+        return columns
+
+    def pairwise_distance(self, points_a, points_b=None):
+        """Compute the distances between all pairs of points in this space.
+
+        The distance between two points is the same as `Space.distance`:
+        the sum of the absolute differences along the numerical dimensions
+        plus the number of categorical dimensions in which they differ.
+
+        Parameters
+        ----------
+        points_a : list of lists or array, shape=(n_points_a, n_dims)
+            First set of points.
+
+        points_b : list of lists or array, shape=(n_points_b, n_dims), \
+                default=None
+            Second set of points. If None, the distances between the points
+            of `points_a` are computed.
+
+        Returns
+        -------
+        distances : array, shape=(n_points_a, n_points_b)
+            Distance between `points_a[i]` and `points_b[j]`.
+        """
+        columns_a = self._distance_columns(points_a)
+        if points_b is None:
+            columns_b = columns_a
+        else:
+            columns_b = self._distance_columns(points_b)
+        n_a = len(points_a)
+        n_b = n_a if points_b is None else len(points_b)
+
+        numerical = self._metadata.numerical_indices
+        if numerical:
+            distances = cdist(
+                np.column_stack([columns_a[j] for j in numerical]).reshape(n_a, -1),
+                np.column_stack([columns_b[j] for j in numerical]).reshape(n_b, -1),
+                metric="cityblock",
+            )
+        else:
+            distances = np.zeros((n_a, n_b))
+        for j in self._metadata.categorical_indices:
+            codes_a = np.asarray(columns_a[j])
+            codes_b = np.asarray(columns_b[j])
+            distances += codes_a[:, np.newaxis] != codes_b[np.newaxis, :]
+        return distances
+
+    def nearest_neighbour(self, points, reference=None):
+        """Find the closest point of `reference` to each of `points`.
+
+        Distances are measured as in `Space.distance`.
+
+        Parameters
+        ----------
+        points : list of lists or array, shape=(n_points, n_dims)
+            Points to query.
+
+        reference : list of lists or array, shape=(n_reference, n_dims), \
+                default=None
+            Points to search. If None, the closest other point of `points`
+            is returned for each point.
+
+        Returns
+        -------
+        indices : array of ints, shape=(n_points,)
+            Index in `reference` (or `points`) of the closest point.
+
+        distances : array of floats, shape=(n_points,)
+            Distance to the closest point.
+        """
+        distances = self.pairwise_distance(points, reference)
+        if reference is None:
+            np.fill_diagonal(distances, np.inf)
+        indices = np.argmin(distances, axis=1)
+        return indices, distances[np.arange(len(indices)), indices]
+
+
+def _uniform_bounds(dimension):
+    """Bounds of the coordinate in which the values of a `Real` or `Integer`
+    dimension are spread uniformly according to its prior."""
+    if dimension.prior == "log-uniform":
+        return (
+            np.log10(dimension.low) / dimension.log_base,
+            np.log10(dimension.high) / dimension.log_base,
+        )
+    return dimension.low, dimension.high
+
+
+def _to_unit_interval(dimension, values):
+    """Map the values of `dimension` into [0, 1], uniformly according to
+    its prior."""
+    if isinstance(dimension, Categorical):
+        codes = {category: i for i, category in enumerate(dimension.categories)}
+        index = np.array([codes[value] for value in values], dtype=float)
+        return (index + 0.5) / len(dimension.categories)
+    values = np.asarray(values, dtype=float)
+    if dimension.prior == "log-uniform":
+        values = np.log10(values) / dimension.log_base
+    low, high = _uniform_bounds(dimension)
+    if high == low:
+        return np.full(len(values), 0.5)
+    return (values - low) / (high - low)
+
+
+def _from_unit_interval(dimension, z):
+    """Map values in [0, 1] back to values of `dimension`."""
+    if isinstance(dimension, Categorical):
+        n_categories = len(dimension.categories)
+        index = np.minimum((z * n_categories).astype(int), n_categories - 1)
+        return [dimension.categories[i] for i in index]
+    low, high = _uniform_bounds(dimension)
+    values = low + z * (high - low)
+    if dimension.prior == "log-uniform":
+        values = 10 ** (values * dimension.log_base)
+    values = np.clip(values, dimension.low, dimension.high)
+    if isinstance(dimension, Integer):
+        return np.round(values).astype(int).tolist()
+    return values.tolist()
+
+
+class RandomEmbedding(Space):
+    """Search space optimized through a random low-dimensional embedding.
+
+    The warped space of a `RandomEmbedding` is the unit hypercube of
+    dimension `n_components` instead of the warped space of the original
+    dimensions. A point `y` of the embedding maps to the point of the
+    original space whose dimensions, rescaled to [-1, 1] according to their
+    prior, are `clip(projection @ y, -1, 1)`. Passing a `RandomEmbedding`
+    as the `dimensions` of an `Optimizer` therefore fits the surrogate and
+    optimizes the acquisition function in `n_components` dimensions, which
+    pays off when only a few of many dimensions matter.
+
+    Points of the original space are mapped to the embedding with the
+    pseudo-inverse of the projection, which recovers the embedded
+    coordinates of the points sampled or proposed in the embedding.
+
+    Parameters
+    ----------
+    dimensions : list, shape=(n_dims,)
+        List of search space dimensions, as for `Space`. Constraints and
+        conditions are not supported.
+
+    n_components : int
+        Dimensionality of the embedding.
+
+    method : "hesbo" or "rembo", default="hesbo"
+        - "hesbo", each original dimension follows one embedded dimension,
+          with a random sign. The projection never needs clipping.
+        - "rembo", the projection is a gaussian random matrix and the
+          embedding spans `[-sqrt(n_components), sqrt(n_components)]` in
+          each dimension.
+
+    random_state : int, RandomState instance, or None (default)
+        Set random state to something other than None for a reproducible
+        projection.
+
+    Attributes
+    ----------
+    projection : array, shape=(n_dims, n_components)
+        The projection from the embedding to the original space.
+    """
+
+    def __init__(self, dimensions, n_components, method="hesbo", random_state=None):
+        super().__init__(dimensions)
+        if self.constraint is not None or self.conditions:
+            raise ValueError(
+                "RandomEmbedding does not support constrained or conditional spaces."
+            )
+        if not 0 < n_components <= self.n_dims:
+            raise ValueError(
+                "Expected 0 < n_components <= {}, got {}".format(
+                    self.n_dims, n_components
+                )
+            )
+        rng = check_random_state(random_state)
+        if method == "hesbo":
+            projection = np.zeros((self.n_dims, n_components))
+            projection[
+                np.arange(self.n_dims), rng.randint(n_components, size=self.n_dims)
+            ] = rng.choice([-1.0, 1.0], size=self.n_dims)
+            self._scale = 1.0
+        elif method == "rembo":
+            projection = rng.normal(size=(self.n_dims, n_components))
+            self._scale = np.sqrt(n_components)
+        else:
+            raise ValueError(
+                "Expected method to be 'hesbo' or 'rembo', got {}".format(method)
+            )
+        self.n_components = n_components
+        self.method = method
+        self.projection = projection
+        self._pseudo_inverse = np.linalg.pinv(projection)
+
+    @property
+    def transformed_n_dims(self):
+        """The dimensionality of the embedding."""
+        return self.n_components
+
+    @property
+    def transformed_bounds(self):
+        """The bounds of the embedding."""
+        return [(0.0, 1.0)] * self.n_components
+
+    def transform(self, X):
+        """Map points of the original space into the embedding.
+
+        Parameters
+        ----------
+        X : list of lists, shape=(n_samples, n_dims)
+            The points to map.
+
+        Returns
+        -------
+        Xt : array of floats, shape=(n_samples, n_components)
+            The points in the embedding.
+        """
+        if len(X) == 0:
+            return np.empty((0, self.n_components))
+        Z = np.column_stack(
+            [
+                _to_unit_interval(dim, column)
+                for dim, column in zip(self.dimensions, self._columns(X))
+            ]
+        )
+        Y = (2.0 * Z - 1.0) @ self._pseudo_inverse.T / self._scale
+        return np.clip((Y + 1.0) / 2.0, 0.0, 1.0)
+
+    def inverse_transform(self, Xt):
+        """Map points of the embedding back to the original space, clipping
+        them to its bounds.
+
+        Parameters
+        ----------
+        Xt : array of floats, shape=(n_samples, n_components)
+            The points in the embedding.
+
+        Returns
+        -------
+        X : list of lists, shape=(n_samples, n_dims)
+            The points in the original space.
+        """
+        Xt = np.asarray(Xt, dtype=float).reshape(-1, self.n_components)
+        Y = self._scale * (2.0 * Xt - 1.0)
+        Z = (np.clip(Y @ self.projection.T, -1.0, 1.0) + 1.0) / 2.0
+        columns = [
+            _from_unit_interval(dim, Z[:, j]) for j, dim in enumerate(self.dimensions)
+        ]
+        return _transpose_list_array(columns)
+
+    def rvs_transformed(self, n_samples=1, random_state=None):
+        """Draw random points uniformly in the embedding.
+
+        Parameters
+        ----------
+        n_samples : int, default=1
+            Number of samples to be drawn.
+
+        random_state : int, RandomState instance, Generator instance, or None
+            Set random state to something other than None for reproducible
+            results.
+
+        Returns
+        -------
+        Xt : array of floats, shape=(n_samples, n_components)
+           Points sampled from the embedding.
+        """
+        rng = _check_random_state(random_state)
+        return rng.uniform(size=(n_samples, self.n_components))
+
+    def rvs(self, n_samples=1, random_state=None):
+        """Draw random points of the original space which lie in the
+        embedding.
+
+        Parameters
+        ----------
+        n_samples : int, default=1
+            Number of samples to be drawn.
+
+        random_state : int, RandomState instance, Generator instance, or None
+            Set random state to something other than None for reproducible
+            results.
+
+        Returns
+        -------
+        points : list of lists, shape=(n_points, n_dims)
+           Points sampled from the space.
+        """
+        return self.inverse_transform(self.rvs_transformed(n_samples, random_state))
@@ -1,5 +1,4 @@
 import numpy as np
-from sklearn.preprocessing import LabelBinarizer
 
 
 class Transformer:
@@ -60,7 +59,7 @@ class StringEncoder(Transformer):
         Xt : array-like, shape=(n_samples,)
             The string encoded categories.
         """
-        return [str(x) for x in X]
+        return list(map(str, X))
 
     def inverse_transform(self, Xt):
         """Inverse transform string encoded categories back to their original
@@ -76,7 +75,7 @@ class StringEncoder(Transformer):
         X : array-like, shape=(n_samples,)
             The original categories.
         """
-        return [self.dtype(x) for x in Xt]
+        return list(map(self.dtype, Xt))
 
 
 class LogN(Transformer):
@@ -92,12 +91,70 @@ class LogN(Transformer):
         return self._base ** np.asarray(Xt, dtype=float)
 
 
-class CategoricalEncoder(Transformer):
-    """OneHotEncoder that can handle categorical variables."""
+class _CodeEncoder(Transformer):
+    """Base class for encoders that map each category to an integer code.
+
+    Subclasses define `mapping_`, a dict from each category to its code.
+    Codes are looked up with `np.searchsorted` in the sorted categories when
+    these form a numerical or string array, and through `mapping_` otherwise.
+    """
 
-    def __init__(self):
-        """Convert labeled categories into one-hot encoded features."""
-        self._lb = LabelBinarizer()
+    def _fit_codes(self):
+        """Build the arrays used by `_encode` and `_decode`."""
+        values = list(self.mapping_)
+        codes = np.array(list(self.mapping_.values()), dtype=int)
+        self._classes = np.unique(codes)
+        self._categories = np.empty(codes.max(initial=-1) + 1, dtype=object)
+        self._categories[codes] = values
+
+        self._sorted_categories = None
+        try:
+            categories = np.asarray(values)
+        except ValueError:
+            return
+        if categories.ndim != 1 or len(categories) == 0:
+            return
+        if categories.dtype.kind in "biuf" or (
+            categories.dtype.kind == "U" and all(isinstance(v, str) for v in values)
+        ):
+            order = np.argsort(categories, kind="stable")
+            self._sorted_categories = categories[order]
+            self._sorted_codes = codes[order]
+
+    def _encode(self, X):
+        """Return the integer code of each category in `X`."""
+        if getattr(self, "_categories", None) is None:
+            # encoders pickled before the lookup arrays existed
+            self._fit_codes()
+        categories = self._sorted_categories
+        values = np.asarray(X)
+        if (
+            categories is not None
+            and values.ndim == 1
+            and (
+                categories.dtype.kind == values.dtype.kind == "U"
+                or (categories.dtype.kind in "biuf" and values.dtype.kind in "biuf")
+            )
+        ):
+            index = np.minimum(np.searchsorted(categories, values), len(categories) - 1)
+            if np.all(categories[index] == values):
+                return self._sorted_codes[index]
+        # unsortable categories, or values which are not categories and
+        # raise a KeyError
+        return np.array([self.mapping_[v] for v in X], dtype=int)
+
+    def _decode(self, codes):
+        """Return the category of each integer code in `codes`."""
+        if getattr(self, "_categories", None) is None:
+            self._fit_codes()
+        invalid = (codes < 0) | (codes >= len(self._categories))
+        if np.any(invalid):
+            raise KeyError(int(codes[np.argmax(invalid)]))
+        return self._categories[codes].tolist()
+
+
+class CategoricalEncoder(_CodeEncoder):
+    """OneHotEncoder that can handle categorical variables."""
 
     def fit(self, X):
         """Fit a list or array of categories.
@@ -109,14 +166,16 @@ class CategoricalEncoder(Transformer):
         """
         self.mapping_ = {v: i for i, v in enumerate(X)}
         self.inverse_mapping_ = {i: v for v, i in self.mapping_.items()}
-        self._lb.fit([self.mapping_[v] for v in X])
-        self.n_classes = len(self._lb.classes_)
+        self._fit_codes()
+        self.n_classes = len(self._classes)
 
         return self
 
     def transform(self, X):
         """Transform an array of categories to a one-hot encoded representation.
 
+        With two categories a single column holds the code of each category.
+
         Parameters
         ----------
         X : array-like, shape=(n_samples,)
@@ -127,7 +186,13 @@ class CategoricalEncoder(Transformer):
         Xt : array-like, shape=(n_samples, n_categories)
             The one-hot encoded categories.
         """
-        return self._lb.transform([self.mapping_[v] for v in X])
+        columns = np.searchsorted(self._classes, self._encode(X))
+        n_samples = len(columns)
+        if self.n_classes > 2:
+            Xt = np.zeros((n_samples, self.n_classes), dtype=int)
+            Xt[np.arange(n_samples), columns] = 1
+            return Xt
+        return (columns == 1).astype(int).reshape(n_samples, 1)
 
     def inverse_transform(self, Xt):
         """Inverse transform one-hot encoded categories back to their original
@@ -144,10 +209,17 @@ class CategoricalEncoder(Transformer):
             The original categories.
         """
         Xt = np.asarray(Xt)
-        return [self.inverse_mapping_[i] for i in self._lb.inverse_transform(Xt)]
+        if self.n_classes > 2:
+            columns = np.argmax(Xt, axis=1)
+        elif self.n_classes == 2:
+            Xt = (Xt > 0.5).astype(int)
+            columns = Xt[:, 1] if Xt.ndim == 2 and Xt.shape[1] == 2 else Xt.ravel()
+        else:
+            columns = np.zeros(len(Xt), dtype=int)
+        return self._decode(self._classes[columns])
 
 
-class LabelEncoder(Transformer):
+class LabelEncoder(_CodeEncoder):
     """LabelEncoder that can handle categorical variables."""
 
     def __init__(self, X=None):
@@ -173,6 +245,7 @@ class LabelEncoder(Transformer):
                 self.mapping_[X[index]] = i
                 i += 1
         self.inverse_mapping_ = {i: v for v, i in self.mapping_.items()}
+        self._fit_codes()
         return self
 
     def transform(self, X):
@@ -188,8 +261,7 @@ class LabelEncoder(Transformer):
         Xt : array-like, shape=(n_samples, n_categories)
             The integer categories.
         """
-        X = np.asarray(X)
-        return [self.mapping_[v] for v in X]
+        return self._encode(np.asarray(X))
 
     def inverse_transform(self, Xt):
         """Inverse transform integer categories back to their original representation.
@@ -206,9 +278,7 @@ class LabelEncoder(Transformer):
         """
         if isinstance(Xt, (float, np.float64)):
             Xt = [Xt]
-        else:
-            Xt = np.asarray(Xt)
-        return [self.inverse_mapping_[int(np.round(i))] for i in Xt]
+        return self._decode(np.round(np.asarray(Xt, dtype=float)).astype(int))
 
 
 class Normalize(Transformer):
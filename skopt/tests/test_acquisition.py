@@ -6,12 +6,17 @@ from sklearn.multioutput import MultiOutputRegressor
 
 from skopt.acquisition import (
     _gaussian_acquisition,
+    _log_local_penalizer,
     gaussian_acquisition_1D,
+    gaussian_acquisition_from_posterior,
     gaussian_ei,
     gaussian_lcb,
     gaussian_pi,
+    gaussian_qei,
+    gaussian_qucb,
 )
 from skopt.learning import GaussianProcessRegressor
+from skopt.learning.gaussian_process import MultiOutputGaussianProcessRegressor
 from skopt.learning.gaussian_process.kernels import Matern, WhiteKernel
 from skopt.space import Space
 from skopt.utils import cook_estimator
@@ -173,3 +178,130 @@ def test_acquisition_per_second_gradient(acq_func):
         mor = MultiOutputRegressor(gpr)
         mor.fit(X, y)
         check_gradient_correctness(X_new, mor, acq_func, 1.5)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("acq_func", ["EIps", "PIps"])
+def test_acquisition_per_second_shared_kernel(acq_func):
+    rng = np.random.RandomState(0)
+    X = rng.randn(20, 3)
+    y = np.column_stack((X[:, 0], np.abs(X[:, 1])))
+    X_new = rng.randn(10, 3)
+    gpr = GaussianProcessRegressor(Matern(), optimizer=None, normalize_y=True)
+
+    tied = MultiOutputGaussianProcessRegressor(gpr, tie_hyperparameters=True)
+    tied.fit(X, y)
+    untied = MultiOutputGaussianProcessRegressor(gpr).fit(X, y)
+    assert_array_almost_equal(
+        _gaussian_acquisition(X_new, tied, y_opt=0.5, acq_func=acq_func),
+        _gaussian_acquisition(X_new, untied, y_opt=0.5, acq_func=acq_func),
+    )
+
+
+@pytest.mark.fast_test
+def test_acquisition_mc_batch_single_point():
+    # For batches of a single point the Monte-Carlo estimates should
+    # match the analytic acquisition functions.
+    rng = np.random.RandomState(0)
+    X = rng.randn(20, 2)
+    y = rng.randn(20)
+    gpr = cook_estimator("GP", Space(((-5.0, 5.0), (-5.0, 5.0))), random_state=0)
+    gpr.fit(X, y)
+    X_new = rng.randn(5, 2)
+
+    qei = gaussian_qei(
+        X_new[:, None, :], gpr, np.min(y), n_samples=100000, random_state=0
+    )
+    assert_array_almost_equal(qei, gaussian_ei(X_new, gpr, np.min(y)), 2)
+
+    qucb = gaussian_qucb(X_new[:, None, :], gpr, n_samples=100000, random_state=0)
+    assert_array_almost_equal(qucb, -gaussian_lcb(X_new, gpr), 1)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("method", [gaussian_qei, gaussian_qucb])
+def test_acquisition_mc_batch_api(method):
+    rng = np.random.RandomState(0)
+    X = rng.randn(10, 2)
+    y = rng.randn(10)
+    gpr = GaussianProcessRegressor()
+    gpr.fit(X, y)
+
+    assert np.ndim(method(rng.randn(3, 2), gpr, random_state=0)) == 0
+    assert_array_equal(method(rng.randn(4, 3, 2), gpr).shape, 4)
+    assert_raises(ValueError, method, rng.rand(10), gpr)
+
+    # the value of a batch can only grow when a point is added
+    batch = rng.randn(3, 2)
+    assert method(batch, gpr, random_state=1) >= method(batch[:2], gpr, random_state=1)
+
+
+@pytest.mark.fast_test
+def test_local_penalizer():
+    X = np.array([[0.0, 0.0], [0.1, 0.0], [1.0, 0.0], [5.0, 0.0]])
+    log_penalty = _log_local_penalizer(
+        X, X[0], mu_j=1.0, std_j=0.1, lipschitz=1.0, y_best=0.0
+    )
+    assert np.all(log_penalty <= 0.0)
+    # the penalty decreases with the distance to the selected point
+    assert np.all(np.diff(log_penalty) > 0.0)
+    assert log_penalty[-1] > -1e-6
+
+
+@pytest.mark.fast_test
+def test_acquisition_from_posterior():
+    rng = np.random.RandomState(0)
+    X = rng.randn(20, 2)
+    y = rng.randn(20)
+    gpr = cook_estimator("GP", Space(((-5.0, 5.0), (-5.0, 5.0))), random_state=0)
+    gpr.fit(X, y)
+    X_new = rng.randn(50, 2)
+    mu, std = gpr.predict(X_new, return_std=True)
+    y_opt = np.min(y)
+
+    values = gaussian_acquisition_from_posterior(mu, std, y_opt, kappa=0.5)
+    assert_array_almost_equal(values[0], gaussian_ei(X_new, gpr, y_opt))
+    assert_array_almost_equal(values[1], gaussian_pi(X_new, gpr, y_opt))
+    assert_array_almost_equal(values[2], gaussian_lcb(X_new, gpr, kappa=0.5))
+
+    # a zero standard deviation gives no improvement
+    std[:5] = 0.0
+    values = gaussian_acquisition_from_posterior(mu, std, y_opt, kappa="inf")
+    assert_array_equal(values[:2, :5], 0.0)
+    assert_array_equal(values[2], -std)
+
+    out = np.empty((3, 50), dtype=np.float32)
+    values32 = gaussian_acquisition_from_posterior(
+        mu, std, y_opt, kappa="inf", out=out, dtype=np.float32
+    )
+    assert values32 is out
+    assert_array_almost_equal(values32, values, 5)
+
+    assert_raises(ValueError, gaussian_acquisition_from_posterior, mu, std[:-1])
+    assert_raises(
+        ValueError, gaussian_acquisition_from_posterior, mu, std, out=out[:, :-1]
+    )
+    assert_raises(ValueError, gaussian_acquisition_from_posterior, mu, std, out=out)
+
+
+@pytest.mark.fast_test
+def test_acquisition_from_posterior_gradient():
+    rng = np.random.RandomState(0)
+    X = rng.randn(20, 5)
+    y = rng.randn(20)
+    x_new = rng.randn(1, 5)
+    gpr = GaussianProcessRegressor(kernel=Matern() + WhiteKernel())
+    gpr.fit(X, y)
+    mu, std, mu_grad, std_grad = gpr.predict(
+        x_new, return_std=True, return_mean_grad=True, return_std_grad=True
+    )
+
+    _, grads = gaussian_acquisition_from_posterior(
+        mu, std, np.max(y), mu_grad=mu_grad, std_grad=std_grad
+    )
+    assert_array_equal(grads.shape, (3, 1, 5))
+    for grad, acq_func in zip(grads, ["EI", "PI", "LCB"]):
+        expected = gaussian_acquisition_1D(x_new[0], gpr, np.max(y), acq_func)[1]
+        # EI and PI are maximized while the acquisition is minimized
+        sign = 1 if acq_func == "LCB" else -1
+        assert_array_almost_equal(sign * grad[0], expected)
@@ -8,10 +8,15 @@ from skopt import gp_minimize
 from skopt.benchmarks import bench1, bench1_with_time, branin
 from skopt.learning import (
     ExtraTreesRegressor,
+    GaussianProcessRegressor,
     GradientBoostingQuantileRegressor,
     RandomForestRegressor,
 )
+from skopt.learning.gaussian_process import MultiOutputGaussianProcessRegressor
+from skopt.learning.gaussian_process.kernels import Matern
 from skopt.optimizer import Optimizer
+from skopt.optimizer.optimizer import _neighbours
+from skopt.space import Categorical, Integer, RandomEmbedding, Real, Space
 
 TREE_REGRESSORS = (
     ExtraTreesRegressor(random_state=2),
@@ -25,11 +30,13 @@ ESTIMATOR_STRINGS = [
     "RF",
     "ET",
     "GBRT",
+    "HGBRT",
     "DUMMY",
     "gp",
     "rf",
     "et",
     "gbrt",
+    "hgbrt",
     "dummy",
 ]
 
@@ -79,6 +86,24 @@ def test_model_queue_size():
     assert_equal(opt.ask(), opt.ask())
 
 
+@pytest.mark.fast_test
+def test_partially_refit_forest():
+    # forests refitting part of their trees start from the previous model,
+    # which is left unchanged
+    base_estimator = RandomForestRegressor(
+        n_estimators=10, refit_fraction=0.2, random_state=2
+    )
+    opt = Optimizer(
+        [(-2.0, 2.0)], base_estimator, n_initial_points=1, acq_optimizer="sampling"
+    )
+
+    opt.run(bench1, n_iter=3)
+    assert_equal(len(opt.models), 3)
+    previous, last = opt.models[-2:]
+    assert previous.estimators_[2:] == last.estimators_[:8]
+    assert previous.estimators_[:2] != last.estimators_[8:]
+
+
 @pytest.mark.fast_test
 def test_invalid_tell_arguments():
     base_estimator = ExtraTreesRegressor(random_state=2)
@@ -246,6 +271,43 @@ def test_acq_optimizer(base_estimator):
     assert "should run with acq_optimizer='sampling'" in str(e.value)
 
 
+@pytest.mark.fast_test
+def test_neighbours():
+    space = Space(
+        [Real(1e-3, 1.0, "log-uniform"), Integer(1, 5), Categorical(["a", "b"])]
+    )
+    points = [[0.1, 3, "a"], [1.0, 1, "b"]]
+    neighbours = _neighbours(space, points, 4, random_state=1)
+
+    assert_equal(len(neighbours), 2 * 3 * 4)
+    for i, point in enumerate(points):
+        for j in range(3):
+            for neighbour in neighbours[12 * i + 4 * j : 12 * i + 4 * (j + 1)]:
+                assert neighbour in space
+                assert all(neighbour[k] == point[k] for k in range(3) if k != j)
+
+
+@pytest.mark.parametrize("base_estimator", TREE_REGRESSORS)
+@pytest.mark.parametrize("acq_func", ["EI", "EIps", "gp_hedge"])
+def test_acq_optimizer_local_search(base_estimator, acq_func):
+    opt = Optimizer(
+        [Real(-2.0, 2.0), Integer(0, 5), Categorical(["a", "b", "c"])],
+        base_estimator=base_estimator,
+        acq_func=acq_func,
+        acq_optimizer="local_search",
+        acq_optimizer_kwargs={"n_points": 100},
+        n_initial_points=3,
+        random_state=1,
+    )
+    for _ in range(5):
+        x = opt.ask()
+        assert x not in opt.Xi
+        y = bench1(x[:1]) + x[1] + (x[2] == "b")
+        opt.tell(x, (y, 1.0) if "ps" in acq_func else y)
+
+    assert_equal(len(opt.models), 3)
+
+
 @pytest.mark.parametrize("base_estimator", TREE_REGRESSORS)
 @pytest.mark.parametrize("acq_func", ACQ_FUNCS_PS)
 def test_acq_optimizer_with_time_api(base_estimator, acq_func):
@@ -276,6 +338,45 @@ def test_acq_optimizer_with_time_api(base_estimator, acq_func):
         opt.tell(x2, bench1(x2))
 
 
+@pytest.mark.parametrize("acq_func", ACQ_FUNCS_PS)
+@pytest.mark.parametrize("acq_optimizer", ["sampling", "lbfgs"])
+def test_acq_optimizer_with_time_gp(acq_func, acq_optimizer):
+    # the objective and time models of a GP are fit independently by default
+    opt = Optimizer(
+        [(-2.0, 2.0)],
+        base_estimator="GP",
+        acq_func=acq_func,
+        acq_optimizer=acq_optimizer,
+        n_initial_points=2,
+        random_state=1,
+    )
+    assert isinstance(opt.base_estimator_, MultiOutputRegressor)
+    opt.run(bench1_with_time, n_iter=4)
+
+    model = opt.models[-1]
+    assert model.estimators_[0].kernel_ is not model.estimators_[1].kernel_
+    assert isinstance(opt.copy().base_estimator_, MultiOutputRegressor)
+
+    # and share one kernel when the hyperparameters are tied
+    gpr = GaussianProcessRegressor(Matern(), normalize_y=True, noise="gaussian")
+    opt = Optimizer(
+        [(-2.0, 2.0)],
+        base_estimator=MultiOutputGaussianProcessRegressor(
+            gpr, tie_hyperparameters=True
+        ),
+        acq_func=acq_func,
+        acq_optimizer=acq_optimizer,
+        n_initial_points=2,
+        random_state=1,
+    )
+    assert isinstance(opt.base_estimator_, MultiOutputGaussianProcessRegressor)
+    opt.run(bench1_with_time, n_iter=4)
+
+    model = opt.models[-1]
+    assert model.estimators_[0].kernel_ is model.estimators_[1].kernel_
+    assert isinstance(opt.copy().base_estimator_, MultiOutputGaussianProcessRegressor)
+
+
 @pytest.mark.fast_test
 @pytest.mark.parametrize("acq_func", ACQ_FUNCS_MIXED)
 def test_optimizer_copy(acq_func):
@@ -359,7 +460,7 @@ def test_exhaust_initial_calls(base_estimator):
 def test_optimizer_base_estimator_string_invalid():
     with pytest.raises(ValueError) as e:
         Optimizer([(-2.0, 2.0)], base_estimator="rtr", n_initial_points=1)
-    assert "'RF', 'ET', 'GP', 'GBRT' or 'DUMMY'" in str(e.value)
+    assert "'RF', 'ET', 'GP', 'GBRT', 'HGBRT' or 'DUMMY'" in str(e.value)
 
 
 @pytest.mark.fast_test
@@ -480,3 +581,60 @@ def test_categorical_only2():
     opt.tell(next_x, [linalg.norm(x) for x in next_x])
     next_x = opt.ask(n_points=4)
     assert len(next_x) == 4
+
+
+@pytest.mark.fast_test
+def test_conditional_space():
+    space = Space(
+        [
+            Categorical(["linear", "rbf"], name="kernel"),
+            Real(-2.0, 2.0, name="x"),
+            Real(-2.0, 2.0, name="gamma"),
+        ],
+        conditions={"gamma": ("kernel", "rbf")},
+    )
+    opt = Optimizer(space, "GP", n_initial_points=5, random_state=1)
+    assert opt.acq_optimizer == "sampling"
+    assert opt.space.conditions == space.conditions
+
+    for _ in range(10):
+        x = opt.ask()
+        opt.tell(x, x[1] ** 2 + (x[2] ** 2 if x[0] == "rbf" else 1.0))
+    assert all(x[2] == -2.0 for x in opt.Xi if x[0] == "linear")
+    assert opt.copy().space.conditions == space.conditions
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("base_estimator", ["GP", "ET"])
+def test_random_embedding(base_estimator):
+    space = RandomEmbedding([Real(-1.0, 1.0)] * 20, 3, random_state=0)
+    opt = Optimizer(space, base_estimator, n_initial_points=5, random_state=1)
+    assert opt.space is space
+
+    for _ in range(8):
+        x = opt.ask()
+        assert len(x) == 20
+        opt.tell(x, x[3] ** 2 + x[7] ** 2)
+    assert opt.models[-1].n_features_in_ == 3
+    assert_array_equal(opt.get_result().projection, space.projection)
+
+    with pytest.raises(ValueError, match="RandomEmbedding"):
+        Optimizer(space, space_constraint=lambda x: True)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("generator", ["random", "lhs", "sobol", "halton", "grid"])
+def test_random_embedding_initial_points(generator):
+    space = RandomEmbedding(
+        [Real(-1.0, 1.0)] * 10 + [Integer(0, 20)] * 10, 3, random_state=0
+    )
+    opt = Optimizer(space, "ET", n_initial_points=8, initial_point_generator=generator)
+    assert opt._cat_inds == []
+    assert opt._non_cat_inds == [0, 1, 2]
+
+    # the initial points lie in the embedding
+    for _ in range(8):
+        opt.tell(opt.ask(), 0.0)
+    X = np.array(opt.Xi)
+    X_round_trip = np.array(space.inverse_transform(space.transform(X)))
+    assert np.abs(X_round_trip - X).max() < 0.1
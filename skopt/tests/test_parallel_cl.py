@@ -156,3 +156,45 @@ def test_reproducible_runs(strategy, surrogate):
         assert points[i] == x
 
         optimizer.tell(x, [branin(v) for v in x])
+
+
+@pytest.mark.parametrize("strategy", ["qEI", "qUCB", "lp"])
+@pytest.mark.parametrize("surrogate", available_surrogates)
+def test_single_fit_batch_strategies(strategy, surrogate):
+    """Tests that the batch strategies which do not refit the model run before
+    and after the first model is fit, and propose distinct points."""
+    optimizer = Optimizer(
+        base_estimator=surrogate(),
+        dimensions=[Real(-5.0, 10.0), Real(0.0, 15.0)],
+        acq_optimizer='sampling',
+        random_state=1,
+    )
+
+    for _ in range(n_steps):
+        x = optimizer.ask(n_points, strategy)
+        assert_equal(len(x), n_points)
+        assert all(pdist(x) > 1e-3)
+        assert x == optimizer.ask(n_points, strategy)
+        optimizer.tell(x, [branin(v) for v in x])
+
+
+def test_mc_batch_strategies_per_second():
+    optimizer = Optimizer(
+        dimensions=[Real(-5.0, 10.0), Real(0.0, 15.0)],
+        acq_func="EIps",
+        random_state=1,
+    )
+    assert_raises(ValueError, optimizer.ask, n_points, "qEI")
+
+
+def test_local_penalization_per_second():
+    optimizer = Optimizer(
+        dimensions=[Real(-5.0, 10.0), Real(0.0, 15.0)],
+        acq_func="EIps",
+        acq_optimizer='sampling',
+        random_state=1,
+    )
+    for _ in range(n_steps):
+        x = optimizer.ask(n_points, "lp")
+        assert all(pdist(x) > 1e-3)
+        optimizer.tell(x, [[branin(v), 1.1] for v in x])
@@ -1,5 +1,6 @@
 import numbers
 import os
+import pickle
 import re
 from tempfile import NamedTemporaryFile
 
@@ -13,10 +14,10 @@ from numpy.testing import (
 )
 
 from skopt import Optimizer
-from skopt.space import Categorical, Integer, Real, Space
+from skopt.space import Categorical, Integer, RandomEmbedding, Real, Space
 from skopt.space import check_dimension as space_check_dimension
 from skopt.space.space import _check_dimension as new_check_dimension
-from skopt.utils import normalize_dimensions
+from skopt.utils import check_x_in_space, normalize_dimensions
 
 
 def check_dimension(Dimension, vals, random_val):
@@ -332,6 +333,7 @@ def test_space_api():
     samples_transformed = space.transform(samples)
     assert_equal(samples_transformed.shape[0], len(samples))
     assert_equal(samples_transformed.shape[1], 1 + 1 + 3 + 1 + 1)
+    assert_equal(space.transformed_columns, [(0, 1), (1, 2), (2, 5), (5, 6), (6, 7)])
 
     # our space contains mixed types, this means we can't use
     # `array_allclose` or similar to check points are close after a round-trip
@@ -1055,3 +1057,306 @@ def test_constraint():
     # Terminates on unsatisfiable constraint
     space = Space([space.dimensions[0]], constraint=lambda _: False)
     assert_raises_regex(RuntimeError, 'constraint', space.rvs, 1)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("normalize", [False, True])
+def test_space_array_transforms(normalize):
+    dimensions = [
+        Real(1e-3, 1, prior="log-uniform"),
+        Integer(1, 10),
+        Categorical(["a", "b", "c"]),
+        Categorical([True, False]),
+    ]
+    if normalize:
+        dimensions = normalize_dimensions(dimensions)
+    space = Space(dimensions)
+
+    X = space.rvs(50, random_state=1)
+    Xt = space.transform(X)
+    assert_array_equal(space.rvs_transformed(50, random_state=1), Xt)
+    assert_array_equal(space.transform(np.array(X, dtype=object)), Xt)
+    assert space.inverse_transform(Xt) == space.inverse_transform(list(Xt))
+
+    space = Space([Integer(0, 10), Integer(0, 10)], constraint=lambda x: x[0] < x[1])
+    X = space.rvs(20, random_state=2)
+    assert_array_equal(space.rvs_transformed(20, random_state=2), X)
+    assert_array_equal(space.transform(np.array(X)), X)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("normalize", [False, True])
+def test_space_rvs_generator(normalize):
+    dimensions = [
+        Real(1e-3, 1, prior="log-uniform"),
+        Real(0, 1, dtype="float32"),
+        Integer(1, 10),
+        Integer(1, 1000, prior="log-uniform"),
+        Categorical(["a", "b", "c"], prior=[0.1, 0.1, 0.8]),
+        Categorical([True, False]),
+        Categorical(["x", "y", "z"], transform="label"),
+    ]
+    if normalize:
+        dimensions = normalize_dimensions(dimensions)
+    space = Space(dimensions)
+
+    Xt = space.rvs_transformed(2000, random_state=np.random.default_rng(0))
+    assert Xt.shape == (2000, space.transformed_n_dims)
+    assert_array_almost_equal(space.transform(space.inverse_transform(Xt)), Xt)
+    assert_array_equal(
+        space.rvs_transformed(2000, random_state=np.random.default_rng(0)), Xt
+    )
+
+    X = space.rvs(2000, random_state=np.random.default_rng(0))
+    assert all(x in space for x in X)
+    assert 0.75 < np.mean([x[4] == "c" for x in X]) < 0.85
+
+    # spaces which are not numerical once transformed are sampled
+    # dimension by dimension
+    space = Space([Categorical([1, 2, 3], transform="string"), Integer(1, 3)])
+    X = space.rvs(10, random_state=np.random.default_rng(0))
+    assert all(x in space for x in X)
+
+
+@pytest.mark.fast_test
+def test_vectorized_constraint():
+    def constraint(X):
+        return (X[:, 2] == 'ok') & (X[:, 0] ** 2 + X[:, 1] ** 2 <= 1)
+
+    dimensions = [Integer(-1, 3), Real(-1, 3), Categorical(['ok', 'skip'])]
+    space = Space(dimensions, constraint=constraint, vectorized_constraint=True)
+    points = space.rvs(1000, random_state=0)
+    assert len(points) == 1000
+    assert all(constraint(np.array([p], dtype=object))[0] for p in points)
+    assert [0, 0.5, 'ok'] in space
+    assert [1, 0.5, 'ok'] not in space
+
+    # the constraint and its kind are inherited
+    space = normalize_dimensions(space)
+    assert space.vectorized_constraint
+    assert space.rvs(10, random_state=0) == Space(space).rvs(10, random_state=0)
+
+    space = Space(
+        [Real(0, 1), Real(0, 1)],
+        constraint=lambda X: X[:, 0] + X[:, 1] < 0.01,
+        vectorized_constraint=True,
+    )
+    points = space.rvs(5, random_state=0)
+    assert all(x + y < 0.01 for x, y in points)
+
+
+@pytest.mark.fast_test
+def test_constraint_feasible_points_cache():
+    def constraint(params):
+        return params[0] < 0.1
+
+    space = Space([Real(0, 1)], constraint=constraint, cache_feasible=True)
+    first = space.rvs(5, random_state=0)
+    cached = list(space._feasible_points)
+    assert len(cached) > 0
+    second = space.rvs(len(cached), random_state=1)
+    assert second == cached
+    assert all(constraint(p) for p in first + second)
+
+
+@pytest.mark.fast_test
+def test_space_pairwise_distance():
+    space = Space(
+        [
+            Real(-1.0, 1.0),
+            Real(1e-3, 1.0, prior="log-uniform"),
+            Integer(0, 10),
+            Categorical(["a", "b", "c"]),
+            Categorical([1, 2]),
+        ]
+    )
+    points_a = space.rvs(n_samples=7, random_state=1)
+    points_b = space.rvs(n_samples=5, random_state=2)
+
+    distances = space.pairwise_distance(points_a, points_b)
+    assert distances.shape == (7, 5)
+    for i, a in enumerate(points_a):
+        for j, b in enumerate(points_b):
+            assert distances[i, j] == pytest.approx(space.distance(a, b))
+    assert_array_almost_equal(
+        space.pairwise_distance(np.array(points_a, dtype=object), points_b),
+        distances,
+    )
+
+    distances = space.pairwise_distance(points_a)
+    assert_array_almost_equal(distances, distances.T)
+    assert_array_equal(np.diag(distances), 0.0)
+
+    indices, nearest = space.nearest_neighbour(points_a, points_b)
+    pairwise = space.pairwise_distance(points_a, points_b)
+    assert_array_equal(indices, np.argmin(pairwise, axis=1))
+    assert_array_almost_equal(nearest, np.min(pairwise, axis=1))
+    indices, nearest = space.nearest_neighbour(points_a)
+    assert np.all(indices != np.arange(7))
+    assert_array_almost_equal(nearest, np.sort(distances, axis=1)[:, 1])
+
+    with pytest.raises(RuntimeError):
+        space.pairwise_distance([[2.0, 0.5, 1, "a", 1]], points_b)
+    with pytest.raises(RuntimeError):
+        space.pairwise_distance(points_a, [[0.0, 0.5, 1, "d", 1]])
+
+
+@pytest.mark.fast_test
+def test_conditional_space():
+    space = Space(
+        [
+            Categorical(["linear", "rbf", "poly"], name="kernel"),
+            Real(1e-3, 1e3, prior="log-uniform", name="C"),
+            Real(1e-4, 1.0, prior="log-uniform", name="gamma"),
+            Integer(2, 5, name="degree"),
+            Real(0.0, 1.0, name="coef0"),
+        ],
+        conditions={
+            "gamma": ("kernel", ["rbf", "poly"]),
+            "degree": ("kernel", "poly"),
+            "coef0": ("degree", [3, 4, 5]),
+        },
+    )
+    inactive = [1e-4, 2, 0.0]
+
+    for random_state in [1, np.random.default_rng(1)]:
+        X = space.rvs(n_samples=50, random_state=random_state)
+        active = space.active_dimensions(X)
+        for x, mask in zip(X, active):
+            assert mask[2] == (x[0] != "linear")
+            assert mask[3] == (x[0] == "poly")
+            assert mask[4] == (x[0] == "poly" and x[3] > 2)
+            for value, default, is_active in zip(x[2:], inactive, mask[2:]):
+                if not is_active:
+                    assert value == default
+        X_inverse = space.inverse_transform(space.transform(X))
+        assert_array_equal(space.active_dimensions(X_inverse), active)
+
+    # inactive dimensions are imputed in the warped space
+    Xt = space.transform([["linear", 1.0, 0.5, 4, 0.5], ["poly", 1.0, 0.5, 2, 0.5]])
+    assert_array_equal(
+        Xt,
+        space.transform([["linear", 1.0, 1e-4, 2, 0.0], ["poly", 1.0, 0.5, 2, 0.0]]),
+    )
+    assert space.rvs_transformed(n_samples=5, random_state=1).shape == (5, 7)
+
+    assert Space(space).conditions == space.conditions
+    assert normalize_dimensions(space).conditions == space.conditions
+
+    with pytest.raises(ValueError, match="Unknown dimension"):
+        Space(space.dimensions, conditions={"gamma": ("kernels", "rbf")})
+    with pytest.raises(ValueError, match="not within"):
+        Space(space.dimensions, conditions={"gamma": ("kernel", "sigmoid")})
+    with pytest.raises(ValueError, match="cyclic"):
+        Space(
+            space.dimensions,
+            conditions={"gamma": ("degree", 3), "degree": ("gamma", 0.1)},
+        )
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("vectorized_constraint", [False, True])
+def test_space_contains_batch(vectorized_constraint):
+    def constraint(x):
+        if vectorized_constraint:
+            return x[:, 0] > 0.5 * x[:, 1]
+        return x[0] > 0.5 * x[1]
+
+    space = Space(
+        [Real(0.0, 10.0), Integer(1, 5), Categorical(["a", "b"]), Categorical([1, 2])],
+        constraint=constraint,
+        vectorized_constraint=vectorized_constraint,
+    )
+    X = [
+        [5.0, 3, "a", 1],
+        [1.0, 3, "a", 1],
+        [11.0, 3, "b", 2],
+        [5.0, 6, "b", 2],
+        [5.0, 3, "c", 2],
+        [5.0, 3, "b", 3],
+        [5.0, 3, "b", "a"],
+        ["x", 3, "b", 2],
+        [5.0, 3, "b"],
+        [5, 2.5, "b", 2.0],
+    ]
+    assert_array_equal(
+        space.contains_batch(X),
+        [True, False, False, False, False, False, False, False, False, True],
+    )
+    assert_array_equal(space.contains_batch(X[:2]), [x in space for x in X[:2]])
+    assert_array_equal(space.contains_batch(np.array([[5.0, 1.0, 1.0]])), [False])
+
+    with pytest.raises(ValueError, match=r"Point 2 \(\[11.0.*outside of Real"):
+        check_x_in_space([X[0], X[9], X[2], X[1]], space)
+    with pytest.raises(ValueError, match="Point 1 .* constraint"):
+        check_x_in_space(X[:2], space)
+    with pytest.raises(ValueError, match="same dimensions"):
+        check_x_in_space(X[8:], space)
+    check_x_in_space([X[0], X[9]], space)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("method", ["hesbo", "rembo"])
+def test_random_embedding(method):
+    dimensions = [
+        Real(1e-3, 1.0, prior="log-uniform"),
+        Integer(0, 10),
+        Categorical(["a", "b", "c"]),
+    ] + [Real(-1.0, 1.0)] * 7
+    space = RandomEmbedding(dimensions, 4, method=method, random_state=0)
+    assert space.projection.shape == (10, 4)
+    assert space.transformed_n_dims == 4
+    assert space.transformed_bounds == [(0.0, 1.0)] * 4
+
+    Xt = space.rvs_transformed(n_samples=20, random_state=1)
+    assert Xt.shape == (20, 4)
+    X = space.inverse_transform(Xt)
+    assert all(x in space for x in X)
+    assert space.transform(X).shape == (20, 4)
+    assert space.rvs(n_samples=3, random_state=1) == X[:3]
+
+    if method == "hesbo":
+        assert_array_equal(np.abs(space.projection).sum(axis=1), 1.0)
+        # the embedded coordinates of continuous points are recovered
+        space = RandomEmbedding([Real(-1.0, 1.0)] * 10, 4, random_state=0)
+        Xt = space.rvs_transformed(n_samples=20, random_state=1)
+        assert_array_almost_equal(space.transform(space.inverse_transform(Xt)), Xt)
+
+    with pytest.raises(ValueError, match="n_components"):
+        RandomEmbedding(dimensions, 11)
+    with pytest.raises(ValueError, match="method"):
+        RandomEmbedding(dimensions, 2, method="pca")
+    with pytest.raises(ValueError, match="constrained"):
+        RandomEmbedding(Space(dimensions, constraint=lambda x: True), 2)
+
+
+@pytest.mark.fast_test
+def test_space_metadata_cache():
+    space = Space([Real(0.0, 2.0), Integer(1, 4), Categorical(["a", "b", "c"])])
+    assert space.transformed_n_dims == 5
+    assert space.transformed_bounds == [(0.0, 2.0), (1, 4)] + [(0.0, 1.0)] * 3
+    assert space.transformed_columns == [(0, 1), (1, 2), (2, 5)]
+    assert space.is_partly_categorical and not space.is_categorical
+    assert space._metadata is space._metadata
+
+    # replacing a transformer invalidates the cached metadata
+    space.set_transformer_by_type("label", Categorical)
+    assert space.transformed_n_dims == 3
+    normalize_dimensions(space)
+    assert space.transformed_bounds == [(0.0, 1.0)] * 5
+    assert space.transformed_columns == [(0, 1), (1, 2), (2, 5)]
+
+    # creating other dimensions keeps the cache, replacing one clears it
+    metadata = space._metadata
+    Space([Real(0.0, 1.0), Categorical(["x", "y"])])
+    assert space._metadata is metadata
+    space.dimensions[1] = Integer(1, 8, transform="normalize")
+    assert space.transformed_bounds == [(0.0, 1.0)] * 5
+
+    # the returned lists can be modified
+    space.bounds.append(None)
+    assert len(space.bounds) == 3
+
+    unpickled = pickle.loads(pickle.dumps(space))
+    assert "_metadata_cache" not in unpickled.__dict__
+    assert unpickled.transformed_bounds == space.transformed_bounds
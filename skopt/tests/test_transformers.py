@@ -3,7 +3,12 @@ import pytest
 from numpy.testing import assert_array_equal, assert_raises
 
 from skopt.space import LogN, Normalize
-from skopt.space.transformers import Identity, LabelEncoder, StringEncoder
+from skopt.space.transformers import (
+    CategoricalEncoder,
+    Identity,
+    LabelEncoder,
+    StringEncoder,
+)
 
 
 @pytest.mark.fast_test
@@ -115,3 +120,31 @@ def test_normalize():
     assert_raises(ValueError, transformer.transform, 1.0 - 1e-6)
     assert_raises(ValueError, transformer.inverse_transform, 1.0 + 1e-6)
     assert_raises(ValueError, transformer.transform, 0.0 - 1e-6)
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize(
+    "categories", [[3, 1, 2, 7], ["c", "a", "b"], ["x", "y"], [1, "a", None]]
+)
+def test_categorical_encoder(categories):
+    transformer = CategoricalEncoder().fit(categories)
+    n_categories = len(categories)
+    X = [categories[i] for i in [0, 1, 1, n_categories - 1, 0]]
+    Xt = transformer.transform(X)
+    if n_categories == 2:
+        assert_array_equal(Xt, [[0], [1], [1], [1], [0]])
+    else:
+        expected = np.zeros((5, n_categories))
+        expected[np.arange(5), [0, 1, 1, n_categories - 1, 0]] = 1
+        assert_array_equal(Xt, expected)
+    assert transformer.inverse_transform(Xt) == X
+    assert transformer.inverse_transform(Xt * 0.8 + 0.05) == X
+    assert_raises(KeyError, transformer.transform, ["d"])
+
+    transformer = LabelEncoder(categories)
+    assert_array_equal(transformer.transform(X), [0, 1, 1, n_categories - 1, 0])
+    assert_array_equal(
+        transformer.inverse_transform([0.2, 0.8, 1.1, n_categories - 1, 0]), X
+    )
+    assert_raises(KeyError, transformer.transform, ["d"])
+    assert_raises(KeyError, transformer.inverse_transform, [n_categories])
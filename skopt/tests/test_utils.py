@@ -20,11 +20,15 @@ from skopt.utils import (
     check_dimension_names,
     check_list_types,
     cook_estimator,
+    create_result,
     dimensions_aslist,
+    dump_history,
     has_gradients,
+    load_history,
     normalize_dimensions,
     point_asdict,
     point_aslist,
+    tell_history,
     use_named_args,
 )
 
@@ -161,7 +165,10 @@ def test_dict_list_space_representation():
 @pytest.mark.fast_test
 @pytest.mark.parametrize(
     "estimator, gradients",
-    zip(["GP", "RF", "ET", "GBRT", "DUMMY"], [True, False, False, False, False]),
+    zip(
+        ["GP", "RF", "ET", "GBRT", "HGBRT", "DUMMY"],
+        [True, False, False, False, False, False],
+    ),
 )
 def test_has_gradients(estimator, gradients):
     space = Space([(-2.0, 2.0)])
@@ -176,6 +183,22 @@ def test_categorical_gp_has_gradients():
     assert not has_gradients(cook_estimator('GP', space=space))
 
 
+@pytest.mark.fast_test
+def test_mixed_categorical_gp():
+    space = Space([(-2.0, 2.0), ['a', 'b', 'c'], (0, 5), ['d', 'e']])
+    gp = cook_estimator('GP', space=space)
+
+    # one length scale per continuous and per categorical dimension
+    assert_equal(gp.kernel.n_dims, 1 + 2 + 2)
+    assert has_gradients(gp)
+
+    X = Space(normalize_dimensions(space.dimensions)).transform(
+        space.rvs(10, random_state=0)
+    )
+    gp.fit(X, np.arange(10.0))
+    assert_array_equal(gp.predict(X).shape, (10,))
+
+
 @pytest.mark.fast_test
 def test_normalize_dimensions_all_categorical():
     dimensions = (['a', 'b', 'c'], ['1', '2', '3'])
@@ -313,3 +336,85 @@ def test_check_list_types():
     check_list_types(dimensions, Dimension)
     dimensions = [dim1, dim2, dim3, "test"]
     assert_raises(ValueError, check_list_types, dimensions, Dimension)
+
+
+def _history_result():
+    space = Space(
+        [
+            Real(0.0, 1.0, name="x"),
+            Integer(1, 10, name="n"),
+            Categorical([True, "a", 3], name="kind"),
+        ]
+    )
+    x_iters = space.rvs(n_samples=20, random_state=0)
+    func_vals = np.arange(20.0)[::-1]
+    res = create_result(x_iters, func_vals, space=space)
+    res.log_time = np.log(np.arange(1.0, 21.0))
+    return res
+
+
+@pytest.mark.fast_test
+@pytest.mark.parametrize("extension", [".npz", ".parquet", ".feather"])
+def test_dump_and_load_history(tmp_path, extension):
+    if extension != ".npz":
+        pytest.importorskip("pyarrow")
+    res = _history_result()
+    filename = tmp_path / ("history" + extension)
+    dump_history(res, filename, metadata={"worker": np.arange(20) % 3})
+
+    loaded = load_history(filename, space=res.space)
+    assert loaded.x_iters == res.x_iters
+    assert type(loaded.x_iters[0][1]) is int
+    assert_array_equal(loaded.func_vals, res.func_vals)
+    assert_array_equal(loaded.log_time, res.log_time)
+    assert_array_equal(loaded.metadata["worker"], np.arange(20) % 3)
+    assert loaded.x == res.x_iters[-1]
+    assert loaded.fun == 0.0
+
+    # without the space, mixed categories come back as strings
+    loaded = load_history(filename)
+    assert [x[2] for x in loaded.x_iters] == [str(x[2]) for x in res.x_iters]
+    assert loaded.space is None
+
+    assert_raises(ValueError, load_history, filename, Space([(0.0, 1.0)]))
+    assert_raises(
+        ValueError, dump_history, res, filename, metadata={"x": np.arange(20)}
+    )
+    assert_raises(ValueError, dump_history, res, filename, metadata={"w": [1]})
+    assert_raises(ValueError, dump_history, res, tmp_path / "history.csv")
+
+
+@pytest.mark.fast_test
+def test_dump_and_load_history_explicit_format(tmp_path):
+    res = _history_result()
+    filename = tmp_path / "history.dat"
+    dump_history(res, filename, format="npz")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["history.dat"]
+
+    loaded = load_history(filename, space=res.space, format="npz")
+    assert loaded.x_iters == res.x_iters
+    assert_array_equal(loaded.func_vals, res.func_vals)
+
+
+@pytest.mark.fast_test
+def test_tell_history(tmp_path):
+    res = _history_result()
+    filename = tmp_path / "history.npz"
+    dump_history(res, filename)
+
+    opt = Optimizer(
+        res.space, "ET", acq_func="EIps", acq_optimizer="sampling", random_state=1
+    )
+    result = tell_history(opt, filename)
+    assert opt.Xi == res.x_iters
+    assert [y[0] for y in opt.yi] == res.func_vals.tolist()
+    assert len(opt.models) == 1
+    assert_array_equal(result.func_vals, res.func_vals)
+    assert opt.ask() in opt.space
+
+    del res.log_time
+    dump_history(res, filename)
+    opt = Optimizer(
+        res.space, "ET", acq_func="EIps", acq_optimizer="sampling", random_state=1
+    )
+    assert_raises(ValueError, tell_history, opt, filename)
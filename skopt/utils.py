@@ -1,3 +1,5 @@
+import json
+import os
 from collections import OrderedDict
 from copy import deepcopy
 from functools import wraps
@@ -8,7 +10,7 @@ from joblib import load as load_
 from scipy.optimize import OptimizeResult
 from scipy.optimize import minimize as sp_minimize
 from sklearn.base import is_regressor
-from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
 
 from .learning import (
     ExtraTreesRegressor,
@@ -16,9 +18,15 @@ from .learning import (
     GradientBoostingQuantileRegressor,
     RandomForestRegressor,
 )
-from .learning.gaussian_process.kernels import ConstantKernel, HammingKernel, Matern
+from .learning.gaussian_process.kernels import (
+    ConstantKernel,
+    HammingKernel,
+    Matern,
+    MixedKernel,
+)
+from .learning.gbrt import _check_hist_quantile_loss
 from .sampler import Grid, Halton, Hammersly, InitialPointGenerator, Lhs, Sobol
-from .space import Categorical, Dimension, Space
+from .space import Categorical, Dimension, Integer, RandomEmbedding, Space
 
 __all__ = (
     "load",
@@ -38,7 +46,8 @@ def create_result(Xi, yi, space=None, rng=None, specs=None, models=None):
         Minimum value obtained at every iteration.
 
     space : Space instance, optional
-        Search space.
+        Search space. The projection of a `RandomEmbedding` is stored in
+        `res.projection`.
 
     rng : RandomState instance, optional
         State of the random state.
@@ -66,6 +75,8 @@ def create_result(Xi, yi, space=None, rng=None, specs=None, models=None):
     res.x_iters = Xi
     res.models = models
     res.space = space
+    if isinstance(space, RandomEmbedding):
+        res.projection = space.projection
     res.random_state = rng
     res.specs = specs
     return res
@@ -170,6 +181,277 @@ def load(filename, **kwargs):
     return load_(filename, **kwargs)
 
 
+_HISTORY_FORMATS = {".npz": "npz", ".parquet": "parquet", ".feather": "feather"}
+
+
+def _history_format(filename, format):
+    """Return the history file format, given or inferred from `filename`."""
+    if format is None:
+        extension = os.path.splitext(str(filename))[1].lower()
+        format = _HISTORY_FORMATS.get(extension)
+    if format not in ("npz", "parquet", "feather"):
+        raise ValueError(
+            "Expected format to be 'npz', 'parquet' or 'feather', got {}. "
+            "Pass it explicitly or use a '.npz', '.parquet' or '.feather' "
+            "filename.".format(format)
+        )
+    return format
+
+
+def _import_pyarrow(format):
+    """Import pyarrow and its module reading and writing `format`."""
+    try:
+        import pyarrow
+        from pyarrow import feather, parquet
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required to read and write {} files. Install it or "
+            "use the 'npz' format.".format(format)
+        ) from e
+    return pyarrow, parquet if format == "parquet" else feather
+
+
+def _category_values(categories):
+    """Store `categories` as an array of numbers or strings."""
+    values = np.asarray(categories)
+    if values.ndim != 1 or values.dtype.kind not in "biufU":
+        values = np.array([str(category) for category in categories])
+    return values
+
+
+def dump_history(res, filename, metadata=None, format=None):
+    """Store the evaluations of an optimization in columnar form.
+
+    One column is written per dimension of `res.space`, named after the
+    dimension, along with `func_vals`, `log_time` if present, and the
+    columns of `metadata`. `Real` dimensions are stored as floats, `Integer`
+    dimensions as integers and `Categorical` dimensions as integer codes
+    with the categories as a dictionary. Categories which are not all
+    numbers or all strings are stored as strings, and are recovered by
+    passing the space to `load_history`.
+
+    Parameters
+    ----------
+    res : `OptimizeResult`, scipy object
+        Optimization result with `x_iters`, `func_vals` and `space`.
+
+    filename : string or `pathlib.Path`
+        The path of the file in which the evaluations are stored.
+
+    metadata : dict or None, default: None
+        Additional columns, as a mapping of column names to sequences of
+        numbers or strings with one value per evaluation.
+
+    format : "npz", "parquet", "feather" or None, default: None
+        The file format. If None, it is inferred from the extension of
+        `filename`. Parquet and Feather files are written with pyarrow.
+    """
+    format = _history_format(filename, format)
+    space = res.space
+    names = space.dimension_names
+    n_iters = len(res.x_iters)
+    if metadata is None:
+        metadata = {}
+    reserved = set(names) | {"func_vals", "log_time"}
+    if len(set(names)) != len(names):
+        raise ValueError("Dimension names must be unique, got {}".format(names))
+
+    columns = {}
+    categories = {}
+    x_columns = space._columns(res.x_iters) if n_iters else [[]] * space.n_dims
+    for name, dim, column in zip(names, space.dimensions, x_columns):
+        if isinstance(dim, Categorical):
+            codes = {category: i for i, category in enumerate(dim.categories)}
+            columns[name] = np.array([codes[v] for v in column], dtype=np.int32)
+            categories[name] = _category_values(dim.categories)
+        elif isinstance(dim, Integer):
+            columns[name] = np.asarray(column, dtype=np.int64)
+        else:
+            columns[name] = np.asarray(column, dtype=float)
+    columns["func_vals"] = np.asarray(res.func_vals, dtype=float)
+    if "log_time" in res:
+        columns["log_time"] = np.asarray(res.log_time, dtype=float)
+    for key, values in metadata.items():
+        values = np.asarray(values)
+        if key in reserved:
+            raise ValueError("Metadata column {} clashes with a column.".format(key))
+        if values.shape != (n_iters,) or values.dtype.kind not in "biufUb":
+            raise ValueError(
+                "Metadata column {} should hold one number or string per "
+                "evaluation.".format(key)
+            )
+        columns[key] = values
+
+    if format == "npz":
+        arrays = {"dimensions": np.array(names), "metadata": np.array(list(metadata))}
+        for key, values in columns.items():
+            if key in names:
+                arrays["dimension:" + key] = values
+            elif key in metadata:
+                arrays["metadata:" + key] = values
+            else:
+                arrays[key] = values
+        for name, values in categories.items():
+            arrays["categories:" + name] = values
+        # a file handle keeps numpy from appending ".npz" to the filename
+        with open(filename, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        return
+
+    pa, io = _import_pyarrow(format)
+    arrow_columns = {}
+    for key, values in columns.items():
+        if key in categories:
+            arrow_columns[key] = pa.DictionaryArray.from_arrays(
+                pa.array(values, type=pa.int32()), pa.array(categories[key])
+            )
+        else:
+            arrow_columns[key] = pa.array(values)
+    table = pa.table(arrow_columns).replace_schema_metadata(
+        {
+            "skopt.dimensions": json.dumps(names),
+            "skopt.metadata": json.dumps(list(metadata)),
+        }
+    )
+    if format == "parquet":
+        io.write_table(table, filename)
+    else:
+        io.write_feather(table, filename)
+
+
+def _read_history(filename, format):
+    """Read the columns of a history file, as the dimension names, a dict of
+    arrays and a dict of categories, and the metadata column names."""
+    if format == "npz":
+        with np.load(filename, allow_pickle=False) as data:
+            names = data["dimensions"].tolist()
+            metadata = data["metadata"].tolist()
+            columns = {name: data["dimension:" + name] for name in names}
+            columns.update({key: data["metadata:" + key] for key in metadata})
+            for key in ("func_vals", "log_time"):
+                if key in data:
+                    columns[key] = data[key]
+            categories = {
+                name: data["categories:" + name]
+                for name in names
+                if "categories:" + name in data
+            }
+        return names, columns, categories, metadata
+
+    pa, io = _import_pyarrow(format)
+    table = io.read_table(filename)
+    schema_metadata = table.schema.metadata
+    names = json.loads(schema_metadata[b"skopt.dimensions"])
+    metadata = json.loads(schema_metadata[b"skopt.metadata"])
+    columns = {}
+    categories = {}
+    for key in table.column_names:
+        column = table.column(key).combine_chunks()
+        if pa.types.is_dictionary(column.type):
+            categories[key] = column.dictionary.to_numpy(zero_copy_only=False)
+            column = column.indices
+        columns[key] = column.to_numpy(zero_copy_only=False)
+    return names, columns, categories, metadata
+
+
+def load_history(filename, space=None, format=None):
+    """Load evaluations stored by `dump_history`.
+
+    Parameters
+    ----------
+    filename : string or `pathlib.Path`
+        The path of the file from which to load the evaluations.
+
+    space : Space or None, default: None
+        The space of the optimization. Its dimension names must match the
+        stored ones. If given, categories are decoded from the categories of
+        its dimensions rather than from the ones stored in the file.
+
+    format : "npz", "parquet", "feather" or None, default: None
+        The file format. If None, it is inferred from the extension of
+        `filename`.
+
+    Returns
+    -------
+    res : `OptimizeResult`, scipy object
+        The evaluations as `x_iters` and `func_vals`, the best one as `x`
+        and `fun`, `log_time` if stored, the `metadata` columns as a dict of
+        arrays and `space`.
+    """
+    format = _history_format(filename, format)
+    names, columns, categories, metadata = _read_history(filename, format)
+    if space is not None:
+        if space.dimension_names != names:
+            raise ValueError(
+                "The dimensions of the space {} do not match the stored "
+                "dimensions {}.".format(space.dimension_names, names)
+            )
+        for name, dim in zip(names, space.dimensions):
+            if name in categories:
+                values = np.empty(len(dim.categories), dtype=object)
+                for i, category in enumerate(dim.categories):
+                    values[i] = category
+                categories[name] = values
+
+    x_columns = []
+    for name in names:
+        column = columns[name]
+        if name in categories:
+            column = categories[name][column]
+        x_columns.append(column.tolist())
+    x_iters = [list(row) for row in zip(*x_columns)]
+
+    res = OptimizeResult()
+    res.x_iters = x_iters
+    res.func_vals = columns["func_vals"]
+    if len(x_iters):
+        best = np.argmin(res.func_vals)
+        res.x = x_iters[best]
+        res.fun = res.func_vals[best]
+    if "log_time" in columns:
+        res.log_time = columns["log_time"]
+    res.metadata = {key: columns[key] for key in metadata}
+    res.space = space
+    return res
+
+
+def tell_history(optimizer, filename, fit=True, format=None):
+    """Tell an optimizer all the evaluations stored by `dump_history` at
+    once.
+
+    Parameters
+    ----------
+    optimizer : `Optimizer`
+        The optimizer to tell the evaluations to. The stored dimension names
+        must match the ones of its space.
+
+    filename : string or `pathlib.Path`
+        The path of the file from which to load the evaluations.
+
+    fit : bool, default: True
+        Fit a model to the observed evaluations.
+
+    format : "npz", "parquet", "feather" or None, default: None
+        The file format. If None, it is inferred from the extension of
+        `filename`.
+
+    Returns
+    -------
+    res : `OptimizeResult`, scipy object
+        The result returned by `optimizer.tell`.
+    """
+    history = load_history(filename, space=optimizer.space, format=format)
+    y = history.func_vals.tolist()
+    if "ps" in optimizer.acq_func:
+        if "log_time" not in history:
+            raise ValueError(
+                "The acquisition function {} needs the computation times, "
+                "which are not stored in {}.".format(optimizer.acq_func, filename)
+            )
+        y = [[value, t] for value, t in zip(y, np.exp(history.log_time).tolist())]
+    return optimizer.tell(history.x_iters, y, fit=fit)
+
+
 def is_listlike(x):
     return isinstance(x, (list, tuple))
 
@@ -180,10 +462,17 @@ def is_2Dlistlike(x):
 
 def check_x_in_space(x, space):
     if is_2Dlistlike(x):
-        if not np.all([p in space for p in x]):
-            raise ValueError("Not all points are within the bounds of" " the space.")
-        if any([len(p) != len(space.dimensions) for p in x]):
-            raise ValueError("Not all points have the same dimensions as" " the space.")
+        mask = space.contains_batch(x)
+        if not np.all(mask):
+            i = int(np.argmin(mask))
+            if len(x[i]) != len(space.dimensions):
+                raise ValueError(
+                    "Not all points have the same dimensions as the space."
+                )
+            raise ValueError(
+                "Not all points are within the bounds of the space. Point %d "
+                "(%s) %s." % (i, x[i], _describe_violation(x[i], space))
+            )
     elif is_listlike(x):
         if x not in space:
             raise ValueError(
@@ -197,6 +486,14 @@ def check_x_in_space(x, space):
             )
 
 
+def _describe_violation(point, space):
+    """Describe why `point` is not within `space`."""
+    for value, dim in zip(point, space.dimensions):
+        if not dim._contains_batch([value])[0]:
+            return "has value %s outside of %s" % (value, dim)
+    return "does not satisfy the constraint of the space"
+
+
 def expected_minimum(res, n_random_starts=20, random_state=None):
     """Compute the minimum over the predictions of the last surrogate model. Uses
     `expected_minimum_random_sampling` with `n_random_starts` = 100000, when the space
@@ -283,14 +580,18 @@ def expected_minimum_random_sampling(res, n_random_starts=100000, random_state=N
         the surrogate function value at the minimum.
     """
 
-    # sample points from search space
-    random_samples = res.space.rvs(n_random_starts, random_state=random_state)
+    # sample points from search space, directly in the warped space
+    random_samples = res.space.rvs_transformed(
+        n_random_starts, random_state=random_state
+    )
 
     # make estimations with surrogate
     model = res.models[-1]
-    y_random = model.predict(res.space.transform(random_samples))
+    y_random = model.predict(random_samples)
     index_best_objective = np.argmin(y_random)
-    min_x = random_samples[index_best_objective]
+    min_x = res.space.inverse_transform(
+        random_samples[index_best_objective : index_best_objective + 1]
+    )[0]
 
     return min_x, y_random[index_best_objective]
 
@@ -319,8 +620,13 @@ def has_gradients(estimator):
     categorical_gp = False
     if hasattr(estimator, "kernel"):
         params = estimator.get_params()
+        # a MixedKernel provides gradients wrt its continuous columns
         categorical_gp = isinstance(estimator.kernel, HammingKernel) or any(
-            [isinstance(params[p], HammingKernel) for p in params]
+            [
+                isinstance(params[p], HammingKernel)
+                and not p.endswith("categorical_kernel")
+                for p in params
+            ]
         )
 
     return not categorical_gp
@@ -335,13 +641,16 @@ def cook_estimator(base_estimator, space=None, **kwargs):
 
     Parameters
     ----------
-    base_estimator : "GP", "RF", "ET", "GBRT", "DUMMY" or sklearn regressor
+    base_estimator : "GP", "RF", "ET", "GBRT", "HGBRT", "DUMMY" \
+            or sklearn regressor
         Should inherit from `sklearn.base.RegressorMixin`.
         In addition the `predict` method should have an optional `return_std`
         argument, which returns `std(Y | x)`` along with `E[Y | x]`.
         If base_estimator is one of ["GP", "RF", "ET", "GBRT", "DUMMY"], a
         surrogate model corresponding to the relevant `X_minimize` function
-        is created.
+        is created. "HGBRT" creates a `GradientBoostingQuantileRegressor`
+        using histogram based gradient boosting, which is faster to fit than
+        "GBRT" on large numbers of samples. It requires scikit-learn >= 1.1.
 
     space : Space instance
         Has to be provided if the base_estimator is a gaussian process.
@@ -352,10 +661,10 @@ def cook_estimator(base_estimator, space=None, **kwargs):
     """
     if isinstance(base_estimator, str):
         base_estimator = base_estimator.upper()
-        if base_estimator not in ["GP", "ET", "RF", "GBRT", "DUMMY"]:
+        if base_estimator not in ["GP", "ET", "RF", "GBRT", "HGBRT", "DUMMY"]:
             raise ValueError(
                 "Valid strings for the base_estimator parameter "
-                " are: 'RF', 'ET', 'GP', 'GBRT' or 'DUMMY' not "
+                " are: 'RF', 'ET', 'GP', 'GBRT', 'HGBRT' or 'DUMMY' not "
                 "%s." % base_estimator
             )
     elif not is_regressor(base_estimator):
@@ -363,17 +672,41 @@ def cook_estimator(base_estimator, space=None, **kwargs):
 
     if base_estimator == "GP":
         if space is not None:
-            space = Space(space)
-            space = Space(normalize_dimensions(space.dimensions))
+            if isinstance(space, RandomEmbedding):
+                # the embedding is continuous, whatever the dimensions
+                space = Space([(0.0, 1.0)] * space.transformed_n_dims)
+            else:
+                space = Space(space)
+                space = Space(normalize_dimensions(space.dimensions))
             n_dims = space.transformed_n_dims
             is_cat = space.is_categorical
         else:
             raise ValueError("Expected a Space instance, not None.")
 
         cov_amplitude = ConstantKernel(1.0, (0.01, 1000.0))
-        # only special if *all* dimensions are categorical
         if is_cat:
             other_kernel = HammingKernel(length_scale=np.ones(n_dims))
+        elif space.is_partly_categorical:
+            # one length scale per categorical dimension rather than one per
+            # one-hot encoded column
+            continuous_columns = []
+            categorical_columns = []
+            for dim, (start, stop) in zip(space.dimensions, space.transformed_columns):
+                if isinstance(dim, Categorical):
+                    categorical_columns.append((start, stop))
+                else:
+                    continuous_columns.extend(range(start, stop))
+            n_continuous = len(continuous_columns)
+            other_kernel = MixedKernel(
+                Matern(
+                    length_scale=np.ones(n_continuous),
+                    length_scale_bounds=[(0.01, 100)] * n_continuous,
+                    nu=2.5,
+                ),
+                HammingKernel(length_scale=np.ones(len(categorical_columns))),
+                continuous_columns,
+                categorical_columns,
+            )
         else:
             other_kernel = Matern(
                 length_scale=np.ones(n_dims),
@@ -394,6 +727,12 @@ def cook_estimator(base_estimator, space=None, **kwargs):
     elif base_estimator == "GBRT":
         gbrt = GradientBoostingRegressor(n_estimators=30, loss="quantile")
         base_estimator = GradientBoostingQuantileRegressor(base_estimator=gbrt)
+    elif base_estimator == "HGBRT":
+        _check_hist_quantile_loss()
+        gbrt = HistGradientBoostingRegressor(
+            max_iter=30, min_samples_leaf=3, loss="quantile"
+        )
+        base_estimator = GradientBoostingQuantileRegressor(base_estimator=gbrt)
 
     elif base_estimator == "DUMMY":
         return None
@@ -588,6 +927,9 @@ def normalize_dimensions(dimensions):
          NOTE: The upper and lower bounds are inclusive for `Integer`
          dimensions.
     """
+    if isinstance(dimensions, RandomEmbedding):
+        # the warped space of an embedding is already the unit hypercube
+        return dimensions
     space = Space(dimensions)
     transformed_dimensions = []
     for dimension in space.dimensions:
@@ -601,7 +943,13 @@ def normalize_dimensions(dimensions):
             raise RuntimeError("Unknown dimension type " "(%s)" % type(dimension))
         transformed_dimensions.append(dimension)
 
-    return Space(transformed_dimensions)
+    return Space(
+        transformed_dimensions,
+        constraint=space.constraint,
+        vectorized_constraint=space.vectorized_constraint,
+        cache_feasible=space.cache_feasible,
+        conditions=space.conditions,
+    )
 
 
 def check_list_types(x, types):